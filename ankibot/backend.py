@@ -6,38 +6,232 @@ import csv
 import io
 import os
 import re
-import json
 import time
+import hashlib
 import asyncio
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+from collections import OrderedDict, defaultdict
 import logging
-from fuzzywuzzy import fuzz
 
-from ankibot.ui import app
-from ankibot.utils import is_valid_json
-from ankibot.config import DEFAULT_MODEL, load_config
+from ankibot.utils import is_valid_json, json_dumps, json_loads
+from ankibot.config import CACHE_DIR, DEFAULT_MODEL, load_config
 
-# Google GenAI (optional)
-try:
-    from google import genai
-    from google.genai import types
-    from google.api_core.exceptions import InternalServerError
-except Exception:  # library not installed or missing
-    genai = None
-    types = None
-    InternalServerError = Exception
+# Google GenAI (optional, imported on first use: the SDK pulls in grpc/protobuf and
+# would otherwise delay the first window by several hundred milliseconds)
+genai = None
+types = None
+InternalServerError = Exception
+
+
+def _load_genai() -> bool:
+    """Import the Google GenAI SDK once; False if the library is not installed."""
+    global genai, types, InternalServerError
+    if genai is None:
+        try:
+            from google import genai as _genai
+            from google.genai import types as _types
+            from google.api_core.exceptions import InternalServerError as _ise
+        except Exception:  # library not installed or missing
+            return False
+        genai, types, InternalServerError = _genai, _types, _ise
+    return True
+
+
+# Compiled once: these run on model responses and inside verify_csv's matching
+_JSON_ARRAY_RE = re.compile(r"\[\s*{.*}\s*\]", re.DOTALL)
+_LATEX_RE = re.compile(r'\\\(.*?\\\)')
+_PUNCT_RE = re.compile(r'[.,?!]')
+
+
+# Longest refusal prefix: a streamed head this long is enough to tell a refusal apart
+_REFUSAL_PREFIXES = ("i'm sorry", "sorry,")
+_REFUSAL_PREFIX_LEN = max(map(len, _REFUSAL_PREFIXES))
+
+
+def _is_unusable_response(text: Optional[str]) -> bool:
+    """True for model output that must be retried, never cached: empty, "[]", or a refusal."""
+    if text is None:
+        return True
+    text = text.strip()
+    return not text or text == "[]" or text.lower().startswith(_REFUSAL_PREFIXES)
+
+
+def _normalize_text(text: str) -> str:
+    """Normalize text for fuzzy matching (e.g., handle LaTeX, case, punctuation)."""
+    text = _LATEX_RE.sub('MATH', text.lower().strip())  # Replace LaTeX with placeholder
+    return _PUNCT_RE.sub('', text)  # Remove punctuation
+
+
+class Card(NamedTuple):
+    """One CSV flashcard row, in column order."""
+    topic: str
+    subtopic: str
+    question: str
+    answer: str
+    source: str
+    details: str
+
+
+@dataclass(slots=True)
+class CardDiff:
+    """Outcome of comparing an original and a verified CSV."""
+    rewritten: List[tuple]  # (original, verified, changed_fields, 100) for same-key rewrites
+    fuzzy_rewritten: List[tuple]  # (original, verified, changed_fields, score)
+    removed: List[Card]
+    added: List[Card]
+    unchanged: int
+
+
+_CSV_FIELDS = ("Topic", "Subtopic", "Question", "Answer", "Source", "Details")
+_card_key = attrgetter("topic", "subtopic", "question")
+_EMPTY_ROW = [""] * 6
+
+
+def _changed_fields(original: Card, verified: Card) -> List[str]:
+    """Names of the CSV fields that differ between two cards (only computed for retained matches)."""
+    return [name for name, a, b in zip(_CSV_FIELDS, original, verified) if a != b]
+
+
+def _is_fact_list(data: Any) -> bool:
+    """Schema check for fact extraction output: an array of objects with string "topic" and "fact"."""
+    return isinstance(data, list) and all(
+        isinstance(f, dict) and isinstance(f.get("topic"), str) and isinstance(f.get("fact"), str)
+        for f in data
+    )
+
+
+def _parse_csv_record(record: str) -> Optional[List[str]]:
+    """Parse one complete CSV record; None for blank lines and code fences."""
+    record = record.strip()
+    if not record or record.startswith("```"):
+        return None
+    return next(csv.reader([record]), None)
+
+
+def _trigrams(text: str) -> set:
+    """Character 3-grams of an already normalized string (blocking key for fuzzy matching)."""
+    return {text[k:k + 3] for k in range(len(text) - 2)}
+
+
+def _index_cards(rows) -> Dict[tuple, tuple]:
+    """Map (Topic, Subtopic, Question) -> (Card, tuple of the remaining fields), skipping short rows.
+
+    Rows with fewer than six columns are padded with empty fields, extra columns are dropped.
+    """
+    cards = (Card._make((row + _EMPTY_ROW)[:6]) for row in rows if len(row) >= 3)
+    return {_card_key(c): (c, c[3:]) for c in cards}
+
+
+def _diff_cards(original_dict: Dict[tuple, tuple], verified_dict: Dict[tuple, tuple]) -> CardDiff:
+    """Pair original and verified cards (exact key, then fuzzy) and classify the changes.
+
+    Pure CPU work with no logging, so verify_csv can run it off the event loop.
+    """
+    # Imported here rather than at module load to keep UI startup fast
+    import numpy as np
+    from rapidfuzz import fuzz, process
+    from rapidfuzz.utils import default_process
+
+    # Identify exact-match rewrites and unchanged (same key, compare the Answer/Source/Details tuples)
+    rewritten_cards = []
+    unchanged_count = 0
+    matched_keys = original_dict.keys() & verified_dict.keys()
+    for key, (verified_row, verified_tail) in verified_dict.items():
+        if key in matched_keys:
+            original_row, original_tail = original_dict[key]
+            if original_tail != verified_tail:
+                changed_fields = _changed_fields(original_row, verified_row)
+                rewritten_cards.append((original_row, verified_row, changed_fields, 100))  # Exact match, score=100
+            else:
+                unchanged_count += 1
+
+    # Remaining unpaired originals (potential removals) and verifieds (potential additions)
+    unpaired_originals = [row for key, (row, _) in original_dict.items() if key not in matched_keys]
+    unpaired_verifieds = [row for key, (row, _) in verified_dict.items() if key not in matched_keys]
+
+    # Fuzzy matching for potential rewrites among unpaired
+    similarity_threshold = 80  # rapidfuzz uses 0-100 scale
+    fuzzy_rewritten = []
+    removed_cards = []
+    added_cards = []
+    used_verified_indices = set()
+
+    if unpaired_originals and unpaired_verifieds:
+        # Normalize each card exactly once (one pass per side), then split into columns
+        orig_norm = [(_normalize_text(c.topic), _normalize_text(c.question)) for c in unpaired_originals]
+        ver_norm = [(_normalize_text(c.topic), _normalize_text(c.question)) for c in unpaired_verifieds]
+        orig_t, orig_q = zip(*orig_norm)
+        ver_t, ver_q = zip(*ver_norm)
+
+        # Block on question trigrams: each original is only scored against verified cards
+        # sharing at least one 3-gram (full scan when it shares none, e.g. very short questions)
+        blocks: defaultdict[str, list[int]] = defaultdict(list)
+        for ver_idx, q in enumerate(ver_q):
+            for gram in _trigrams(q):
+                blocks[gram].append(ver_idx)
+        all_indices = np.arange(len(unpaired_verifieds))
+
+        # Greedy assignment in original order, each verified card used at most once
+        available = np.ones(len(unpaired_verifieds), dtype=bool)
+        for orig_idx, original_row in enumerate(unpaired_originals):
+            cands = set()
+            for gram in _trigrams(orig_q[orig_idx]):
+                cands.update(blocks.get(gram, ()))
+            idx = np.fromiter(sorted(cands), dtype=np.intp, count=len(cands)) if cands else all_indices
+            idx = idx[available[idx]]
+            if not idx.size:
+                removed_cards.append(original_row)
+                continue
+
+            # Similarity against the candidates only, computed in C (token_sort keeps fuzzywuzzy's default processing)
+            cand_q = [ver_q[k] for k in idx]
+            cand_t = [ver_t[k] for k in idx]
+            question_sort = process.cdist([orig_q[orig_idx]], cand_q, scorer=fuzz.token_sort_ratio, processor=default_process)[0]
+            question_partial = process.cdist([orig_q[orig_idx]], cand_q, scorer=fuzz.partial_ratio)[0]
+            topic_sort = process.cdist([orig_t[orig_idx]], cand_t, scorer=fuzz.token_sort_ratio, processor=default_process)[0]
+            # Weighted average: 60% question token_sort, 20% question partial, 20% topic,
+            # fused in place into the float32 score rows (no temporaries per weight)
+            np.add(question_partial, topic_sort, out=question_partial)
+            question_partial *= 0.2
+            question_sort *= 0.6
+            question_sort += question_partial
+            overall = question_sort
+
+            best = int(overall.argmax())
+            best_score = float(overall[best])
+            if best_score < similarity_threshold:
+                removed_cards.append(original_row)
+                continue
+            ver_idx = int(idx[best])
+            verified_row = unpaired_verifieds[ver_idx]
+            fuzzy_rewritten.append((original_row, verified_row, _changed_fields(original_row, verified_row), best_score))
+            used_verified_indices.add(ver_idx)
+            available[ver_idx] = False
+    else:
+        removed_cards.extend(unpaired_originals)
+
+    # Remaining unpaired verifieds are true additions
+    for ver_idx, verified_row in enumerate(unpaired_verifieds):
+        if ver_idx not in used_verified_indices:
+            added_cards.append(verified_row)
+
+    return CardDiff(rewritten_cards, fuzzy_rewritten, removed_cards, added_cards, unchanged_count)
 
 
 # ============================= Models ============================= #
 
-@dataclass
+@dataclass(slots=True)
 class Fact:
     topic: str
     subtopic: Optional[str]
     fact: str
     source: Optional[str] = None
 
+    def as_dict(self) -> Dict[str, Any]:
+        return {"topic": self.topic, "subtopic": self.subtopic, "fact": self.fact, "source": self.source}
+
 
 @dataclass
 class GenAIConfig:
@@ -50,73 +244,109 @@ class GenAIConfig:
 
 from ankibot.prompts import (
     PROMPT_FACT_EXTRACTION,
-    PROMPT_CSV_GENERATION_BASE,
-    PROMPT_CSV_VERIFICATION,
+    PROMPT_FACT_EXTRACTION_BATCH,
+    PROMPT_DYNAMIC_MARKER,
+    PROMPT_CSV_GENERATION_STATIC,
+    PROMPT_CSV_GENERATION_DYNAMIC,
+    PROMPT_CSV_VERIFICATION_STATIC,
+    PROMPT_CSV_VERIFICATION_DYNAMIC,
 )
 
 
 # ============================= Backend ============================= #
 
 class FlashcardBackend:
-    def __init__(self, api_key: Optional[str], model: str = DEFAULT_MODEL, logger: Optional[logging.Logger] = None):
-        self.cfg = load_config()
-        self.api_key = (
-            str(self.cfg.get("api_key")).strip()
-        )
-        self.client = genai.Client(api_key=self.api_key) if (genai and self.api_key) else None
+    def __init__(
+        self,
+        api_key: Optional[str],
+        model: str = DEFAULT_MODEL,
+        logger: Optional[logging.Logger] = None,
+        app_cfg: Optional[Dict[str, Any]] = None,
+    ):
+        # Application settings (dict); reuse the caller's copy instead of re-reading config.json
+        self.app_cfg = app_cfg if app_cfg is not None else load_config()
+        self.api_key = (api_key if api_key is not None else self.app_cfg.get("api_key") or "").strip()
+        self.client = genai.Client(api_key=self.api_key) if (self.api_key and _load_genai()) else None
+        # Bounds concurrent in-flight requests across all callers of _gen
+        self._sem = asyncio.Semaphore(int(self.app_cfg.get("max_concurrency", 8)))
+        # In-memory LRU front of the on-disk response cache; both are bounded
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self._cache_max_entries = max(1, int(self.app_cfg.get("cache_max_entries", 256)))
+        self._cache_max_files = max(1, int(self.app_cfg.get("cache_max_files", 2000)))
+        self._cache_writes = 0
+        self.read_cache = True  # False: always call the model (fresh answers still refresh the cache)
+        # Model settings; the UI mutates model/thinking_budget in place
         self.cfg = GenAIConfig(model=model, thinking_budget=-1, temperature=0.0)
+        self._gen_config = None
+        self._gen_config_key: Optional[tuple] = None
         self.logger = logger or logging.getLogger("ankibot")  # Fallback to default logger
 
+    def _generate_config(self):
+        """GenerateContentConfig for the current settings, rebuilt only when they change."""
+        key = (self.cfg.temperature, self.cfg.thinking_budget)
+        if key != self._gen_config_key:
+            self._gen_config = types.GenerateContentConfig(
+                temperature=self.cfg.temperature,
+                thinking_config=types.ThinkingConfig(thinking_budget=self.cfg.thinking_budget),
+            )
+            self._gen_config_key = key
+        return self._gen_config
+
     async def _gen(self, prompt: str, type: str = "default") -> str:
         """Low-level GenAI call with retries."""
         if not self.client:
             raise RuntimeError("API key is missing. Set it in Settings or GEMINI_API_KEY.")
 
-        config = types.GenerateContentConfig(
-            temperature=self.cfg.temperature,
-            thinking_config=types.ThinkingConfig(thinking_budget=self.cfg.thinking_budget),
-        )
+        config = self._generate_config()
+
+        # Exact-match response cache: model + config are part of the key, so
+        # switching model or thinking mode never serves a stale answer.
+        key = self._cache_key(prompt, type)
+        cached = await self._cache_get(key)
+        if cached is not None:
+            return cached
 
         max_retries, delay = 7, 1.0
         last_err: Optional[Exception] = None
         for attempt in range(max_retries + 1):
             try:
-                def _call():
-                    resp = self.client.models.generate_content(
+                # Native async client: many chunks can be in flight at once,
+                # bounded only by the backend semaphore (no worker thread per call).
+                async with self._sem:
+                    resp = await self.client.aio.models.generate_content(
                         model=self.cfg.model, contents=prompt, config=config
                     )
-                    if not resp or resp.text is None or resp.text.strip() == "" or resp.text.strip() == "[]" or resp.text.strip().lower().startswith("i'm sorry") or resp.text.strip().lower().startswith("sorry,"):
-                        raise InternalServerError(f"No response from model. Response was {resp.text if resp else 'None'}.")
-                    # Check if the prompt is for fact extraction (match start of prompt)
-                    if type == "fact_extraction":
-                        #print(f"Raw fact extraction response:\n{resp.text}\n---")
-                        if is_valid_json(resp.text.strip()):
-                            return resp.text.strip()
-                        cleaned = resp.text.strip()
-
-                        # Strip code fences if present
-                        if cleaned.startswith("```"):
-                            cleaned = re.sub(r"^```[a-zA-Z0-9]*\n?", "", cleaned)
-                            cleaned = re.sub(r"```$", "", cleaned).strip()
-
-                        # If still not valid JSON, try to extract array only
-                        if not is_valid_json(cleaned):
-                            m = re.search(r"\[\s*{.*}\s*\]", cleaned, re.DOTALL)
-                            if m:
-                                cleaned = m.group(0)
-
-                        # Try final JSON check
-                        if not is_valid_json(cleaned):
-                            self.logger.error(f"Invalid JSON output from model (facts). Raw text:\n{resp.text}\nCleaned:\n{cleaned}")
-                            raise InternalServerError("Invalid JSON output for facts.")
-
-                        return cleaned
-                    
-                    if type == "card_generation":
-                        pass  # Future use
-                    return (resp.text or "").strip()
-
-                return await asyncio.to_thread(_call)
+                if not resp or _is_unusable_response(resp.text):
+                    raise InternalServerError(f"No response from model. Response was {resp.text if resp else 'None'}.")
+                # Check if the prompt is for fact extraction (match start of prompt)
+                if type == "fact_extraction":
+                    #print(f"Raw fact extraction response:\n{resp.text}\n---")
+                    if is_valid_json(resp.text.strip()):
+                        return await self._cache_put(key, resp.text.strip())
+                    cleaned = resp.text.strip()
+
+                    # Strip code fences if present
+                    if cleaned.startswith("```"):
+                        first_nl = cleaned.find("\n")  # drop the ```lang line
+                        cleaned = cleaned[first_nl + 1:] if first_nl >= 0 else cleaned[3:]
+                        cleaned = cleaned.removesuffix("```").strip()
+
+                    # If still not valid JSON, try to extract array only
+                    if not is_valid_json(cleaned):
+                        m = _JSON_ARRAY_RE.search(cleaned)
+                        if m:
+                            cleaned = m.group(0)
+
+                    # Try final JSON check
+                    if not is_valid_json(cleaned):
+                        self.logger.error(f"Invalid JSON output from model (facts). Raw text:\n{resp.text}\nCleaned:\n{cleaned}")
+                        raise InternalServerError("Invalid JSON output for facts.")
+
+                    return await self._cache_put(key, cleaned)
+
+                if type == "card_generation":
+                    pass  # Future use
+                return await self._cache_put(key, (resp.text or "").strip())
             except InternalServerError as e:
                 last_err = e
                 self.logger.error(f"GenAI error (InternalServerError) (attempt {attempt}) (sleeping for {delay} seconds): {e}")
@@ -129,22 +359,204 @@ class FlashcardBackend:
                 delay *= 2
         raise RuntimeError(f"GenAI error: {last_err}. prompt was: {prompt}")
 
+    async def _gen_stream(self, prompt: str):
+        """Streaming variant of _gen: yields the response text piece by piece as it arrives.
+
+        The first pieces are held back until they can be validated like _gen's output; an error or an
+        unusable response (empty, "[]", refusal) before anything was yielded falls back to _gen and is
+        not cached. No retries once text has been yielded.
+        """
+        if not self.client:
+            raise RuntimeError("API key is missing. Set it in Settings or GEMINI_API_KEY.")
+        key = self._cache_key(prompt, "default")
+        cached = await self._cache_get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        parts: List[str] = []
+        held = True  # nothing yielded yet: the head is still being validated
+        try:
+            async with self._sem:
+                stream = await self.client.aio.models.generate_content_stream(
+                    model=self.cfg.model, contents=prompt, config=self._generate_config()
+                )
+                async for resp in stream:
+                    if not resp.text:
+                        continue
+                    parts.append(resp.text)
+                    if not held:
+                        yield resp.text
+                        continue
+                    head = "".join(parts)
+                    if len(head.strip()) <= _REFUSAL_PREFIX_LEN:
+                        continue
+                    if _is_unusable_response(head):
+                        break
+                    held = False
+                    yield head
+        except Exception as e:
+            if not held:
+                raise
+            self.logger.warning(f"GenAI stream failed, retrying without streaming: {e}")
+            yield await self._gen(prompt)
+            return
+
+        text = "".join(parts)
+        if _is_unusable_response(text):
+            self.logger.warning(f"Unusable streamed response, retrying without streaming: {text.strip()[:80]!r}")
+            yield await self._gen(prompt)
+            return
+        if held:
+            yield text
+        await self._cache_put(key, text.strip())
+
+    def _cache_key(self, prompt: str, type: str) -> str:
+        """Model + config are part of the key, so switching model or thinking mode never serves a stale answer."""
+        return hashlib.sha256(
+            f"{self.cfg.model}|{self.cfg.temperature}|{self.cfg.thinking_budget}|{type}|{prompt}".encode("utf-8")
+        ).hexdigest()
+
+    async def _cache_get(self, key: str) -> Optional[str]:
+        """Return a cached response (memory, then disk) or None; always None when read_cache is off."""
+        if not self.read_cache:
+            return None
+        text = self._cache.get(key)
+        if text is not None:
+            self._cache.move_to_end(key)
+            return text
+        # File I/O in a worker thread: _gen runs on the UI event loop
+        text = await asyncio.to_thread(self._cache_read_file, key)
+        if text is not None:
+            self._cache_remember(key, text)
+        return text
+
+    async def _cache_put(self, key: str, text: str) -> str:
+        """Store a validated response and return it unchanged."""
+        self._cache_remember(key, text)
+        self._cache_writes += 1
+        prune = self._cache_writes % 64 == 1  # the directory is trimmed on the first write, then every 64
+        try:
+            await asyncio.to_thread(self._cache_write_file, key, text, prune)
+        except OSError as e:
+            self.logger.warning(f"Could not write response cache: {e}")
+        return text
+
+    def _cache_remember(self, key: str, text: str) -> None:
+        self._cache[key] = text
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_max_entries:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _cache_read_file(key: str) -> Optional[str]:
+        try:
+            with open(os.path.join(CACHE_DIR, f"{key}.txt"), "rb") as f:
+                return f.read().decode("utf-8")
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def _cache_write_file(self, key: str, text: str, prune: bool) -> None:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(os.path.join(CACHE_DIR, f"{key}.txt"), "wb") as f:
+            f.write(text.encode("utf-8"))
+        if prune:
+            # Oldest files go first once the directory holds more than cache_max_files responses
+            entries = [e for e in os.scandir(CACHE_DIR) if e.name.endswith(".txt") and e.is_file()]
+            if len(entries) > self._cache_max_files:
+                entries.sort(key=lambda e: e.stat().st_mtime)
+                for e in entries[:len(entries) - self._cache_max_files]:
+                    try:
+                        os.remove(e.path)
+                    except OSError:
+                        pass
+
     async def extract_facts(self, chunk: str) -> List[Fact]:
         """Extract atomic facts from a text chunk."""
         text = await self._gen(PROMPT_FACT_EXTRACTION.format(chunk=chunk), type="fact_extraction")
 
+        data = self._parse_facts_json(text)
+        if not data:
+            self.logger.error(f"Fact extraction failed. Raw text was:\n{text}")
+            return []
+
+        return self._build_facts(data)
+
+    async def extract_facts_batch(self, chunks: List[str]) -> List[List[Fact]]:
+        """Extract facts from several chunks in one request; returns one list per chunk."""
+        if len(chunks) == 1:
+            return [await self.extract_facts(chunks[0])]
+
+        chunks_json = json_dumps([{"id": i, "chunk": c} for i, c in enumerate(chunks)])
+        text = await self._gen(PROMPT_FACT_EXTRACTION_BATCH.format(chunks_json=chunks_json), type="fact_extraction")
+
+        data = self._parse_facts_json(text)
+        if not data:
+            self.logger.error(f"Batch fact extraction failed. Raw text was:\n{text}")
+            return [[] for _ in chunks]
+
+        # Demultiplex by chunk id; facts with a missing or unknown id are dropped, since their cards
+        # would otherwise be generated and verified against another chunk's source text
+        grouped: List[List[Dict[str, Any]]] = [[] for _ in chunks]
+        for f in data:
+            try:
+                cid = int(f.get("chunk_id"))
+            except Exception:
+                cid = -1
+            if not 0 <= cid < len(chunks):
+                self.logger.warning(f"Fact without valid chunk_id, dropped: {f}")
+                continue
+            grouped[cid].append(f)
+        return [self._build_facts(g) for g in grouped]
+
+    async def extract_facts_all(
+        self,
+        chunks: List[str],
+        batch_size: int = 1,
+        on_batch: Optional[Callable[[List[int], List[List[Fact]]], None]] = None,
+    ) -> List[List[Fact]]:
+        """Extract facts from every chunk concurrently; returns one list per chunk, in chunk order.
+
+        To stop early, cancel the awaiting task: the cancellation reaches every batch, including
+        the ones still queued on the semaphore.
+        """
+        per_chunk: List[List[Fact]] = [[] for _ in chunks]
+        batches = [list(range(b, min(b + batch_size, len(chunks)))) for b in range(0, len(chunks), batch_size)]
+
+        async def one(ids: List[int]) -> None:
+            self.logger.info(f"Extracting segments {ids[0] + 1}-{ids[-1] + 1}/{len(chunks)}")
+            try:
+                res = await self.extract_facts_batch([chunks[i] for i in ids])
+            except Exception as e:
+                self.logger.error(f"Fact extraction failed (segments {ids[0] + 1}-{ids[-1] + 1}): {e}")
+                res = [[] for _ in ids]
+            for i, facts in zip(ids, res):
+                per_chunk[i] = facts
+            if on_batch:
+                on_batch(ids, res)
+
+        # Every batch is in flight at once; self._sem in _gen bounds the actual API concurrency
+        await asyncio.gather(*(one(ids) for ids in batches))
+        return per_chunk
+
+    def _parse_facts_json(self, text: str) -> Optional[List[Dict[str, Any]]]:
+        """Best-effort parse of a JSON array of facts returned by the model."""
         def try_parse_json(txt: str) -> Optional[List[Dict[str, Any]]]:
             try:
-                return json.loads(txt)
+                return json_loads(txt)
             except Exception:
                 return None
 
-        # Step 1: Direct attempt
+        # Step 1: Direct attempt; a schema-valid array needs no further work
         data = try_parse_json(text)
+        if _is_fact_list(data):
+            return data
+        if not isinstance(data, list):
+            data = None  # e.g. {"facts": [...]} wrapper: locate the array below
 
         # Step 2: Extract JSON array with regex if extra text is around
         if not data:
-            m = re.search(r"\[\s*{.*}\s*\]", text, re.DOTALL)
+            m = _JSON_ARRAY_RE.search(text)
             if m:
                 data = try_parse_json(m.group(0))
 
@@ -156,15 +568,14 @@ class FlashcardBackend:
                     .replace(", ]", "]")            # trailing comma
                     .replace(",]", "]")
             )
-            m = re.search(r"\[\s*{.*}\s*\]", fixed, re.DOTALL)
+            m = _JSON_ARRAY_RE.search(fixed)
             if m:
                 data = try_parse_json(m.group(0))
 
-        if not data:
-            self.logger.error(f"Fact extraction failed. Raw text was:\n{text}")
-            return []
+        return data
 
-        # Validate keys and build Fact objects
+    def _build_facts(self, data: List[Dict[str, Any]]) -> List[Fact]:
+        """Validate keys and build Fact objects."""
         facts: List[Fact] = []
         for f in data:
             try:
@@ -183,8 +594,8 @@ class FlashcardBackend:
         return facts
 
 
-    async def generate_csv(self, facts: List[Fact], reverse: bool, density_level: int, custom_add: str = "") -> str:
-        """Generate an Anki-ready CSV string from extracted facts."""
+    def _csv_prompt(self, facts: List[Fact], reverse: bool, density_level: int, custom_add: str = "") -> str:
+        """Build the card generation prompt for a list of facts."""
         density_note = {
             1: "Low density: macro cards only, most important informations.",
             2: "Normal density: one card per atomic fact.",
@@ -195,168 +606,107 @@ class FlashcardBackend:
             if reverse
             else "- Do not create reversed versions."
         )
-        facts_json = json.dumps([f.__dict__ for f in facts], ensure_ascii=False)
-        prompt = PROMPT_CSV_GENERATION_BASE.format(
+        facts_json = json_dumps([f.as_dict() for f in facts])
+        # Static prefix first, untouched by .format(), so it stays cacheable provider-side
+        return PROMPT_CSV_GENERATION_STATIC + PROMPT_DYNAMIC_MARKER + PROMPT_CSV_GENERATION_DYNAMIC.format(
             density_note=density_note, reverse_note=reverse_note, facts_json=facts_json, custom_add=custom_add or ""
         )
-        return await self._gen(prompt)
+
+    async def generate_csv(self, facts: List[Fact], reverse: bool, density_level: int, custom_add: str = "") -> str:
+        """Generate an Anki-ready CSV string from extracted facts."""
+        return await self._gen(self._csv_prompt(facts, reverse, density_level, custom_add))
+
+    async def generate_csv_rows(self, facts: List[Fact], reverse: bool, density_level: int, custom_add: str = ""):
+        """Generate the CSV as a stream of parsed rows (header first), yielded as the model writes them."""
+        buf = ""
+        async for piece in self._gen_stream(self._csv_prompt(facts, reverse, density_level, custom_add)):
+            buf += piece
+            start = 0
+            while (nl := buf.find("\n", start)) >= 0:
+                record = buf[:nl]
+                if record.count('"') % 2:  # newline inside a quoted field: wait for the rest of the record
+                    start = nl + 1
+                    continue
+                buf, start = buf[nl + 1:], 0
+                row = _parse_csv_record(record)
+                if row:
+                    yield row
+        row = _parse_csv_record(buf)
+        if row:
+            yield row
 
     async def verify_csv(self, full_text: str, csv_text: str) -> str:
         """Verify CSV flashcards against source text and log detailed modifications."""
-        # Parse original CSV
-        original_cards = []
+        # Parse original CSV (single pass: rows indexed by key with their Answer/Source/Details tuple)
+        original_dict = {}
         try:
             csv_reader = csv.reader(io.StringIO(csv_text))
             headers = next(csv_reader, None)  # Skip header
             if headers:
-                original_cards = [row for row in csv_reader]
+                original_dict = _index_cards(csv_reader)
         except Exception as e:
             self.logger.error(f"Error parsing original CSV: {e}")
             return csv_text  # Fallback to original if parsing fails
 
         # Generate verified CSV
-        prompt = PROMPT_CSV_VERIFICATION.format(full_text=full_text, csv_text=csv_text)
+        prompt = PROMPT_CSV_VERIFICATION_STATIC + PROMPT_DYNAMIC_MARKER + PROMPT_CSV_VERIFICATION_DYNAMIC.format(
+            full_text=full_text, csv_text=csv_text
+        )
         verified_csv = await self._gen(prompt)
 
         # Parse verified CSV
-        verified_cards = []
+        verified_dict = {}
         try:
             csv_reader = csv.reader(io.StringIO(verified_csv))
             headers = next(csv_reader, None)  # Skip header
             if headers:
-                verified_cards = [row for row in csv_reader]
+                verified_dict = _index_cards(csv_reader)
         except Exception as e:
             self.logger.error(f"Error parsing verified CSV: {e}")
             return csv_text  # Fallback to original if parsing fails
 
-        # Create dicts for easier lookup (key: (Topic, Subtopic, Question) tuple, value: full row)
-        def card_key(row):
-            return (row[0], row[1], row[2]) if len(row) >= 3 else None
-
-        # Normalize text for fuzzy matching (e.g., handle LaTeX, case, punctuation)
-        def normalize_text(text):
-            text = re.sub(r'\\\(.*?\\\)', 'MATH', text.lower().strip())  # Replace LaTeX with placeholder
-            return re.sub(r'[.,?!]', '', text)  # Remove punctuation
-
-        original_dict = {card_key(row): row for row in original_cards if card_key(row)}
-        verified_dict = {card_key(row): row for row in verified_cards if card_key(row)}
-
-        # Identify exact-match rewrites and unchanged (same key, but check if Answer/Source/Details differ)
-        rewritten_cards = []
-        unchanged_count = 0
-        matched_keys = set()
-        for key, verified_row in verified_dict.items():
-            if key in original_dict:
-                matched_keys.add(key)
-                original_row = original_dict[key]
-                if original_row[3:] != verified_row[3:]:  # Compare Answer, Source, Details
-                    # Identify changed fields
-                    changed_fields = []
-                    if original_row[3] != verified_row[3]:
-                        changed_fields.append("Answer")
-                    if original_row[4] != verified_row[4]:
-                        changed_fields.append("Source")
-                    if original_row[5] != verified_row[5]:
-                        changed_fields.append("Details")
-                    rewritten_cards.append((original_row, verified_row, changed_fields, 100))  # Exact match, score=100
-                else:
-                    unchanged_count += 1
-
-        # Remaining unpaired originals (potential removals) and verifieds (potential additions)
-        unpaired_originals = [row for key, row in original_dict.items() if key not in matched_keys]
-        unpaired_verifieds = [row for key, row in verified_dict.items() if key not in matched_keys]
-
-        # Fuzzy matching for potential rewrites among unpaired
-        similarity_threshold = 80  # fuzzywuzzy uses 0-100 scale
-        fuzzy_rewritten = []
-        removed_cards = []
-        added_cards = []
-        used_verified_indices = set()
-
-        for orig_idx, original_row in enumerate(unpaired_originals):
-            best_match = None
-            best_score = 0
-            best_changed_fields = []
-            for ver_idx, verified_row in enumerate(unpaired_verifieds):
-                if ver_idx in used_verified_indices:
-                    continue
-                # Compute fuzzy similarity: Combine token_sort_ratio and partial_ratio
-                question_sort = fuzz.token_sort_ratio(
-                    normalize_text(original_row[2]), normalize_text(verified_row[2])
-                )
-                question_partial = fuzz.partial_ratio(
-                    normalize_text(original_row[2]), normalize_text(verified_row[2])
+        # Pair and classify cards in a worker thread (rapidfuzz releases the GIL), keeping the UI loop free
+        diff = await asyncio.to_thread(_diff_cards, original_dict, verified_dict)
+        rewritten_cards, fuzzy_rewritten = diff.rewritten, diff.fuzzy_rewritten
+        removed_cards, added_cards, unchanged_count = diff.removed, diff.added, diff.unchanged
+
+        # Logging modifications (deferred %-formatting; skipped entirely when INFO is filtered out)
+        if self.logger.isEnabledFor(logging.INFO):
+            for card in removed_cards:
+                self.logger.info(
+                    "CSV Modification: Removed card (potential inaccurate, duplicate, or irrelevant) - "
+                    "Topic: %s, Subtopic: %s, Question: %s, Answer: %s, Source: %s, Details: %s",
+                    *card,
                 )
-                topic_sort = fuzz.token_sort_ratio(
-                    normalize_text(original_row[0]), normalize_text(verified_row[0])
-                )
-                # Weighted average: 60% question token_sort, 20% question partial, 20% topic
-                overall_sim = (0.6 * question_sort + 0.2 * question_partial + 0.2 * topic_sort)
-                # Identify changed fields for potential match
-                temp_changed_fields = []
-                if original_row[0] != verified_row[0]:
-                    temp_changed_fields.append("Topic")
-                if original_row[1] != verified_row[1]:
-                    temp_changed_fields.append("Subtopic")
-                if original_row[2] != verified_row[2]:
-                    temp_changed_fields.append("Question")
-                if original_row[3] != verified_row[3]:
-                    temp_changed_fields.append("Answer")
-                if original_row[4] != verified_row[4]:
-                    temp_changed_fields.append("Source")
-                if original_row[5] != verified_row[5]:
-                    temp_changed_fields.append("Details")
-                if overall_sim > best_score:
-                    best_score = overall_sim
-                    best_match = (ver_idx, verified_row)
-                    best_changed_fields = temp_changed_fields
-
-            if best_score >= similarity_threshold:
-                fuzzy_rewritten.append((original_row, best_match[1], best_changed_fields, best_score))
-                used_verified_indices.add(best_match[0])
-            else:
-                removed_cards.append(original_row)
 
-        # Remaining unpaired verifieds are true additions
-        for ver_idx, verified_row in enumerate(unpaired_verifieds):
-            if ver_idx not in used_verified_indices:
-                added_cards.append(verified_row)
-
-        # Logging modifications
-        for card in removed_cards:
-            self.logger.info(
-                f"CSV Modification: Removed card (potential inaccurate, duplicate, or irrelevant) - "
-                f"Topic: {card[0]}, Subtopic: {card[1]}, Question: {card[2]}, "
-                f"Answer: {card[3]}, Source: {card[4]}, Details: {card[5]}"
-            )
-
-        for card in added_cards:
-            self.logger.info(
-                f"CSV Modification: Added new card - "
-                f"Topic: {card[0]}, Subtopic: {card[1]}, Question: {card[2]}, "
-                f"Answer: {card[3]}, Source: {card[4]}, Details: {card[5]}"
-            )
+            for card in added_cards:
+                self.logger.info(
+                    "CSV Modification: Added new card - "
+                    "Topic: %s, Subtopic: %s, Question: %s, Answer: %s, Source: %s, Details: %s",
+                    *card,
+                )
 
-        for original, verified, changed_fields, sim_score in rewritten_cards + fuzzy_rewritten:
-            sim_note = f"exact match" if sim_score == 100 else f"fuzzy match, similarity={sim_score:.1f}"
-            self.logger.info(
-                f"CSV Modification: Rewrote card ({sim_note}, changed fields: {', '.join(changed_fields)}) - "
-                f"Topic: {original[0]} → {verified[0]}, "
-                f"Subtopic: {original[1]} → {verified[1]}, "
-                f"Question: {original[2]} → {verified[2]}, "
-                f"Answer: {original[3]} → {verified[3]}, "
-                f"Source: {original[4]} → {verified[4]}, "
-                f"Details: {original[5]} → {verified[5]}"
-            )
+            for original, verified, changed_fields, sim_score in rewritten_cards + fuzzy_rewritten:
+                sim_note = "exact match" if sim_score == 100 else "fuzzy match, similarity=%.1f" % sim_score
+                self.logger.info(
+                    "CSV Modification: Rewrote card (%s, changed fields: %s) - "
+                    "Topic: %s → %s, Subtopic: %s → %s, Question: %s → %s, "
+                    "Answer: %s → %s, Source: %s → %s, Details: %s → %s",
+                    sim_note, ", ".join(changed_fields),
+                    original.topic, verified.topic,
+                    original.subtopic, verified.subtopic,
+                    original.question, verified.question,
+                    original.answer, verified.answer,
+                    original.source, verified.source,
+                    original.details, verified.details,
+                )
 
         # High-level summary
-        total_rewritten = len(rewritten_cards) + len(fuzzy_rewritten)
         self.logger.info(
-            f"CSV Verification Summary: "
-            f"{len(removed_cards)} cards removed, "
-            f"{len(added_cards)} cards added, "
-            f"{total_rewritten} cards rewritten (including {len(fuzzy_rewritten)} fuzzy matches), "
-            f"{unchanged_count} cards unchanged."
+            "CSV Verification Summary: %d cards removed, %d cards added, "
+            "%d cards rewritten (including %d fuzzy matches), %d cards unchanged.",
+            len(removed_cards), len(added_cards),
+            len(rewritten_cards) + len(fuzzy_rewritten), len(fuzzy_rewritten), unchanged_count,
         )
 
         return verified_csv
\ No newline at end of file
@@ -3,20 +3,33 @@ Configuration management for Ankibot
 """
 
 import os
-import json
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
+
+from ankibot.utils import json_dumps, json_loads
 
 APP_TITLE = "Ankibot – Flashcard Generator"
 CONFIG_FILE = "config.json"
 DEFAULT_MODEL = "gemini-2.5-flash"
+CACHE_DIR = "llm_cache"
+
+# Model dropdown label -> (Gemini model, thinking budget); the UI options are built from these keys
+MODEL_MODES: Dict[str, Tuple[str, int]] = {
+    "Ultra Fast (Gemini 2.5 Flash)": ("gemini-2.5-flash", 0),
+    "Fast (Gemini 2.5 Flash + thinking)": ("gemini-2.5-flash", -1),
+    "Smart (Gemini 2.5 Pro + thinking)": ("gemini-2.5-pro", -1),
+    "Fast advanced (Gemini 3.0 Flash)": ("gemini-3.0-flash", 0),
+    "Advanced (Gemini 3.0 Flash + thinking)": ("gemini-3.0-flash", -1),
+    "Smart advanced (Gemini 3.0 Pro + thinking)": ("gemini-3.0-pro", -1),
+}
 
 
 def load_config() -> Dict[str, Any]:
     """Load configuration from disk or environment defaults."""
     if os.path.exists(CONFIG_FILE):
         try:
-            with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
+            # Raw bytes straight to the parser (orjson when installed), no text decoding layer
+            with open(CONFIG_FILE, "rb") as f:
+                return json_loads(f.read())
         except Exception:
             pass
 
@@ -39,5 +52,4 @@ def save_config(cfg: Dict[str, Any]) -> None:
     if config_dir and not os.path.exists(config_dir):
         os.makedirs(config_dir, exist_ok=True)
     with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-        json.dump(cfg, f, indent=2)
-    print(f"Configuration saved to {CONFIG_FILE}")
+        f.write(json_dumps(cfg, indent=True))
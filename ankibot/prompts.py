@@ -3,8 +3,15 @@ ankibot.prompts
 ----------------
 Centralized prompt templates for Ankibot's GenAI backend.
 Each prompt is designed for explicit formatting via `.format()`.
+
+CSV prompts are split in two: a *_STATIC prefix that must stay byte-identical
+across calls (no placeholders, no interpolation) and a *_DYNAMIC tail holding
+every request-specific field, joined by PROMPT_DYNAMIC_MARKER. Keeping the long
+instruction block stable lets Gemini's implicit prompt cache reuse it.
 """
 
+PROMPT_DYNAMIC_MARKER = "\n<<<DYNAMIC>>>\n"
+
 # ================================================================= #
 #                            FACT EXTRACTION                        #
 # ================================================================= #
@@ -39,14 +46,50 @@ Text to analyze:
 {chunk}
 """
 
+# ================================================================= #
+#                        FACT EXTRACTION (BATCH)                    #
+# ================================================================= #
+
+PROMPT_FACT_EXTRACTION_BATCH = r"""
+You are a top-tier educational content analyst and flashcard creator.
+
+You receive several French text segments as a JSON array. Each element has an integer "id" and a "chunk" string.
+Extract **every atomic fact** from each segment, with no hallucinations or omissions.
+
+Output must be a **single valid JSON array** covering all segments. Each element is an object with EXACTLY these keys:
+- "chunk_id": integer (the "id" of the segment the fact comes from)
+- "topic": string
+- "subtopic": string or null
+- "fact": string (single atomic fact, in French, no multiple facts in one item)
+- "source": string or null (page number, heading, or other reference if available)
+
+Output format requirements:
+- Double quotes only (no single quotes).
+- No trailing commas.
+- Do not include explanations or comments outside JSON.
+- Output only the JSON array, nothing else.
+- Escape all backslashes properly
+
+Guidelines:
+- Include definitions, rules, processes, cause-effect, exceptions, formulas, numbers, key data.
+- Each fact must be atomic and self-contained (one idea per item).
+- Avoid duplicates within a segment.
+- Latex/Mathjax should be handled properly. If some are detected, the structure must strictly be written as \\( ... \\). Remove all $ symbols and ensure each formula has exactly one opening \\( and one closing \\).
+- Strictly base facts only on the provided text of each segment.
+- Keep facts in French.
+
+Segments to analyze:
+{chunks_json}
+"""
+
 # ================================================================= #
 #                        CSV GENERATION BASE                        #
 # ================================================================= #
 
-PROMPT_CSV_GENERATION_BASE = r'''
+PROMPT_CSV_GENERATION_STATIC = r'''
 You are an expert Anki flashcard creator.
 
-Given the following JSON array of facts, generate an **Anki-ready CSV** with EXACTLY this header:
+Given the JSON array of facts provided after the <<<DYNAMIC>>> line, generate an **Anki-ready CSV** with EXACTLY this header:
 
 "Topic","Subtopic","Question","Answer","Source","Details"
 
@@ -63,7 +106,10 @@ Requirements:
 - Latex/Mathjax should be handled properly. If some are detected, the structure must strictly be written as \( ... \). Ensure each formula has exactly one opening \( and one closing \).
 - Output **CSV text only**, no explanations or formatting.
 - Do not add extra columns or change the header.
+- Apply the granularity level, reversed-card rule and custom rules given after the <<<DYNAMIC>>> line.
+'''
 
+PROMPT_CSV_GENERATION_DYNAMIC = r'''
 Granularity level: {density_note}
 Reversed cards: {reverse_note}
 
@@ -78,10 +124,10 @@ Facts JSON:
 #                           CSV VERIFICATION                        #
 # ================================================================= #
 
-PROMPT_CSV_VERIFICATION = r"""
+PROMPT_CSV_VERIFICATION_STATIC = r"""
 You are a fact-checker and CSV validator.
 
-Task: verify and correct the flashcards in the CSV below against the original French source text.
+Task: verify and correct the flashcards in the CSV given after the <<<DYNAMIC>>> line against the original French source text.
 
 Instructions:
 - Keep EXACTLY the same header: "Topic","Subtopic","Question","Answer","Source","Details"
@@ -94,7 +140,9 @@ Instructions:
 - Output only corrected CSV text, with header and valid rows.
 - Do not include explanations, commentary, or formatting outside the CSV.
 - Ensure correct CSV formatting.
+"""
 
+PROMPT_CSV_VERIFICATION_DYNAMIC = r"""
 Original source text:
 {full_text}
 
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import threading
 import flet as ft
 
 from ankibot.config import APP_TITLE, load_config, save_config, DEFAULT_MODEL
@@ -30,12 +31,13 @@ class AnkibotApp:
         self.snack = lambda msg, color=None: logger.snack(self, msg, color)
 
         # --- Backend / options ---
-        self.backend = FlashcardBackend(self.cfg.get("api_key", ""), DEFAULT_MODEL, logger=self.logger)
+        self.backend = FlashcardBackend(self.cfg.get("api_key", ""), DEFAULT_MODEL, logger=self.logger, app_cfg=self.cfg)
         self.model_mode = self.cfg.get("model_mode", "Fast (Gemini 2.5 Flash + thinking)")
         self.reverse_card = bool(self.cfg.get("reverse", False))
         self.custom_add = str(self.cfg.get("custom_add", ""))
         self.double_check = bool(self.cfg.get("double_check", False))
         self.new_pipeline = bool(self.cfg.get("new_pipeline", False))
+        self.skip_cache = False  # per session: re-run generation without reusing cached responses
         self.density_level = int(self.cfg.get("density", 2))
         self.split_by_topic = bool(self.cfg.get("split_by_topic", False))
         self.selected_files: list[str] = []
@@ -63,19 +65,40 @@ class AnkibotApp:
         self.api_status: ft.Text | None = None
         self.stats_badge: ft.Text | None = None
         self.content_area: ft.Container = ft.Container(expand=True, animate_opacity=300)
+        self._fp: ft.FilePicker | None = None
         
         # --- New preview controls ---
         self.facts_stats: ft.Container | None = None
         self.cards_stats: ft.Container | None = None
         self.search_facts: ft.TextField | None = None
         self.search_cards: ft.TextField | None = None
+        self._search_queries: dict[str, str] = {"facts": "", "cards": ""}  # current query per table
+        self._search_tasks: dict = {}  # table -> pending debounced search (page.run_task Future)
+        self._appbar: ft.AppBar | None = None  # persistent, recolored by _refresh_current_view
+        self._themed_controls: dict[str, tuple] = {}  # name -> (control, restyle(control, pal, pd))
+        self._last_palette_key: tuple | None = None  # (Palette, dark) applied by _refresh_current_view
+        self._last_ui_push = 0.0  # time.monotonic() of the last pipeline progress push
+        # Open app._batch_updates() blocks, across threads; helpers skip page.update() while > 0
+        self._update_depth = 0
+        self._update_lock = threading.Lock()
         self.update_facts_view: callable | None = None
         self.update_cards_view: callable | None = None
         self.update_logs_view: callable | None = None
+        self._facts_topic_counts: dict[str, int] = {}  # topic -> rows, rebuilt with the table rows
+        self._cards_topic_counts: dict[str, int] = {}
+        self._facts_cursor = 0  # next all_facts / card_rows index a preview window starts scanning from
+        self._cards_cursor = 1
+        # Set when a tab's data changes, cleared once its view has been recomputed
+        self._facts_dirty = self._cards_dirty = self._logs_dirty = True
+        self._last_tab_idx = 0
+        self._logs_empty: ft.Control | None = None
+        self._logs_populated = False  # log_view shown in place of its empty state
 
         # --- Theme helpers ---
         self._apply_theme = lambda: theme.apply_theme(self)
         self._palette = lambda: theme.palette(self)
+        self._palette_version = 0  # bumped on every theme/accent change
+        self._palette_derived = lambda: theme.palette_derived(self)
         self._is_dark = lambda: theme.is_dark(self)
 
 
@@ -91,6 +114,7 @@ class AnkibotApp:
         self._build_settings = lambda: builders.build_settings(self)
         self._build_appbar = lambda: builders.build_appbar(self)
         self._build_status_bar = lambda: builders.build_status_bar(self)
+        self._ensure_results_widgets = lambda: builders.ensure_results_widgets(self)
 
     # ---------------- Bootstrap ---------------- #
     def start(self):
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+from functools import lru_cache, partial
+
 import flet as ft
 
+from ankibot.config import MODEL_MODES
+from ankibot.ui.theme import Palette, PaletteDerived
+from ankibot.utils import with_alpha
+
 # =============================================================
 # Ultra-Modern Dashboard UI for Ankibot
 # - Premium design with glassmorphism and smooth animations
@@ -12,12 +18,103 @@ import flet as ft
 # =============================================================
 
 
+# --------------------------- Constants --------------------------- #
+# Palette-independent values, built once at import and shared by every rebuild
+
+_MODEL_OPTIONS = [ft.dropdown.Option(label) for label in MODEL_MODES]
+_THEME_OPTIONS = [
+    ft.dropdown.Option("system", "🖥️  Automatique (système)"),
+    ft.dropdown.Option("light", "☀️  Clair"),
+    ft.dropdown.Option("dark", "🌙  Sombre"),
+]
+_ANIM_250 = ft.Animation(250, ft.AnimationCurve.EASE_IN_OUT)
+_ANIM_300 = ft.Animation(300, ft.AnimationCurve.EASE_OUT)
+_PAD_SYM_20_14 = ft.padding.symmetric(20, 14)
+_PAD_LEFT_12 = ft.padding.only(left=12)
+_PAD_RIGHT_8 = ft.padding.only(right=8)
+_PAD_BOTTOM_16 = ft.padding.only(bottom=16)
+# (label, app attribute) of the advanced option switches
+_SWITCH_SPECS = (
+    ("Cartes inversées (question ↔ réponse)", "reverse_card"),
+    ("Séparer les decks par topic", "split_by_topic"),
+    ("Double vérification (plus lent mais précis)", "double_check"),
+    ("Nouveau pipeline expérimental", "new_pipeline"),
+    ("Ignorer le cache (régénérer les réponses)", "skip_cache"),
+)
+# Preview tables load their next row window when scrolled within this distance of the end
+_LOAD_MORE_MARGIN_PX = 300
+_SCROLL_INTERVAL_MS = 100
+_STATUS_KW = {"padding": 16, "border_radius": 12, "expand": True}
+# (label, description) per density level, indexed by slider value - 1
+_DENSITY = (
+    ("Sparse", "Moins de cartes, concepts essentiels"),
+    ("Normal", "Équilibre optimal"),
+    ("Dense", "Maximum de détails"),
+)
+
+
+# Flyweights for value objects: identical arguments return the same (never mutated) instance
+@lru_cache(maxsize=128)
+def _pad_sym(horizontal: int, vertical: int) -> ft.Padding:
+    return ft.padding.symmetric(horizontal, vertical)
+
+
+@lru_cache(maxsize=128)
+def _border(width: int, color: str) -> ft.Border:
+    return ft.border.all(width, color)
+
+
+@lru_cache(maxsize=128)
+def _text_style(size: int, color: str) -> ft.TextStyle:
+    return ft.TextStyle(size=size, color=color)
+
+
+@lru_cache(maxsize=128)
+def _shadow(blur_radius: int, color: str, offset_y: int | None = None, spread_radius: int | None = None) -> ft.BoxShadow:
+    return ft.BoxShadow(
+        spread_radius=spread_radius,
+        blur_radius=blur_radius,
+        color=color,
+        offset=ft.Offset(0, offset_y) if offset_y is not None else None,
+    )
+
+
 # ---------------------------- Helpers ---------------------------- #
 
+def _set_attr(app, name: str, e: ft.ControlEvent):
+    setattr(app, name, e.control.value)
+
+
+def _make_attr_setter(app, name: str) -> partial:
+    """on_change handler storing the control value on app.<name>; the same partial is reused across rebuilds."""
+    setters = vars(app).setdefault("_attr_setters", {})
+    setter = setters.get(name)
+    if setter is None:
+        setter = setters[name] = partial(_set_attr, app, name)
+    return setter
+
+
+def _load_more_on_scroll(extend, e: ft.OnScrollEvent):
+    """Scroll handler of a preview table: load its next row window near the bottom."""
+    if e.max_scroll_extent is not None and e.pixels >= e.max_scroll_extent - _LOAD_MORE_MARGIN_PX:
+        extend()
+
+
+def _palette_cached(app, slot: str, build):
+    """Return build(app), reusing the previous result while the palette version and brightness are unchanged."""
+    key = (app._palette_version, app._is_dark())
+    cached = vars(app).get(slot)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    control = build(app)
+    vars(app)[slot] = (key, control)
+    return control
+
+
 def _glassmorphic_card(
     content: ft.Control,
     *,
-    pal: dict,
+    pal: Palette,
     padding: int = 24,
     radius: int = 20,
     expand: bool | int = False,
@@ -25,63 +122,53 @@ def _glassmorphic_card(
 ) -> ft.Container:
     """Premium glassmorphic card design."""
     return ft.Container(
-        bgcolor=pal["surface"],
-        border_radius=radius,
-        padding=padding,
-        border=ft.border.all(1, pal["border"]),
-        shadow=ft.BoxShadow(
-            spread_radius=0,
-            blur_radius=30,
-            color=pal["shadow"],
-            offset=ft.Offset(0, 8)
-        ),
         content=content,
         expand=expand,
-        animate=ft.Animation(300, ft.AnimationCurve.EASE_OUT),
+        **_card_frame(pal.surface, pal.border, pal.shadow, padding, radius),
     )
 
 
-def _metric_card(icon: str, label: str, value: str, color: str, pal: dict) -> ft.Container:
+@lru_cache(maxsize=32)
+def _card_frame(surface: str, border: str, shadow: str, padding: int, radius: int) -> dict:
+    """Non-content kwargs of a glassmorphic card; read-only, only ever unpacked."""
+    return {
+        "bgcolor": surface,
+        "border_radius": radius,
+        "padding": padding,
+        "border": _border(1, border),
+        "shadow": _shadow(30, shadow, 8, spread_radius=0),
+        "animate": _ANIM_300,
+    }
+
+
+def _metric_card(icon: str, label: str, value: str, color: str, pal: Palette) -> ft.Container:
     """Beautiful metric card for dashboard stats."""
     return ft.Container(
         content=ft.Column([
             ft.Row([
                 ft.Container(
                     content=ft.Icon(icon, size=24, color=color),
-                    bgcolor=color + "20",
+                    bgcolor=with_alpha(color, "20"),
                     padding=12,
                     border_radius=12,
                 ),
-                ft.Container(expand=True),
-                ft.Text(value, size=28, weight=ft.FontWeight.W_800, color=pal["text"]),
+                ft.Text(value, size=28, weight=ft.FontWeight.W_800, color=pal.text),
             ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
-            ft.Text(label, size=13, color=pal["muted"], weight=ft.FontWeight.W_500),
+            ft.Text(label, size=13, color=pal.muted, weight=ft.FontWeight.W_500),
         ], spacing=12),
-        bgcolor=pal["surface"],
+        bgcolor=pal.surface,
         padding=20,
         border_radius=16,
-        border=ft.border.all(1, pal["border"]),
-        shadow=ft.BoxShadow(blur_radius=12, color=pal["shadow"], offset=ft.Offset(0, 4)),
+        border=_border(1, pal.border),
+        shadow=_shadow(12, pal.shadow, 4),
     )
 
 
-def _step_indicator(step: int, current: int, label: str, pal: dict) -> ft.Container:
+def _step_indicator(step: int, current: int, label: str, pal: Palette, pd: PaletteDerived) -> ft.Container:
     """Step indicator for wizard flow."""
     is_active = step == current
-    is_complete = step < current
-    
-    if is_complete:
-        icon = ft.Icons.CHECK_CIRCLE
-        icon_color = pal["ok"]
-        bg_color = pal["ok"] + "20"
-    elif is_active:
-        icon = ft.Icons.CIRCLE
-        icon_color = pal["accent"]
-        bg_color = pal["accent"] + "20"
-    else:
-        icon = ft.Icons.CIRCLE_OUTLINED
-        icon_color = pal["muted"]
-        bg_color = pal["surface_alt"]
+    state = 0 if step < current else (1 if is_active else 2)
+    icon, icon_color, bg_color = pd.step_states[state]
     
     return ft.Container(
         content=ft.Column([
@@ -89,7 +176,7 @@ def _step_indicator(step: int, current: int, label: str, pal: dict) -> ft.Contai
             ft.Text(
                 label,
                 size=12,
-                color=icon_color if (is_active or is_complete) else pal["muted"],
+                color=icon_color,  # pending steps already use pal.muted
                 weight=ft.FontWeight.W_600 if is_active else ft.FontWeight.W_400,
                 text_align=ft.TextAlign.CENTER,
             ),
@@ -101,69 +188,72 @@ def _step_indicator(step: int, current: int, label: str, pal: dict) -> ft.Contai
     )
 
 
-def _action_button(
+def _action_button_outlined(
     text: str,
     icon: str,
     color: str,
     *,
     on_click=None,
-    outlined: bool = False,
     disabled: bool = False,
 ) -> ft.Container:
-    """Premium action button with icon."""
-    if outlined:
-        return ft.Container(
-            content=ft.Row([
-                ft.Icon(icon, size=20, color=color if not disabled else "#888888"),
-                ft.Text(
-                    text,
-                    size=15,
-                    weight=ft.FontWeight.W_600,
-                    color=color if not disabled else "#888888"
-                ),
-            ], alignment=ft.MainAxisAlignment.CENTER, spacing=8),
-            bgcolor="transparent",
-            padding=ft.padding.symmetric(20, 14),
-            border_radius=12,
-            border=ft.border.all(2, color if not disabled else "#888888"),
-            ink=not disabled,
-            on_click=on_click if not disabled else None,
-            opacity=0.5 if disabled else 1.0,
-        )
-    else:
-        return ft.Container(
-            content=ft.Row([
-                ft.Icon(icon, size=20, color=ft.Colors.WHITE),
-                ft.Text(text, size=15, weight=ft.FontWeight.W_700, color=ft.Colors.WHITE),
-            ], alignment=ft.MainAxisAlignment.CENTER, spacing=8),
-            bgcolor=color if not disabled else "#888888",
-            padding=ft.padding.symmetric(20, 14),
-            border_radius=12,
-            ink=not disabled,
-            on_click=on_click if not disabled else None,
-            shadow=ft.BoxShadow(
-                blur_radius=16,
-                color=color + "50" if not disabled else "#88888850",
-                offset=ft.Offset(0, 6)
-            ),
-            opacity=0.7 if disabled else 1.0,
-        )
+    """Premium outlined action button with icon."""
+    fg = "#888888" if disabled else color
+    return ft.Container(
+        content=ft.Row([
+            ft.Icon(icon, size=20, color=fg),
+            ft.Text(text, size=15, weight=ft.FontWeight.W_600, color=fg),
+        ], alignment=ft.MainAxisAlignment.CENTER, spacing=8),
+        bgcolor="transparent",
+        padding=_PAD_SYM_20_14,
+        border_radius=12,
+        border=_border(2, fg),
+        ink=not disabled,
+        on_click=None if disabled else on_click,
+        opacity=0.5 if disabled else 1.0,
+    )
+
+
+def _action_button_filled(
+    text: str,
+    icon: str,
+    color: str,
+    *,
+    on_click=None,
+    disabled: bool = False,
+) -> ft.Container:
+    """Premium filled action button with icon."""
+    bg = "#888888" if disabled else color
+    return ft.Container(
+        content=ft.Row([
+            ft.Icon(icon, size=20, color=ft.Colors.WHITE),
+            ft.Text(text, size=15, weight=ft.FontWeight.W_700, color=ft.Colors.WHITE),
+        ], alignment=ft.MainAxisAlignment.CENTER, spacing=8),
+        bgcolor=bg,
+        padding=_PAD_SYM_20_14,
+        border_radius=12,
+        ink=not disabled,
+        on_click=None if disabled else on_click,
+        shadow=_shadow(16, with_alpha(bg, "50"), 6),
+        opacity=0.7 if disabled else 1.0,
+    )
 
 
-def _empty_state(icon: str, title: str, subtitle: str, pal: dict, action_text: str = "", on_action=None) -> ft.Container:
+def _empty_state(
+    icon: str, title: str, subtitle: str, pal: Palette, pd: PaletteDerived, action_text: str = "", on_action=None
+) -> ft.Container:
     """Premium empty state with optional action."""
     items = [
         ft.Container(
-            content=ft.Icon(icon, size=80, color=pal["muted"] + "30"),
-            bgcolor=pal["surface_alt"],
+            content=ft.Icon(icon, size=80, color=pd.muted_30),
+            bgcolor=pal.surface_alt,
             padding=24,
             border_radius=100,
         ),
-        ft.Text(title, size=20, weight=ft.FontWeight.W_700, color=pal["text"]),
+        ft.Text(title, size=20, weight=ft.FontWeight.W_700, color=pal.text),
         ft.Text(
             subtitle,
             size=14,
-            color=pal["muted"],
+            color=pal.muted,
             text_align=ft.TextAlign.CENTER,
             max_lines=3,
         ),
@@ -172,10 +262,10 @@ def _empty_state(icon: str, title: str, subtitle: str, pal: dict, action_text: s
     if action_text and on_action:
         items.append(
             ft.Container(
-                content=ft.Text(action_text, size=14, weight=ft.FontWeight.W_600, color=pal["accent"]),
-                padding=ft.padding.symmetric(16, 10),
+                content=ft.Text(action_text, size=14, weight=ft.FontWeight.W_600, color=pal.accent),
+                padding=_pad_sym(16, 10),
                 border_radius=8,
-                border=ft.border.all(2, pal["accent"]),
+                border=_border(2, pal.accent),
                 ink=True,
                 on_click=on_action,
             )
@@ -196,72 +286,96 @@ def _empty_state(icon: str, title: str, subtitle: str, pal: dict, action_text: s
 # ------------------------- Top App Bar ------------------------- #
 
 def build_appbar(app) -> ft.AppBar:
+    # Built once: a theme or accent change recolors it in place through _restyle_appbar
+    # instead of rebuilding and resending all its buttons
+    if app._appbar is None:
+        app._appbar = _make_appbar(app)
+        app._register_themed("appbar", app._appbar, partial(_restyle_appbar, app))
+    return app._appbar
+
+
+def _appbar_button_style(pd: PaletteDerived) -> ft.ButtonStyle:
+    return ft.ButtonStyle(
+        shape=ft.RoundedRectangleBorder(radius=10),
+        bgcolor={ft.ControlState.HOVERED: pd.accent_15},
+    )
+
+
+def _restyle_appbar(app, bar: ft.AppBar, pal: Palette, pd: PaletteDerived) -> None:
+    bar.bgcolor = pal.surface
+    bar.title.color = pal.text
+    bar.leading.content.controls[0].bgcolor = pd.accent_20
+    home_btn, settings_btn, separator, theme_btn = bar.actions[0].content.controls
+    separator.content.color = pal.border
+    for btn in (home_btn, settings_btn):
+        btn.icon_color = pal.text
+        btn.style = _appbar_button_style(pd)
+    theme_btn.icon = ft.Icons.DARK_MODE_ROUNDED if app._is_dark() else ft.Icons.LIGHT_MODE_ROUNDED
+    theme_btn.icon_color = pal.accent
+    theme_btn.style = _appbar_button_style(pd)
+
+
+def _make_appbar(app) -> ft.AppBar:
     pal = app._palette()
+    pd = app._palette_derived()
+    # Enum namespaces bound to locals: one LOAD_FAST instead of a global + attribute lookup per use
+    I, FW, MAA = ft.Icons, ft.FontWeight, ft.MainAxisAlignment
     
     return ft.AppBar(
         leading=ft.Container(
             content=ft.Row([
                 ft.Container(
                     content=ft.Text("⚡", size=24),
-                    bgcolor=pal["accent"] + "20",
+                    bgcolor=pd.accent_20,
                     padding=8,
                     border_radius=10,
                 ),
-            ], alignment=ft.MainAxisAlignment.CENTER),
-            padding=ft.padding.only(left=12),
+            ], alignment=MAA.CENTER),
+            padding=_PAD_LEFT_12,
         ),
         leading_width=60,
         title=ft.Text(
             "Ankibot", 
             size=22, 
-            weight=ft.FontWeight.W_800,
-            color=pal["text"],
+            weight=FW.W_800,
+            color=pal.text,
         ),
-        bgcolor=pal["surface"],
+        bgcolor=pal.surface,
         center_title=False,
         elevation=0,
         actions=[
             ft.Container(
                 content=ft.Row([
                     ft.IconButton(
-                        ft.Icons.HOME_ROUNDED,
+                        I.HOME_ROUNDED,
                         tooltip="Accueil",
-                        icon_color=pal["text"],
+                        icon_color=pal.text,
                         icon_size=22,
-                        style=ft.ButtonStyle(
-                            shape=ft.RoundedRectangleBorder(radius=10),
-                            bgcolor={ft.ControlState.HOVERED: pal["accent"] + "15"},
-                        ),
+                        style=_appbar_button_style(pd),
                         on_click=lambda e: app._fade_to(build_home(app)),
                     ),
                     ft.IconButton(
-                        ft.Icons.SETTINGS_ROUNDED,
+                        I.SETTINGS_ROUNDED,
                         tooltip="Paramètres",
-                        icon_color=pal["text"],
+                        icon_color=pal.text,
                         icon_size=22,
-                        style=ft.ButtonStyle(
-                            shape=ft.RoundedRectangleBorder(radius=10),
-                            bgcolor={ft.ControlState.HOVERED: pal["accent"] + "15"},
-                        ),
+                        style=_appbar_button_style(pd),
                         on_click=lambda e: app._fade_to(build_settings(app)),
                     ),
                     ft.Container(
-                        content=ft.VerticalDivider(width=1, color=pal["border"]),
+                        content=ft.VerticalDivider(width=1, color=pal.border),
                         height=30,
                     ),
                     ft.IconButton(
-                        ft.Icons.DARK_MODE_ROUNDED if app._is_dark() else ft.Icons.LIGHT_MODE_ROUNDED,
+                        I.DARK_MODE_ROUNDED if app._is_dark() else I.LIGHT_MODE_ROUNDED,
                         tooltip="Basculer thème",
-                        icon_color=pal["accent"],
+                        icon_color=pal.accent,
                         icon_size=22,
-                        style=ft.ButtonStyle(
-                            shape=ft.RoundedRectangleBorder(radius=10),
-                            bgcolor={ft.ControlState.HOVERED: pal["accent"] + "15"},
-                        ),
+                        style=_appbar_button_style(pd),
                         on_click=app._toggle_theme,
                     ),
                 ], spacing=6),
-                padding=ft.padding.only(right=8),
+                padding=_PAD_RIGHT_8,
             ),
         ],
     )
@@ -271,77 +385,217 @@ def build_appbar(app) -> ft.AppBar:
 
 def build_status_bar(app) -> ft.Control:
     pal = app._palette()
+    # Enum namespaces bound to locals: one LOAD_FAST instead of a global + attribute lookup per use
+    I, FW = ft.Icons, ft.FontWeight
 
-    app.file_status = ft.Text("Aucun", size=13, color=pal["text"], weight=ft.FontWeight.W_600)
+    app.file_status = ft.Text("Aucun", size=13, color=pal.text, weight=FW.W_600)
     api_connected = bool(app.cfg.get("api_key"))
     app.api_status = ft.Text(
         "Connectée" if api_connected else "Non configurée",
-        color=pal["ok"] if api_connected else pal["err"],
+        color=pal.ok if api_connected else pal.err,
         size=13,
-        weight=ft.FontWeight.W_700,
+        weight=FW.W_700,
+    )
+    app.stats_badge = ft.Text("—", size=13, color=pal.text, weight=FW.W_600)
+
+    api_color = pal.ok if api_connected else pal.err
+    specs = (
+        (I.DESCRIPTION_ROUNDED, pal.accent, "Fichiers", app.file_status),
+        (I.AUTO_GRAPH_ROUNDED, pal.info, "Résultats", app.stats_badge),
+        (I.API_ROUNDED, api_color, "API Status", app.api_status),
     )
-    app.stats_badge = ft.Text("—", size=13, color=pal["text"], weight=ft.FontWeight.W_600)
+    muted, surface_alt = pal.muted, pal.surface_alt
 
     return ft.Container(
         content=ft.Row([
-            # Files
             ft.Container(
                 content=ft.Row([
-                    ft.Icon(ft.Icons.DESCRIPTION_ROUNDED, size=18, color=pal["accent"]),
+                    ft.Icon(icon, size=18, color=color),
                     ft.Column([
-                        ft.Text("Fichiers", size=11, color=pal["muted"]),
-                        app.file_status,
+                        ft.Text(label, size=11, color=muted),
+                        status,
                     ], spacing=2),
                 ], spacing=12),
-                padding=16,
-                bgcolor=pal["surface_alt"],
-                border_radius=12,
-                expand=True,
-            ),
-            # Stats
-            ft.Container(
-                content=ft.Row([
-                    ft.Icon(ft.Icons.AUTO_GRAPH_ROUNDED, size=18, color=pal["info"]),
-                    ft.Column([
-                        ft.Text("Résultats", size=11, color=pal["muted"]),
-                        app.stats_badge,
-                    ], spacing=2),
-                ], spacing=12),
-                padding=16,
-                bgcolor=pal["surface_alt"],
-                border_radius=12,
-                expand=True,
-            ),
-            # API
-            ft.Container(
-                content=ft.Row([
-                    ft.Icon(
-                        ft.Icons.API_ROUNDED,
-                        size=18,
-                        color=pal["ok"] if api_connected else pal["err"]
-                    ),
-                    ft.Column([
-                        ft.Text("API Status", size=11, color=pal["muted"]),
-                        app.api_status,
-                    ], spacing=2),
-                ], spacing=12),
-                padding=16,
-                bgcolor=pal["surface_alt"],
-                border_radius=12,
-                expand=True,
-            ),
+                bgcolor=surface_alt,
+                **_STATUS_KW,
+            )
+            for icon, color, label, status in specs
         ], spacing=12),
         padding=0,
     )
 
 
+@lru_cache(maxsize=64)
+def _count_label(rows: int, topics: int, unit: str) -> str:
+    return f"{rows} {unit} • {topics} topics"
+
+
+_FACT_COLS = ("Topic", "Subtopic", "Fact", "Source")
+_CARD_COLS = ("Topic", "Subtopic", "Question", "Réponse", "Source", "Détails")
+
+
+def _hdr_text(label: str, pal: Palette) -> ft.DataColumn:
+    return ft.DataColumn(
+        ft.Container(
+            content=ft.Text(label, weight=ft.FontWeight.W_700, size=13, color=pal.text),
+            padding=8,
+        )
+    )
+
+
+def _hdr_icon(icon: str, color: str) -> ft.DataColumn:
+    return ft.DataColumn(ft.Container(content=ft.Icon(icon, size=18, color=color), padding=8))
+
+
+# Restylers for _refresh_current_view: recolor a registered control in place on theme change
+def _restyle_stats(c: ft.Container, pal: Palette, pd: PaletteDerived) -> None:
+    c.bgcolor = pal.surface_alt
+    for ctrl in c.content.controls:
+        ctrl.color = pal.muted
+
+
+def _restyle_search(c: ft.TextField, pal: Palette, pd: PaletteDerived) -> None:
+    c.bgcolor = pal.surface_alt
+    c.border_color = pal.border
+    c.focused_border_color = pal.accent
+    c.text_style.color = pal.text
+
+
+def _restyle_table(c: ft.DataTable, pal: Palette, pd: PaletteDerived) -> None:
+    c.heading_row_color = pal.surface_alt
+    c.border = _border(1, pal.border)
+    c.horizontal_lines = ft.BorderSide(1, pd.border_40)
+
+
+def _restyle_tabs(c: ft.Tabs, pal: Palette, pd: PaletteDerived) -> None:
+    c.label_color = pal.accent
+    c.indicator_color = pal.accent
+    c.divider_color = pal.border
+    c.overlay_color = {ft.ControlState.HOVERED: pd.accent_10}
+
+
+def _restyle_progress(c: ft.ProgressBar, pal: Palette, pd: PaletteDerived) -> None:
+    c.color = pal.accent
+    c.bgcolor = pal.border
+
+
+def _restyle_progress_label(c: ft.Text, pal: Palette, pd: PaletteDerived) -> None:
+    c.color = pal.text
+
+
+def ensure_results_widgets(app) -> None:
+    """Build the results tables, search fields and stats on first use.
+
+    They stay hidden until a pipeline produces data, so build_home does not construct them;
+    once built they live on the app and are reused by later home rebuilds.
+    """
+    if app.fact_preview is not None:
+        return
+    pal = app._palette()
+    pd = app._palette_derived()
+
+    # Stats summary for each tab
+    app.facts_stats = ft.Container(
+        content=ft.Row([
+            ft.Icon(ft.Icons.ANALYTICS_OUTLINED, size=16, color=pal.muted),
+            ft.Text("0 faits • 0 topics", size=12, color=pal.muted, weight=ft.FontWeight.W_600),
+        ], spacing=8),
+        padding=_pad_sym(12, 8),
+        bgcolor=pal.surface_alt,
+        border_radius=8,
+        visible=False,
+    )
+    
+    app.cards_stats = ft.Container(
+        content=ft.Row([
+            ft.Icon(ft.Icons.ANALYTICS_OUTLINED, size=16, color=pal.muted),
+            ft.Text("0 cartes • 0 topics", size=12, color=pal.muted, weight=ft.FontWeight.W_600),
+        ], spacing=8),
+        padding=_pad_sym(12, 8),
+        bgcolor=pal.surface_alt,
+        border_radius=8,
+        visible=False,
+    )
+    
+    # Search and filter controls
+    app.search_facts = ft.TextField(
+        value=app._search_queries["facts"],  # the query survives home rebuilds
+        hint_text="🔍 Rechercher dans les faits...",
+        on_change=app._on_search,
+        border_radius=10,
+        text_style=ft.TextStyle(size=13, color=pal.text),
+        bgcolor=pal.surface_alt,
+        border_color=pal.border,
+        focused_border_color=pal.accent,
+        height=40,
+        content_padding=_pad_sym(12, 8),
+        visible=False,
+    )
+    
+    app.search_cards = ft.TextField(
+        value=app._search_queries["cards"],
+        hint_text="🔍 Rechercher dans les cartes...",
+        on_change=app._on_search,
+        border_radius=10,
+        text_style=ft.TextStyle(size=13, color=pal.text),
+        bgcolor=pal.surface_alt,
+        border_color=pal.border,
+        focused_border_color=pal.accent,
+        height=40,
+        content_padding=_pad_sym(12, 8),
+        visible=False,
+    )
+    
+    # Enhanced data tables with better styling
+    app.fact_preview = ft.DataTable(
+        columns=[_hdr_text(label, pal) for label in _FACT_COLS],
+        rows=[],
+        border=_border(1, pal.border),
+        border_radius=12,
+        heading_row_color=pal.surface_alt,
+        heading_row_height=48,
+        data_row_min_height=70,
+        data_row_max_height=120,
+        column_spacing=24,
+        horizontal_lines=ft.BorderSide(1, pd.border_40),
+        show_checkbox_column=False,
+    )
+
+    app.cards_preview = ft.DataTable(
+        columns=[_hdr_text(label, pal) for label in _CARD_COLS] + [
+            _hdr_icon(ft.Icons.EDIT_ROUNDED, pal.accent),
+            _hdr_icon(ft.Icons.DELETE_ROUNDED, pal.err),
+        ],
+        rows=[],
+        border=_border(1, pal.border),
+        border_radius=12,
+        heading_row_color=pal.surface_alt,
+        heading_row_height=48,
+        data_row_min_height=80,
+        data_row_max_height=150,
+        column_spacing=16,
+        horizontal_lines=ft.BorderSide(1, pd.border_40),
+        show_checkbox_column=False,
+    )
+
+    register = app._register_themed
+    register("facts_stats", app.facts_stats, _restyle_stats)
+    register("cards_stats", app.cards_stats, _restyle_stats)
+    register("search_facts", app.search_facts, _restyle_search)
+    register("search_cards", app.search_cards, _restyle_search)
+    register("fact_preview", app.fact_preview, _restyle_table)
+    register("cards_preview", app.cards_preview, _restyle_table)
+
+
 # --------------------------- Home --------------------------- #
 
-def build_home(app) -> ft.Control:
+def _build_hero(app) -> ft.Container:
+    """Static hero banner: only depends on the palette, so it is built once per theme."""
     pal = app._palette()
+    pd = app._palette_derived()
+    I, FW, MAA = ft.Icons, ft.FontWeight, ft.MainAxisAlignment
 
-    # ----- Hero Section ----- #
-    hero = _glassmorphic_card(
+    return _glassmorphic_card(
         pal=pal,
         radius=24,
         padding=32,
@@ -351,79 +605,106 @@ def build_home(app) -> ft.Control:
                     ft.Row([
                         ft.Text("⚡", size=42),
                         ft.Column([
-                            ft.Text("Ankibot", size=36, weight=ft.FontWeight.W_900, color=pal["text"]),
+                            ft.Text("Ankibot", size=36, weight=FW.W_900, color=pal.text),
                             ft.Container(
                                 content=ft.Text(
                                     "Powered by Gemini AI",
                                     size=12,
-                                    color=pal["accent"],
-                                    weight=ft.FontWeight.W_600,
+                                    color=pal.accent,
+                                    weight=FW.W_600,
                                 ),
-                                bgcolor=pal["accent"] + "15",
-                                padding=ft.padding.symmetric(8, 4),
+                                bgcolor=pd.accent_15,
+                                padding=_pad_sym(8, 4),
                                 border_radius=6,
                             ),
                         ], spacing=4),
-                    ], spacing=16, alignment=ft.MainAxisAlignment.START),
+                    ], spacing=16, alignment=MAA.START),
                     ft.Container(height=8),
                     ft.Text(
                         "Transformez vos documents en flashcards Anki intelligemment",
                         size=16,
-                        color=pal["text_secondary"],
-                        weight=ft.FontWeight.W_500,
+                        color=pal.text_secondary,
+                        weight=FW.W_500,
                     ),
                 ], spacing=4, expand=True),
                 ft.Container(
                     content=ft.Icon(
-                        ft.Icons.AUTO_AWESOME_ROUNDED,
+                        I.AUTO_AWESOME_ROUNDED,
                         size=64,
-                        color=pal["accent"] + "60"
+                        color=pd.accent_60
                     ),
-                    bgcolor=pal["accent"] + "15",
+                    bgcolor=pd.accent_15,
                     padding=20,
                     border_radius=20,
                 ),
-            ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+            ], alignment=MAA.SPACE_BETWEEN),
         ], spacing=0),
     )
 
+
+def _build_results_toolbar(app) -> ft.Container:
+    """Static header of the results card (title + editing hint)."""
+    pal = app._palette()
+    pd = app._palette_derived()
+    I, FW, MAA = ft.Icons, ft.FontWeight, ft.MainAxisAlignment
+
+    return ft.Container(
+        content=ft.Row([
+            ft.Icon(I.VISIBILITY_ROUNDED, color=pal.accent, size=22),
+            # The title expands and pushes the tip to the right, no spacer container
+            ft.Text("Résultats", size=18, weight=FW.W_700, color=pal.text, expand=True),
+            ft.Container(
+                content=ft.Row([
+                    ft.Icon(I.INFO_OUTLINE_ROUNDED, size=16, color=pal.info),
+                    ft.Text(
+                        "Double-cliquez ✏️ pour éditer • Cliquez 🗑️ pour supprimer",
+                        size=11,
+                        color=pal.muted,
+                        weight=FW.W_500,
+                    ),
+                ], spacing=6),
+                padding=_pad_sym(12, 8),
+                bgcolor=pd.info_10,
+                border_radius=8,
+                border=_border(1, pd.info_20),
+            ),
+        ], alignment=MAA.START),
+        padding=_PAD_BOTTOM_16,
+    )
+
+
+def build_home(app) -> ft.Control:
+    pal = app._palette()
+    pd = app._palette_derived()
+    # Enum namespaces bound to locals: one LOAD_FAST instead of a global + attribute lookup per use
+    I, FW, MAA, CAA, TA, CS = ft.Icons, ft.FontWeight, ft.MainAxisAlignment, ft.CrossAxisAlignment, ft.TextAlign, ft.ControlState
+
+    # ----- Hero Section ----- #
+    hero = _palette_cached(app, "_hero_cache", _build_hero)
+
     # ----- Configuration Section ----- #
     model_dd = ft.Dropdown(
         label="🤖 Modèle IA",
-        options=[
-            ft.dropdown.Option("Ultra Fast (Gemini 2.5 Flash)"),
-            ft.dropdown.Option("Fast (Gemini 2.5 Flash + thinking)"),
-            ft.dropdown.Option("Smart (Gemini 2.5 Pro + thinking)"),
-            ft.dropdown.Option("Fast advanced (Gemini 3.0 Flash)"),
-            ft.dropdown.Option("Advanced (Gemini 3.0 Flash + thinking)"),
-            ft.dropdown.Option("Smart advanced (Gemini 3.0 Pro + thinking)"),
-        ],
+        options=_MODEL_OPTIONS,
         value=app.model_mode,
         border_radius=12,
-        text_style=ft.TextStyle(size=14, color=pal["text"]),
-        bgcolor=pal["surface_alt"],
-        border_color=pal["border"],
-        focused_border_color=pal["accent"],
+        text_style=ft.TextStyle(size=14, color=pal.text),
+        bgcolor=pal.surface_alt,
+        border_color=pal.border,
+        focused_border_color=pal.accent,
         on_change=app._on_model_change,
     )
 
-    density_label = ft.Text("Normal", size=14, color=pal["accent"], weight=ft.FontWeight.W_700)
-    density_desc = {
-        1: ("Sparse", "Moins de cartes, concepts essentiels"),
-        2: ("Normal", "Équilibre optimal"),
-        3: ("Dense", "Maximum de détails"),
-    }
+    density_label = ft.Text("Normal", size=14, color=pal.accent, weight=FW.W_700)
     density_subtitle = ft.Text(
-        density_desc[app.density_level][1],
+        _DENSITY[app.density_level - 1][1],
         size=12,
-        color=pal["muted"],
+        color=pal.muted,
         italic=True,
     )
 
     def update_density_desc(e):
-        level = int(e.control.value)
-        density_label.value = density_desc[level][0]
-        density_subtitle.value = density_desc[level][1]
+        density_label.value, density_subtitle.value = _DENSITY[int(e.control.value) - 1]
         app._update_density(e, density_label)
 
     density_slider = ft.Slider(
@@ -431,127 +712,109 @@ def build_home(app) -> ft.Control:
         max=3,
         divisions=2,
         value=app.density_level,
-        active_color=pal["accent"],
-        inactive_color=pal["border"],
-        thumb_color=pal["accent"],
+        active_color=pal.accent,
+        inactive_color=pal.border,
+        thumb_color=pal.accent,
         on_change=update_density_desc,
     )
 
-    config_section = _glassmorphic_card(
-        pal=pal,
-        content=ft.Column([
-            ft.Row([
-                ft.Icon(ft.Icons.TUNE_ROUNDED, color=pal["accent"], size=22),
-                ft.Text("Configuration", size=18, weight=ft.FontWeight.W_700, color=pal["text"]),
-            ], spacing=12),
-            ft.Divider(color=pal["border"], height=20),
-            model_dd,
-            ft.Container(height=8),
-            ft.Row([
-                ft.Column([
-                    ft.Text("Densité des cartes", size=14, color=pal["text"], weight=ft.FontWeight.W_600),
-                    density_subtitle,
-                ], spacing=4, expand=True),
-                density_label,
-            ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
-            density_slider,
-            ft.Container(height=8),
-            ft.Container(
-                content=ft.Column([
-                    ft.Row([
-                        ft.Icon(ft.Icons.TUNE, size=16, color=pal["muted"]),
-                        ft.Text("Options avancées", size=13, color=pal["muted"], weight=ft.FontWeight.W_600),
-                    ], spacing=8),
-                    ft.Divider(color=pal["border"], height=12),
-                    ft.Switch(
-                        label="Cartes inversées (question ↔ réponse)",
-                        value=app.reverse_card,
-                        active_color=pal["accent"],
-                        label_style=ft.TextStyle(size=13, color=pal["text"]),
-                        on_change=lambda e: setattr(app, "reverse_card", e.control.value),
-                    ),
-                    ft.Switch(
-                        label="Séparer les decks par topic",
-                        value=app.split_by_topic,
-                        active_color=pal["accent"],
-                        label_style=ft.TextStyle(size=13, color=pal["text"]),
-                        on_change=lambda e: setattr(app, "split_by_topic", e.control.value),
-                    ),
-                    ft.Switch(
-                        label="Double vérification (plus lent mais précis)",
-                        value=app.double_check,
-                        active_color=pal["accent"],
-                        label_style=ft.TextStyle(size=13, color=pal["text"]),
-                        on_change=lambda e: setattr(app, "double_check", e.control.value),
-                    ),
-                    ft.Switch(
-                        label="Nouveau pipeline expérimental",
-                        value=app.new_pipeline,
-                        active_color=pal["accent"],
-                        label_style=ft.TextStyle(size=13, color=pal["text"]),
-                        on_change=lambda e: setattr(app, "new_pipeline", e.control.value),
-                    ),
-                ], spacing=10),
-                padding=16,
-                bgcolor=pal["surface_alt"],
-                border_radius=12,
-                border=ft.border.all(1, pal["border"]),
-            ),
-        ], spacing=16),
+    # Children lists are sized up front and filled by index, then handed to a single Column
+    advanced_children = [None] * (2 + len(_SWITCH_SPECS))
+    advanced_children[0] = ft.Row([
+        ft.Icon(I.TUNE, size=16, color=pal.muted),
+        ft.Text("Options avancées", size=13, color=pal.muted, weight=FW.W_600),
+    ], spacing=8)
+    advanced_children[1] = ft.Divider(color=pal.border, height=12)
+    label_style = _text_style(13, pal.text)
+    advanced_children[2:] = [
+        ft.Switch(
+            label=label,
+            value=getattr(app, attr),
+            active_color=pal.accent,
+            label_style=label_style,
+            on_change=_make_attr_setter(app, attr),
+        )
+        for label, attr in _SWITCH_SPECS
+    ]
+
+    config_children = [None] * 8
+    config_children[0] = ft.Row([
+        ft.Icon(I.TUNE_ROUNDED, color=pal.accent, size=22),
+        ft.Text("Configuration", size=18, weight=FW.W_700, color=pal.text),
+    ], spacing=12)
+    config_children[1] = ft.Divider(color=pal.border, height=20)
+    config_children[2] = model_dd
+    config_children[3] = ft.Container(height=8)
+    config_children[4] = ft.Row([
+        ft.Column([
+            ft.Text("Densité des cartes", size=14, color=pal.text, weight=FW.W_600),
+            density_subtitle,
+        ], spacing=4, expand=True),
+        density_label,
+    ], alignment=MAA.SPACE_BETWEEN)
+    config_children[5] = density_slider
+    config_children[6] = ft.Container(height=8)
+    config_children[7] = ft.Container(
+        content=ft.Column(advanced_children, spacing=10),
+        padding=16,
+        bgcolor=pal.surface_alt,
+        border_radius=12,
+        border=_border(1, pal.border),
     )
 
+    config_section = _glassmorphic_card(pal=pal, content=ft.Column(config_children, spacing=16))
+
     # ----- Input Section ----- #
-    fp = ft.FilePicker(on_result=app._on_pick)
-    app.page.overlay.append(fp)
+    fp = app._ensure_filepicker()
 
     input_section = _glassmorphic_card(
         pal=pal,
         content=ft.Column([
             ft.Row([
-                ft.Icon(ft.Icons.INPUT_ROUNDED, color=pal["info"], size=22),
-                ft.Text("Source du contenu", size=18, weight=ft.FontWeight.W_700, color=pal["text"]),
+                ft.Icon(I.INPUT_ROUNDED, color=pal.info, size=22),
+                ft.Text("Source du contenu", size=18, weight=FW.W_700, color=pal.text),
             ], spacing=12),
-            ft.Divider(color=pal["border"], height=20),
+            ft.Divider(color=pal.border, height=20),
             
             # File upload area
             ft.Container(
                 content=ft.Column([
-                    ft.Icon(ft.Icons.CLOUD_UPLOAD_ROUNDED, size=48, color=pal["accent"] + "60"),
+                    ft.Icon(I.CLOUD_UPLOAD_ROUNDED, size=48, color=pd.accent_60),
                     ft.Text(
                         "Glissez vos fichiers ici ou cliquez pour parcourir",
                         size=15,
-                        color=pal["text"],
-                        weight=ft.FontWeight.W_600,
+                        color=pal.text,
+                        weight=FW.W_600,
                     ),
                     ft.Text(
                         "PDF et TXT supportés • Plusieurs fichiers possibles",
                         size=12,
-                        color=pal["muted"],
+                        color=pal.muted,
                     ),
                     ft.Container(height=8),
                     ft.Container(
                         content=ft.Row([
-                            ft.Icon(ft.Icons.UPLOAD_FILE_ROUNDED, size=18, color=pal["accent"]),
-                            ft.Text("Parcourir les fichiers", size=14, weight=ft.FontWeight.W_600, color=pal["accent"]),
-                        ], alignment=ft.MainAxisAlignment.CENTER, spacing=8),
-                        padding=ft.padding.symmetric(20, 12),
-                        bgcolor=pal["accent"] + "15",
+                            ft.Icon(I.UPLOAD_FILE_ROUNDED, size=18, color=pal.accent),
+                            ft.Text("Parcourir les fichiers", size=14, weight=FW.W_600, color=pal.accent),
+                        ], alignment=MAA.CENTER, spacing=8),
+                        padding=_pad_sym(20, 12),
+                        bgcolor=pd.accent_15,
                         border_radius=10,
-                        border=ft.border.all(2, pal["accent"] + "40"),
+                        border=_border(2, pd.accent_40),
                         ink=True,
                         on_click=lambda e: fp.pick_files(allow_multiple=True, allowed_extensions=["pdf", "txt"]),
                     ),
-                ], spacing=12, horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+                ], spacing=12, horizontal_alignment=CAA.CENTER),
                 padding=40,
-                bgcolor=pal["surface_alt"],
+                bgcolor=pal.surface_alt,
                 border_radius=12,
-                border=ft.border.all(2, pal["border"]),
+                border=_border(2, pal.border),
             ),
             
             ft.Row([
-                ft.Container(expand=True, height=1, bgcolor=pal["border"]),
-                ft.Text("OU", size=12, color=pal["muted"], weight=ft.FontWeight.W_600),
-                ft.Container(expand=True, height=1, bgcolor=pal["border"]),
+                ft.Container(expand=True, height=1, bgcolor=pal.border),
+                ft.Text("OU", size=12, color=pal.muted, weight=FW.W_600),
+                ft.Container(expand=True, height=1, bgcolor=pal.border),
             ], spacing=12),
             
             # Text input
@@ -561,11 +824,11 @@ def build_home(app) -> ft.Control:
                 min_lines=5,
                 max_lines=10,
                 border_radius=12,
-                text_style=ft.TextStyle(color=pal["text"], size=14),
-                bgcolor=pal["surface_alt"],
+                text_style=ft.TextStyle(color=pal.text, size=14),
+                bgcolor=pal.surface_alt,
                 hint_text="Collez le contenu de vos cours ici...",
-                border_color=pal["border"],
-                focused_border_color=pal["info"],
+                border_color=pal.border,
+                focused_border_color=pal.info,
                 ref=ft.Ref[ft.TextField](),  # Store reference
             ),
             
@@ -576,12 +839,12 @@ def build_home(app) -> ft.Control:
                 min_lines=2,
                 max_lines=4,
                 border_radius=12,
-                text_style=ft.TextStyle(color=pal["text"], size=14),
-                bgcolor=pal["surface_alt"],
+                text_style=ft.TextStyle(color=pal.text, size=14),
+                bgcolor=pal.surface_alt,
                 hint_text="Ex: Insister sur les dates historiques, créer des questions de type QCM...",
-                border_color=pal["border"],
-                focused_border_color=pal["info"],
-                on_change=lambda e: setattr(app, "custom_add", e.control.value),
+                border_color=pal.border,
+                focused_border_color=pal.info,
+                on_change=_make_attr_setter(app, "custom_add"),
             ),
         ], spacing=16),
     )
@@ -590,287 +853,128 @@ def build_home(app) -> ft.Control:
     text_area_ref = input_section.content.controls[4]
 
     # ----- Action Section ----- #
-    app.progress = ft.ProgressBar(
-        color=pal["accent"],
-        bgcolor=pal["border"],
-        height=8,
-        border_radius=4,
-        visible=False,
-    )
-    app.progress_label = ft.Text(
-        "",
-        color=pal["text"],
-        size=13,
-        weight=ft.FontWeight.W_600,
-        text_align=ft.TextAlign.CENTER,
-    )
+    # Progress bar and label survive rebuilds: a running pipeline keeps writing to them,
+    # only the theme is reapplied through the registry
+    if app.progress is None:
+        app.progress = ft.ProgressBar(
+            color=pal.accent,
+            bgcolor=pal.border,
+            height=8,
+            border_radius=4,
+            visible=False,
+        )
+        app.progress_label = ft.Text(
+            "",
+            color=pal.text,
+            size=13,
+            weight=FW.W_600,
+            text_align=TA.CENTER,
+        )
+        app._register_themed("progress", app.progress, _restyle_progress)
+        app._register_themed("progress_label", app.progress_label, _restyle_progress_label)
 
     action_section = _glassmorphic_card(
         pal=pal,
         content=ft.Column([
             ft.Row([
-                _action_button(
+                _action_button_filled(
                     "✨ Générer les flashcards",
-                    ft.Icons.AUTO_AWESOME_ROUNDED,
-                    pal["accent"],
+                    I.AUTO_AWESOME_ROUNDED,
+                    pal.accent,
                     on_click=lambda e: app.page.run_task(
                         app._start_pipeline,
                         text_area_ref.value if hasattr(text_area_ref, 'value') else ""
                     ),
                 ),
-            ], alignment=ft.MainAxisAlignment.CENTER),
+            ], alignment=MAA.CENTER),
             app.progress,
             app.progress_label,
             ft.Container(height=8),
             ft.Row([
-                _action_button(
+                _action_button_outlined(
                     "Annuler",
-                    ft.Icons.CANCEL_ROUNDED,
-                    pal["err"],
-                    outlined=True,
-                    on_click=lambda e: app.cancel_event.set(),
+                    I.CANCEL_ROUNDED,
+                    pal.err,
+                    on_click=app._request_cancel,
                 ),
-                _action_button(
+                _action_button_outlined(
                     "Exporter",
-                    ft.Icons.DOWNLOAD_ROUNDED,
-                    pal["ok"],
-                    outlined=True,
+                    I.DOWNLOAD_ROUNDED,
+                    pal.ok,
                     on_click=lambda e: app.page.run_task(app._save_outputs),
                 ),
-            ], spacing=12, alignment=ft.MainAxisAlignment.CENTER),
-        ], spacing=16, horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+            ], spacing=12, alignment=MAA.CENTER),
+        ], spacing=16, horizontal_alignment=CAA.CENTER),
     )
 
 # ----- Results Section ----- #
     
-    # Initialize data containers
-    app.log_view = ft.ListView(expand=True, spacing=8, auto_scroll=True, padding=20)
+    # New list on every build, but the entries already logged are carried over instead of lost
+    previous_logs = app.log_view.controls if app.log_view is not None else None
+    app.log_view = ft.ListView(previous_logs, expand=True, spacing=8, auto_scroll=True, padding=20)
     
-    # Stats summary for each tab
-    app.facts_stats = ft.Container(
-        content=ft.Row([
-            ft.Icon(ft.Icons.ANALYTICS_OUTLINED, size=16, color=pal["muted"]),
-            ft.Text("0 faits • 0 topics", size=12, color=pal["muted"], weight=ft.FontWeight.W_600),
-        ], spacing=8),
-        padding=ft.padding.symmetric(12, 8),
-        bgcolor=pal["surface_alt"],
-        border_radius=8,
-        visible=False,
-    )
-    
-    app.cards_stats = ft.Container(
-        content=ft.Row([
-            ft.Icon(ft.Icons.ANALYTICS_OUTLINED, size=16, color=pal["muted"]),
-            ft.Text("0 cartes • 0 topics", size=12, color=pal["muted"], weight=ft.FontWeight.W_600),
-        ], spacing=8),
-        padding=ft.padding.symmetric(12, 8),
-        bgcolor=pal["surface_alt"],
-        border_radius=8,
-        visible=False,
-    )
-    
-    # Search and filter controls
-    app.search_facts = ft.TextField(
-        hint_text="🔍 Rechercher dans les faits...",
-        border_radius=10,
-        text_style=ft.TextStyle(size=13, color=pal["text"]),
-        bgcolor=pal["surface_alt"],
-        border_color=pal["border"],
-        focused_border_color=pal["accent"],
-        height=40,
-        content_padding=ft.padding.symmetric(12, 8),
-        visible=False,
-    )
-    
-    app.search_cards = ft.TextField(
-        hint_text="🔍 Rechercher dans les cartes...",
-        border_radius=10,
-        text_style=ft.TextStyle(size=13, color=pal["text"]),
-        bgcolor=pal["surface_alt"],
-        border_color=pal["border"],
-        focused_border_color=pal["accent"],
-        height=40,
-        content_padding=ft.padding.symmetric(12, 8),
-        visible=False,
-    )
-    
-    # Enhanced data tables with better styling
-    app.fact_preview = ft.DataTable(
-        columns=[
-            ft.DataColumn(
-                ft.Container(
-                    content=ft.Text("Topic", weight=ft.FontWeight.W_700, size=13, color=pal["text"]),
-                    padding=8,
-                )
-            ),
-            ft.DataColumn(
-                ft.Container(
-                    content=ft.Text("Subtopic", weight=ft.FontWeight.W_700, size=13, color=pal["text"]),
-                    padding=8,
-                )
-            ),
-            ft.DataColumn(
-                ft.Container(
-                    content=ft.Text("Fact", weight=ft.FontWeight.W_700, size=13, color=pal["text"]),
-                    padding=8,
-                )
-            ),
-            ft.DataColumn(
-                ft.Container(
-                    content=ft.Text("Source", weight=ft.FontWeight.W_700, size=13, color=pal["text"]),
-                    padding=8,
-                )
-            ),
-        ],
-        rows=[],
-        border=ft.border.all(1, pal["border"]),
-        border_radius=12,
-        heading_row_color=pal["surface_alt"],
-        heading_row_height=48,
-        data_row_min_height=70,
-        data_row_max_height=120,
-        column_spacing=24,
-        horizontal_lines=ft.BorderSide(1, pal["border"] + "40"),
-        show_checkbox_column=False,
-    )
-
-    app.cards_preview = ft.DataTable(
-        columns=[
-            ft.DataColumn(
-                ft.Container(
-                    content=ft.Text("Topic", weight=ft.FontWeight.W_700, size=13, color=pal["text"]),
-                    padding=8,
-                )
-            ),
-            ft.DataColumn(
-                ft.Container(
-                    content=ft.Text("Subtopic", weight=ft.FontWeight.W_700, size=13, color=pal["text"]),
-                    padding=8,
-                )
-            ),
-            ft.DataColumn(
-                ft.Container(
-                    content=ft.Text("Question", weight=ft.FontWeight.W_700, size=13, color=pal["text"]),
-                    padding=8,
-                )
-            ),
-            ft.DataColumn(
-                ft.Container(
-                    content=ft.Text("Réponse", weight=ft.FontWeight.W_700, size=13, color=pal["text"]),
-                    padding=8,
-                )
-            ),
-            ft.DataColumn(
-                ft.Container(
-                    content=ft.Text("Source", weight=ft.FontWeight.W_700, size=13, color=pal["text"]),
-                    padding=8,
-                )
-            ),
-            ft.DataColumn(
-                ft.Container(
-                    content=ft.Text("Détails", weight=ft.FontWeight.W_700, size=13, color=pal["text"]),
-                    padding=8,
-                )
-            ),
-            ft.DataColumn(
-                ft.Container(
-                    content=ft.Icon(ft.Icons.EDIT_ROUNDED, size=18, color=pal["accent"]),
-                    padding=8,
-                )
-            ),
-            ft.DataColumn(
-                ft.Container(
-                    content=ft.Icon(ft.Icons.DELETE_ROUNDED, size=18, color=pal["err"]),
-                    padding=8,
-                )
-            ),
-        ],
-        rows=[],
-        border=ft.border.all(1, pal["border"]),
-        border_radius=12,
-        heading_row_color=pal["surface_alt"],
-        heading_row_height=48,
-        data_row_min_height=80,
-        data_row_max_height=150,
-        column_spacing=16,
-        horizontal_lines=ft.BorderSide(1, pal["border"] + "40"),
-        show_checkbox_column=False,
-    )
-
     # Enhanced empty states with animations
     facts_empty = _empty_state(
-        ft.Icons.LIGHTBULB_OUTLINE_ROUNDED,
+        I.LIGHTBULB_OUTLINE_ROUNDED,
         "Aucun fait extrait",
         "Les faits importants seront extraits de vos documents\net organisés par topic et subtopic",
         pal,
+        pd,
         action_text="📚 Comment ça marche ?",
-        on_action=lambda e: app.snack("Les faits sont extraits automatiquement lors du traitement", pal["info"])
+        on_action=lambda e: app.snack("Les faits sont extraits automatiquement lors du traitement", pal.info)
     )
 
-    cards_empty = _empty_state(
-        ft.Icons.STYLE_ROUNDED,
-        "Aucune carte générée",
-        "Les flashcards intelligentes seront créées à partir\ndes faits extraits avec questions contextuelles",
-        pal,
-        action_text="✨ Voir un exemple",
-        on_action=lambda e: app._fade_to(build_settings(app))
-    )
-
-    logs_empty = _empty_state(
-        ft.Icons.TERMINAL_ROUNDED,
-        "En attente de traitement",
-        "Les logs de génération apparaîtront ici en temps réel\npour suivre la progression du pipeline",
-        pal
-    )
-
-    # Tabs with improved design
-    app.preview_tab = ft.Tabs(
-        selected_index=0,
-        animation_duration=300,
-        label_color=pal["accent"],
-        indicator_color=pal["accent"],
-        indicator_tab_size=True,
-        indicator_border_radius=ft.border_radius.only(top_left=8, top_right=8),
-        divider_color=pal["border"],
-        overlay_color={ft.ControlState.HOVERED: pal["accent"] + "10"},
-        tabs=[
-            ft.Tab(
-                text="Faits extraits",
-                icon=ft.Icons.LIGHTBULB_ROUNDED,
-            ),
-            ft.Tab(
-                text="Flashcards",
-                icon=ft.Icons.STYLE_ROUNDED,
-            ),
-            ft.Tab(
-                text="Logs",
-                icon=ft.Icons.TERMINAL_ROUNDED,
-            ),
-        ],
-    )
+    # Tabs with improved design; built once, recolored through the themed registry
+    if app.preview_tab is None:
+        app.preview_tab = ft.Tabs(
+            animation_duration=300,
+            label_color=pal.accent,
+            indicator_color=pal.accent,
+            indicator_tab_size=True,
+            indicator_border_radius=ft.border_radius.only(top_left=8, top_right=8),
+            divider_color=pal.border,
+            overlay_color={CS.HOVERED: pd.accent_10},
+            tabs=[
+                ft.Tab(
+                    text="Faits extraits",
+                    icon=I.LIGHTBULB_ROUNDED,
+                ),
+                ft.Tab(
+                    text="Flashcards",
+                    icon=I.STYLE_ROUNDED,
+                ),
+                ft.Tab(
+                    text="Logs",
+                    icon=I.TERMINAL_ROUNDED,
+                ),
+            ],
+        )
+        app._register_themed("preview_tab", app.preview_tab, _restyle_tabs)
+    app.preview_tab.selected_index = 0  # the rebuilt view opens on the Facts tab
 
     # Content containers with proper state management
-    facts_content = ft.Column([
-        ft.Row([
-            app.search_facts,
-            app.facts_stats,
-        ], spacing=12),
-        ft.Container(height=8),
+    # Tables/search/stats are built lazily (ensure_results_widgets): start on the empty states
+    # Empty and populated states are siblings in a Stack: toggle `visible`, never `controls`
+    facts_content = ft.Stack([
         facts_empty,
-    ], expand=True, spacing=0)
-    
-    cards_content = ft.Column([
-        ft.Row([
-            app.search_cards,
-            app.cards_stats,
-        ], spacing=12),
-        ft.Container(height=8),
-        cards_empty,
-    ], expand=True, spacing=0)
-    
-    logs_content = ft.Column([
-        logs_empty,
-    ], expand=True, spacing=0)
+    ], expand=True)
+
+    # Cards and Logs tabs: content built on first activation (_build_*_tab)
+    cards_empty: ft.Container | None = None
+    cards_content: ft.Stack | None = None
+    logs_empty: ft.Container | None = None
+    logs_content: ft.Stack | None = None
+    app.log_view.visible = False
+    app._logs_empty = None
+    app._logs_populated = False
+
+    # New empty containers: each tab is recomputed on its next selection
+    app._facts_dirty = app._cards_dirty = app._logs_dirty = True
+    app._last_tab_idx = 0
+
+    # "With data" layouts: mounted once, then only shown/hidden
+    facts_populated: ft.Column | None = None
+    cards_populated: ft.Column | None = None
 
     # Main content stack with smooth transitions
     fact_scroll = ft.Container(
@@ -878,100 +982,157 @@ def build_home(app) -> ft.Control:
         visible=True,
         expand=True,
         padding=20,
-        animate=ft.Animation(250, ft.AnimationCurve.EASE_IN_OUT),
+        animate=_ANIM_250,
     )
 
     cards_scroll = ft.Container(
-        content=cards_content,
         visible=False,
         expand=True,
         padding=20,
-        animate=ft.Animation(250, ft.AnimationCurve.EASE_IN_OUT),
+        animate=_ANIM_250,
     )
 
     logs_scroll = ft.Container(
-        content=logs_content,
         visible=False,
         expand=True,
-        animate=ft.Animation(250, ft.AnimationCurve.EASE_IN_OUT),
+        animate=_ANIM_250,
     )
 
-    def update_facts_view():
+    tabs_stack = ft.Stack([
+        fact_scroll,
+        cards_scroll,
+        logs_scroll,
+    ], expand=True)
+
+    def _build_cards_tab():
+        nonlocal cards_empty, cards_content
+        cards_empty = _empty_state(
+            I.STYLE_ROUNDED,
+            "Aucune carte générée",
+            "Les flashcards intelligentes seront créées à partir\ndes faits extraits avec questions contextuelles",
+            pal,
+            pd,
+            action_text="✨ Voir un exemple",
+            on_action=lambda e: app._fade_to(build_settings(app))
+        )
+        cards_content = ft.Stack([
+            cards_empty,
+        ], expand=True)
+        cards_scroll.content = cards_content
+
+    def _build_logs_tab():
+        nonlocal logs_empty, logs_content
+        logs_empty = _empty_state(
+            I.TERMINAL_ROUNDED,
+            "En attente de traitement",
+            "Les logs de génération apparaîtront ici en temps réel\npour suivre la progression du pipeline",
+            pal,
+            pd,
+        )
+        logs_content = ft.Stack([
+            logs_empty,
+            app.log_view,
+        ], expand=True)
+        app._logs_empty = logs_empty
+        logs_scroll.content = logs_content
+
+    def update_facts_view(defer_update: bool = False):
         """Update facts view with current data."""
-        has_facts = len(app.fact_preview.rows) > 0
+        nonlocal facts_populated
+        # From the data, not the rows: a search with no match keeps the table and its field
+        has_facts = app.fact_preview is not None and len(app.all_facts) > 0
         
         if has_facts:
-            # Count unique topics
-            topics = set()
-            for row in app.fact_preview.rows:
-                if row.cells and len(row.cells) > 0:
-                    topics.add(str(row.cells[0].content.value))
-            
-            # Update stats
-            app.facts_stats.content.controls[1].value = f"{len(app.fact_preview.rows)} faits • {len(topics)} topics"
+            # Update stats (topics counted by _refresh_fact_preview)
+            app.facts_stats.content.controls[1].value = _count_label(len(app.fact_preview.rows), len(app._facts_topic_counts), "faits")
             app.facts_stats.visible = True
-            app.search_facts.visible = len(app.fact_preview.rows) > 5
+            app.search_facts.visible = len(app.all_facts) > 5
             
             # Show table
-            facts_content.controls = [
-                ft.Row([app.search_facts, app.facts_stats], spacing=12),
-                ft.Container(height=12),
-                ft.Column([
-                    ft.Row([app.fact_preview], scroll=ft.ScrollMode.AUTO),
-                ], scroll=ft.ScrollMode.AUTO, expand=True),
-            ]
+            if facts_populated is None:
+                facts_populated = ft.Column([
+                    ft.Row([app.search_facts, app.facts_stats], spacing=12),
+                    ft.Container(height=12),
+                    ft.Column([
+                        ft.Row([app.fact_preview], scroll=ft.ScrollMode.AUTO),
+                    ], scroll=ft.ScrollMode.AUTO, expand=True,
+                        on_scroll=partial(_load_more_on_scroll, app._extend_fact_preview),
+                        on_scroll_interval=_SCROLL_INTERVAL_MS),
+                ], expand=True, spacing=0)
+                facts_content.controls.append(facts_populated)
+            facts_populated.visible = True
         else:
-            app.facts_stats.visible = False
-            app.search_facts.visible = False
-            facts_content.controls = [facts_empty]
+            if app.facts_stats is not None:
+                app.facts_stats.visible = False
+                app.search_facts.visible = False
+            if facts_populated is not None:
+                facts_populated.visible = False
+        facts_empty.visible = not has_facts
+        app._facts_dirty = False
         
-        app.page.update()
+        if not defer_update:
+            app._flush()
     
-    def update_cards_view():
+    def update_cards_view(defer_update: bool = False):
         """Update cards view with current data."""
-        has_cards = len(app.cards_preview.rows) > 0
+        nonlocal cards_populated
+        if cards_content is None:  # tab never opened: stays marked for recompute
+            return
+        has_cards = app.cards_preview is not None and len(app.card_rows) > 1
         
         if has_cards:
-            # Count unique topics
-            topics = set()
-            for row in app.cards_preview.rows:
-                if row.cells and len(row.cells) > 0:
-                    topics.add(str(row.cells[0].content.value))
-            
-            # Update stats
-            app.cards_stats.content.controls[1].value = f"{len(app.cards_preview.rows)} cartes • {len(topics)} topics"
+            # Update stats (topics counted by _refresh_cards_preview)
+            app.cards_stats.content.controls[1].value = _count_label(len(app.cards_preview.rows), len(app._cards_topic_counts), "cartes")
             app.cards_stats.visible = True
-            app.search_cards.visible = len(app.cards_preview.rows) > 5
+            app.search_cards.visible = len(app.card_rows) > 6
             
             # Show table
-            cards_content.controls = [
-                ft.Row([app.search_cards, app.cards_stats], spacing=12),
-                ft.Container(height=12),
-                ft.Column([
-                    ft.Row([app.cards_preview], scroll=ft.ScrollMode.AUTO),
-                ], scroll=ft.ScrollMode.AUTO, expand=True),
-            ]
+            if cards_populated is None:
+                cards_populated = ft.Column([
+                    ft.Row([app.search_cards, app.cards_stats], spacing=12),
+                    ft.Container(height=12),
+                    ft.Column([
+                        ft.Row([app.cards_preview], scroll=ft.ScrollMode.AUTO),
+                    ], scroll=ft.ScrollMode.AUTO, expand=True,
+                        on_scroll=partial(_load_more_on_scroll, app._extend_cards_preview),
+                        on_scroll_interval=_SCROLL_INTERVAL_MS),
+                ], expand=True, spacing=0)
+                cards_content.controls.append(cards_populated)
+            cards_populated.visible = True
         else:
-            app.cards_stats.visible = False
-            app.search_cards.visible = False
-            cards_content.controls = [cards_empty]
+            if app.cards_stats is not None:
+                app.cards_stats.visible = False
+                app.search_cards.visible = False
+            if cards_populated is not None:
+                cards_populated.visible = False
+        cards_empty.visible = not has_cards
+        app._cards_dirty = False
         
-        app.page.update()
+        if not defer_update:
+            app._flush()
     
-    def update_logs_view():
+    def update_logs_view(defer_update: bool = False):
         """Update logs view with current data."""
-        has_logs = len(app.log_view.controls) > 0
+        if logs_content is None:
+            return
+        # Once populated, the list is fed in place by append_log
+        if not app._logs_populated:
+            has_logs = len(app.log_view.controls) > 0
+            app.log_view.visible = has_logs
+            logs_empty.visible = not has_logs
+        app._logs_dirty = False
         
-        if has_logs:
-            logs_content.controls = [app.log_view]
-        else:
-            logs_content.controls = [logs_empty]
-        
-        app.page.update()
+        if not defer_update:
+            app._flush()
 
     def on_tab_change(_e: ft.ControlEvent):
         """Handle tab changes with smooth transitions - SANS reconstruire."""
         idx = app.preview_tab.selected_index
+        dirty = (app._facts_dirty, app._cards_dirty, app._logs_dirty)
+        # Same tab and unchanged data: nothing to do
+        if idx == app._last_tab_idx and not dirty[idx]:
+            return
+        app._last_tab_idx = idx
         
         # Hide all
         fact_scroll.visible = False
@@ -981,22 +1142,23 @@ def build_home(app) -> ft.Control:
         # Show selected and update content
         if idx == 0:
             fact_scroll.visible = True
-            update_facts_view()
+            if app._facts_dirty:
+                update_facts_view(defer_update=True)
         elif idx == 1:
             cards_scroll.visible = True
-            update_cards_view()
+            if cards_content is None:
+                _build_cards_tab()
+            if app._cards_dirty:
+                update_cards_view(defer_update=True)
         elif idx == 2:
             logs_scroll.visible = True
-            update_logs_view()
+            if logs_content is None:
+                _build_logs_tab()
+            if app._logs_dirty:
+                update_logs_view(defer_update=True)
         
-        # ✅ Update uniquement les containers concernés
-        try:
-            fact_scroll.update()
-            cards_scroll.update()
-            logs_scroll.update()
-        except:
-            # Fallback si update() n'est pas disponible
-            app.page.update()
+        # ✅ One round-trip, limited to the tabs Stack that holds every change
+        tabs_stack.update()
 
     app.preview_tab.on_change = on_tab_change
     
@@ -1004,46 +1166,24 @@ def build_home(app) -> ft.Control:
     app.update_facts_view = update_facts_view
     app.update_cards_view = update_cards_view
     app.update_logs_view = update_logs_view
+    # Tables survive rebuilds, and the preselected Facts tab fires no on_change when clicked:
+    # show the facts already extracted right away
+    if app.fact_preview is not None and app.all_facts:
+        update_facts_view(defer_update=True)
 
     # Action toolbar
-    action_toolbar = ft.Container(
-        content=ft.Row([
-            ft.Icon(ft.Icons.VISIBILITY_ROUNDED, color=pal["accent"], size=22),
-            ft.Text("Résultats", size=18, weight=ft.FontWeight.W_700, color=pal["text"]),
-            ft.Container(expand=True),
-            ft.Container(
-                content=ft.Row([
-                    ft.Icon(ft.Icons.INFO_OUTLINE_ROUNDED, size=16, color=pal["info"]),
-                    ft.Text(
-                        "Double-cliquez ✏️ pour éditer • Cliquez 🗑️ pour supprimer",
-                        size=11,
-                        color=pal["muted"],
-                        weight=ft.FontWeight.W_500,
-                    ),
-                ], spacing=6),
-                padding=ft.padding.symmetric(12, 8),
-                bgcolor=pal["info"] + "10",
-                border_radius=8,
-                border=ft.border.all(1, pal["info"] + "20"),
-            ),
-        ], alignment=ft.MainAxisAlignment.START),
-        padding=ft.padding.only(bottom=16),
-    )
+    action_toolbar = _palette_cached(app, "_results_toolbar_cache", _build_results_toolbar)
 
     results_section = _glassmorphic_card(
         pal=pal,
         expand=True,
         content=ft.Column([
             action_toolbar,
-            ft.Divider(color=pal["border"], height=1),
+            ft.Divider(color=pal.border, height=1),
             ft.Container(height=8),
             app.preview_tab,
             ft.Container(height=8),
-            ft.Stack([
-                fact_scroll,
-                cards_scroll,
-                logs_scroll,
-            ], expand=True),
+            tabs_stack,
         ], spacing=0, expand=True, height=800, auto_scroll=False),
     )
 
@@ -1061,7 +1201,7 @@ def build_home(app) -> ft.Control:
     main_content = ft.Row([
         ft.Container(content=left_column, width=480),
         ft.Container(content=right_column, expand=True),
-    ], spacing=24, expand=True, alignment=ft.MainAxisAlignment.START)
+    ], spacing=24, expand=True, alignment=MAA.START)
 
     # Final layout with proper scrolling
     return ft.Column([
@@ -1076,6 +1216,118 @@ def build_home(app) -> ft.Control:
 
 # -------------------------- Settings -------------------------- #
 
+def _build_api_hint(app) -> ft.Container:
+    """Static "where to get a key" hint of the settings page."""
+    pal = app._palette()
+    pd = app._palette_derived()
+    return ft.Container(
+        content=ft.Row([
+            ft.Icon(ft.Icons.INFO_OUTLINE_ROUNDED, size=16, color=pal.info),
+            ft.Text(
+                "Obtenez votre clé sur aistudio.google.com",
+                size=12,
+                color=pal.text_secondary,
+                weight=ft.FontWeight.W_500,
+            ),
+        ], spacing=8),
+        padding=12,
+        bgcolor=pd.info_15,
+        border_radius=10,
+        border=_border(1, pd.info_30),
+    )
+
+
+def _build_settings_preview(app) -> ft.Container:
+    """Decorative flashcard example of the settings page, built once per theme."""
+    pal = app._palette()
+    pd = app._palette_derived()
+
+    return _glassmorphic_card(
+        pal=pal,
+        expand=True,
+        content=ft.Column([
+            ft.Row([
+                ft.Icon(ft.Icons.PREVIEW_ROUNDED, color=pal.info, size=24),
+                ft.Text("Aperçu en direct", size=20, weight=ft.FontWeight.W_800, color=pal.text),
+            ], spacing=12),
+            ft.Divider(color=pal.border, height=24),
+            
+            ft.Container(
+                content=ft.Column([
+                    ft.Row([
+                        ft.Container(
+                            content=ft.Icon(ft.Icons.STYLE_ROUNDED, color=pal.accent, size=28),
+                            bgcolor=pd.accent_20,
+                            padding=14,
+                            border_radius=12,
+                        ),
+                        ft.Column([
+                            ft.Text("Exemple de Flashcard", size=16, weight=ft.FontWeight.W_700, color=pal.text),
+                            ft.Text("Topic: Histoire • Subtopic: Révolution", size=12, color=pal.muted),
+                        ], spacing=4, expand=True),
+                    ], spacing=16),
+                    
+                    ft.Container(height=16),
+                    ft.Container(
+                        content=ft.Column([
+                            ft.Row([
+                                ft.Icon(ft.Icons.HELP_OUTLINE_ROUNDED, size=18, color=pal.text_secondary),
+                                ft.Text("Question", size=12, color=pal.text_secondary, weight=ft.FontWeight.W_700),
+                            ], spacing=8),
+                            ft.Text(
+                                "Quelle est la date de la prise de la Bastille?",
+                                size=15,
+                                color=pal.text,
+                                weight=ft.FontWeight.W_500,
+                            ),
+                        ], spacing=8),
+                        padding=20,
+                        bgcolor=pal.surface_alt,
+                        border_radius=12,
+                        border=_border(1, pal.border),
+                    ),
+                    
+                    ft.Container(height=12),
+                    ft.Container(
+                        content=ft.Column([
+                            ft.Row([
+                                ft.Icon(ft.Icons.CHECK_CIRCLE_OUTLINE_ROUNDED, size=18, color=pal.accent),
+                                ft.Text("Réponse", size=12, color=pal.accent, weight=ft.FontWeight.W_700),
+                            ], spacing=8),
+                            ft.Text(
+                                "14 juillet 1789",
+                                size=16,
+                                color=pal.accent,
+                                weight=ft.FontWeight.W_700,
+                            ),
+                        ], spacing=8),
+                        padding=20,
+                        bgcolor=pd.accent_10,
+                        border_radius=12,
+                        border=_border(2, pd.accent_40),
+                    ),
+                    
+                    ft.Container(height=16),
+                    ft.Container(
+                        content=ft.Column([
+                            ft.Text("📚 Source: Cours d'histoire - Chapitre 3", size=11, color=pal.muted),
+                            ft.Text("💡 Détails: Événement marquant le début de la Révolution française", size=11, color=pal.muted),
+                        ], spacing=6),
+                        padding=16,
+                        bgcolor=pal.surface_alt,
+                        border_radius=10,
+                    ),
+                ], spacing=0),
+                padding=24,
+                bgcolor=pal.surface,
+                border_radius=16,
+                border=_border(1, pal.border),
+                shadow=_shadow(20, pal.shadow),
+            ),
+        ], spacing=16, expand=True),
+    )
+
+
 def build_settings(app) -> ft.Control:
     pal = app._palette()
 
@@ -1086,26 +1338,22 @@ def build_settings(app) -> ft.Control:
         password=True,
         can_reveal_password=True,
         border_radius=12,
-        text_style=ft.TextStyle(color=pal["text"], size=14),
-        bgcolor=pal["surface_alt"],
-        border_color=pal["border"],
-        focused_border_color=pal["accent"],
+        text_style=ft.TextStyle(color=pal.text, size=14),
+        bgcolor=pal.surface_alt,
+        border_color=pal.border,
+        focused_border_color=pal.accent,
         hint_text="Entrez votre clé API...",
     )
 
     theme_dd = ft.Dropdown(
         label="🎨 Thème de l'interface",
-        options=[
-            ft.dropdown.Option("system", "🖥️  Automatique (système)"),
-            ft.dropdown.Option("light", "☀️  Clair"),
-            ft.dropdown.Option("dark", "🌙  Sombre"),
-        ],
+        options=_THEME_OPTIONS,
         value=app.cfg.get("theme", "system"),
         border_radius=12,
-        text_style=ft.TextStyle(color=pal["text"], size=14),
-        bgcolor=pal["surface_alt"],
-        border_color=pal["border"],
-        focused_border_color=pal["accent"],
+        text_style=ft.TextStyle(color=pal.text, size=14),
+        bgcolor=pal.surface_alt,
+        border_color=pal.border,
+        focused_border_color=pal.accent,
         on_change=lambda e: app._set_theme(e.control.value),
     )
 
@@ -1114,10 +1362,10 @@ def build_settings(app) -> ft.Control:
         label="🎨 Couleur d'accent (hex)",
         value=app.cfg.get("accent", "#40C4FF"),
         border_radius=12,
-        text_style=ft.TextStyle(color=pal["text"], size=14),
-        bgcolor=pal["surface_alt"],
-        border_color=pal["border"],
-        focused_border_color=pal["accent"],
+        text_style=ft.TextStyle(color=pal.text, size=14),
+        bgcolor=pal.surface_alt,
+        border_color=pal.border,
+        focused_border_color=pal.accent,
         hint_text="#40C4FF",
         on_change=lambda e: app._set_accent(e.control.value),
     )
@@ -1127,19 +1375,19 @@ def build_settings(app) -> ft.Control:
         height=80,
         bgcolor=app.cfg.get("accent", "#40C4FF"),
         border_radius=16,
-        border=ft.border.all(3, pal["border"]),
-        shadow=ft.BoxShadow(blur_radius=16, color=pal["shadow"]),
+        border=_border(3, pal.border),
+        shadow=_shadow(16, pal.shadow),
     )
 
     def save_click(_):
         from ankibot.config import save_config
         app.cfg["api_key"] = api_field.value.strip()
         save_config(app.cfg)
-        app.backend = app.backend.__class__(app.cfg.get("api_key", ""), model=app.backend.cfg.model)
+        app.backend = app.backend.__class__(app.cfg.get("api_key", ""), model=app.backend.cfg.model, logger=app.logger, app_cfg=app.cfg)
         app._apply_theme()
-        app.page.appbar = build_appbar(app)
-        app.content_area.content = build_settings(app)
-        app.snack("✅ Paramètres sauvegardés avec succès", pal["ok"])
+        # Only the API status depends on the save: replace the status bar, not the page
+        page.controls[-1] = build_status_bar(app)
+        app.snack("✅ Paramètres sauvegardés avec succès", pal.ok)
 
     def reset_click(_):
         api_field.value = ""
@@ -1147,21 +1395,21 @@ def build_settings(app) -> ft.Control:
         accent_field.value = "#40C4FF"
         color_preview.bgcolor = "#40C4FF"
         app.page.update()
-        app.snack("🔄 Réinitialisation effectuée", pal["warn"])
+        app.snack("🔄 Réinitialisation effectuée", pal.warn)
 
     preferences = _glassmorphic_card(
         pal=pal,
         content=ft.Column([
             ft.Row([
-                ft.Icon(ft.Icons.SETTINGS_ROUNDED, color=pal["accent"], size=24),
-                ft.Text("Préférences", size=20, weight=ft.FontWeight.W_800, color=pal["text"]),
+                ft.Icon(ft.Icons.SETTINGS_ROUNDED, color=pal.accent, size=24),
+                ft.Text("Préférences", size=20, weight=ft.FontWeight.W_800, color=pal.text),
             ], spacing=12),
-            ft.Divider(color=pal["border"], height=24),
+            ft.Divider(color=pal.border, height=24),
             
             theme_dd,
             ft.Container(height=8),
             
-            ft.Text("Couleur d'accent", size=14, weight=ft.FontWeight.W_600, color=pal["text"]),
+            ft.Text("Couleur d'accent", size=14, weight=ft.FontWeight.W_600, color=pal.text),
             ft.Row([
                 ft.Container(content=accent_field, expand=True),
                 color_preview,
@@ -1170,36 +1418,21 @@ def build_settings(app) -> ft.Control:
             ft.Container(height=8),
             api_field,
             
-            ft.Container(
-                content=ft.Row([
-                    ft.Icon(ft.Icons.INFO_OUTLINE_ROUNDED, size=16, color=pal["info"]),
-                    ft.Text(
-                        "Obtenez votre clé sur aistudio.google.com",
-                        size=12,
-                        color=pal["text_secondary"],
-                        weight=ft.FontWeight.W_500,
-                    ),
-                ], spacing=8),
-                padding=12,
-                bgcolor=pal["info"] + "15",
-                border_radius=10,
-                border=ft.border.all(1, pal["info"] + "30"),
-            ),
+            _palette_cached(app, "_api_hint_cache", _build_api_hint),
             
             ft.Container(height=16),
             
             ft.Row([
-                _action_button(
+                _action_button_filled(
                     "💾 Enregistrer",
                     ft.Icons.SAVE_ROUNDED,
-                    pal["ok"],
+                    pal.ok,
                     on_click=save_click,
                 ),
-                _action_button(
+                _action_button_outlined(
                     "🔄 Réinitialiser",
                     ft.Icons.RESTART_ALT_ROUNDED,
-                    pal["warn"],
-                    outlined=True,
+                    pal.warn,
                     on_click=reset_click,
                 ),
             ], spacing=12),
@@ -1207,90 +1440,7 @@ def build_settings(app) -> ft.Control:
     )
 
     # ----- Live Preview ----- #
-    preview = _glassmorphic_card(
-        pal=pal,
-        expand=True,
-        content=ft.Column([
-            ft.Row([
-                ft.Icon(ft.Icons.PREVIEW_ROUNDED, color=pal["info"], size=24),
-                ft.Text("Aperçu en direct", size=20, weight=ft.FontWeight.W_800, color=pal["text"]),
-            ], spacing=12),
-            ft.Divider(color=pal["border"], height=24),
-            
-            ft.Container(
-                content=ft.Column([
-                    ft.Row([
-                        ft.Container(
-                            content=ft.Icon(ft.Icons.STYLE_ROUNDED, color=pal["accent"], size=28),
-                            bgcolor=pal["accent"] + "20",
-                            padding=14,
-                            border_radius=12,
-                        ),
-                        ft.Column([
-                            ft.Text("Exemple de Flashcard", size=16, weight=ft.FontWeight.W_700, color=pal["text"]),
-                            ft.Text("Topic: Histoire • Subtopic: Révolution", size=12, color=pal["muted"]),
-                        ], spacing=4, expand=True),
-                    ], spacing=16),
-                    
-                    ft.Container(height=16),
-                    ft.Container(
-                        content=ft.Column([
-                            ft.Row([
-                                ft.Icon(ft.Icons.HELP_OUTLINE_ROUNDED, size=18, color=pal["text_secondary"]),
-                                ft.Text("Question", size=12, color=pal["text_secondary"], weight=ft.FontWeight.W_700),
-                            ], spacing=8),
-                            ft.Text(
-                                "Quelle est la date de la prise de la Bastille?",
-                                size=15,
-                                color=pal["text"],
-                                weight=ft.FontWeight.W_500,
-                            ),
-                        ], spacing=8),
-                        padding=20,
-                        bgcolor=pal["surface_alt"],
-                        border_radius=12,
-                        border=ft.border.all(1, pal["border"]),
-                    ),
-                    
-                    ft.Container(height=12),
-                    ft.Container(
-                        content=ft.Column([
-                            ft.Row([
-                                ft.Icon(ft.Icons.CHECK_CIRCLE_OUTLINE_ROUNDED, size=18, color=pal["accent"]),
-                                ft.Text("Réponse", size=12, color=pal["accent"], weight=ft.FontWeight.W_700),
-                            ], spacing=8),
-                            ft.Text(
-                                "14 juillet 1789",
-                                size=16,
-                                color=pal["accent"],
-                                weight=ft.FontWeight.W_700,
-                            ),
-                        ], spacing=8),
-                        padding=20,
-                        bgcolor=pal["accent"] + "10",
-                        border_radius=12,
-                        border=ft.border.all(2, pal["accent"] + "40"),
-                    ),
-                    
-                    ft.Container(height=16),
-                    ft.Container(
-                        content=ft.Column([
-                            ft.Text("📚 Source: Cours d'histoire - Chapitre 3", size=11, color=pal["muted"]),
-                            ft.Text("💡 Détails: Événement marquant le début de la Révolution française", size=11, color=pal["muted"]),
-                        ], spacing=6),
-                        padding=16,
-                        bgcolor=pal["surface_alt"],
-                        border_radius=10,
-                    ),
-                ], spacing=0),
-                padding=24,
-                bgcolor=pal["surface"],
-                border_radius=16,
-                border=ft.border.all(1, pal["border"]),
-                shadow=ft.BoxShadow(blur_radius=20, color=pal["shadow"]),
-            ),
-        ], spacing=16, expand=True),
-    )
+    preview = _palette_cached(app, "_settings_preview_cache", _build_settings_preview)
 
     # ----- Layout ----- #
     content = ft.Row([
@@ -1298,7 +1448,8 @@ def build_settings(app) -> ft.Control:
         ft.Container(content=preview, expand=True),
     ], spacing=24, expand=True)
 
-    return ft.Column([
+    page = ft.Column([
         content,
         build_status_bar(app),
-    ], spacing=24, expand=True, scroll=ft.ScrollMode.AUTO)
\ No newline at end of file
+    ], spacing=24, expand=True, scroll=ft.ScrollMode.AUTO)
+    return page
\ No newline at end of file
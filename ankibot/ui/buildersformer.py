@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+from functools import lru_cache
 import os
 import re
+import threading
 import flet as ft
 
+from ankibot.config import MODEL_MODES
+# Shared with builders: cached attribute setters and per-palette control caching
+from ankibot.ui.builders import _make_attr_setter, _palette_cached
+
+
 # =============================================================
 # Modern, clean, dashboard-style UI for Ankibot
 # - Two-pane layout on Home: left controls / right workspace
@@ -13,17 +20,53 @@ import flet as ft
 # =============================================================
 
 
+# --------------------------- Constants --------------------------- #
+# Independent of app and palette, so built once at import instead of on every navigation
+
+_MODEL_OPTIONS = [ft.dropdown.Option(label) for label in MODEL_MODES]
+_THEME_OPTIONS = [ft.dropdown.Option(mode) for mode in ("system", "light", "dark")]
+_IMPORT_EXTENSIONS = ["pdf", "txt"]
+_PAD_CHIP = ft.padding.symmetric(8, 6)
+_PAD_STATUS = ft.padding.symmetric(14, 10)
+_PAD_TOP8 = ft.padding.only(top=8)
+
+
+class _I:
+    """Icons used by the builders, resolved once from the ft.Icons enum."""
+
+    HOME = ft.Icons.HOME
+    SETTINGS = ft.Icons.SETTINGS
+    DARK_MODE = ft.Icons.DARK_MODE
+    LIGHT_MODE = ft.Icons.LIGHT_MODE
+    EXIT_TO_APP = ft.Icons.EXIT_TO_APP
+    ATTACH_FILE = ft.Icons.ATTACH_FILE
+    ANALYTICS_OUTLINED = ft.Icons.ANALYTICS_OUTLINED
+    VPN_KEY = ft.Icons.VPN_KEY
+    UPLOAD_FILE = ft.Icons.UPLOAD_FILE
+    FLASH_ON = ft.Icons.FLASH_ON
+    CANCEL = ft.Icons.CANCEL
+    DOWNLOAD = ft.Icons.DOWNLOAD
+    SAVE = ft.Icons.SAVE
+    RESTART_ALT = ft.Icons.RESTART_ALT
+
+
 # ---------------------------- Helpers ---------------------------- #
 
-def _stat_chip(text: str, color: str, icon: str | None = None) -> ft.Container:
-    """Compact rounded chip for status bar metrics."""
+@lru_cache(maxsize=32)
+def _shadow(blur_radius: int, color: str) -> ft.BoxShadow:
+    """Shared BoxShadow per (blur, color); never mutated, so safe to reuse across rebuilds."""
+    return ft.BoxShadow(blur_radius=blur_radius, color=color)
+
+
+def _stat_chip(text: str, color: str, bg: str, icon: str | None = None) -> ft.Container:
+    """Compact rounded chip for status bar metrics; bg is the translucent backdrop of color."""
     content = [ft.Text(text, size=12, color=color, weight=ft.FontWeight.W_500)]
     if icon:
         content.insert(0, ft.Icon(icon, size=14, color=color))
     return ft.Container(
         content=ft.Row(content, spacing=6, alignment=ft.MainAxisAlignment.CENTER),
-        bgcolor=color + "20",  # translucent backdrop
-        padding=ft.padding.symmetric(8, 6),
+        bgcolor=bg,
+        padding=_PAD_CHIP,
         border_radius=999,
     )
 
@@ -31,18 +74,17 @@ def _stat_chip(text: str, color: str, icon: str | None = None) -> ft.Container:
 def _card(
     content: ft.Control,
     *,
-    pal: dict,
+    bg: str,
+    shadow: str,
     padding: int = 20,
     radius: int = 20,
-    alt: bool = False,
     expand: bool | int = False,
 ) -> ft.Container:
-    bg = pal["surface_alt"] if alt else pal["surface"]
     return ft.Container(
         bgcolor=bg,
         border_radius=radius,
         padding=padding,
-        shadow=ft.BoxShadow(blur_radius=20, color=pal["shadow"]),
+        shadow=_shadow(20, shadow),
         content=content,
         expand=expand,
     )
@@ -55,34 +97,34 @@ def build_appbar(app) -> ft.AppBar:
     return ft.AppBar(
         title=ft.Row([
             ft.Text("⚡", size=20),
-            ft.Text("Ankibot", color=pal["text"], size=20, weight=ft.FontWeight.W_600),
+            ft.Text("Ankibot", color=pal.text, size=20, weight=ft.FontWeight.W_600),
         ], spacing=8, alignment=ft.MainAxisAlignment.START),
-        bgcolor=pal["surface"],
+        bgcolor=pal.surface,
         center_title=False,
         elevation=0,
         actions=[
             ft.IconButton(
-                ft.Icons.HOME,
+                _I.HOME,
                 tooltip="Accueil",
-                icon_color=pal["muted"],
+                icon_color=pal.muted,
                 on_click=lambda e: app._go_home(),
             ),
             ft.IconButton(
-                ft.Icons.SETTINGS,
+                _I.SETTINGS,
                 tooltip="Paramètres",
-                icon_color=pal["muted"],
+                icon_color=pal.muted,
                 on_click=lambda e: app._fade_to(build_settings(app)),
             ),
             ft.IconButton(
-                ft.Icons.DARK_MODE if app._is_dark() else ft.Icons.LIGHT_MODE,
+                _I.DARK_MODE if app._is_dark() else _I.LIGHT_MODE,
                 tooltip="Basculer thème",
-                icon_color=pal["muted"],
+                icon_color=pal.muted,
                 on_click=app._toggle_theme,
             ),
             ft.IconButton(
-                ft.Icons.EXIT_TO_APP,
+                _I.EXIT_TO_APP,
                 tooltip="Quitter",
-                icon_color=pal["muted"],
+                icon_color=pal.muted,
                 on_click=lambda e: app.page.window.close(),
             ),
         ],
@@ -91,38 +133,50 @@ def build_appbar(app) -> ft.AppBar:
 
 # ------------------------- Status Bar ------------------------- #
 
+def _make_status_chips(app) -> tuple[ft.Container, ft.Container, ft.Container]:
+    pal = app._palette()
+    pd = app._palette_derived()
+    return (
+        _stat_chip("Fichiers", pal.muted, pd.muted_20, _I.ATTACH_FILE),
+        _stat_chip("Stats", pal.muted, pd.muted_20, _I.ANALYTICS_OUTLINED),
+        _stat_chip("API", pal.muted, pd.muted_20, _I.VPN_KEY),
+    )
+
+
 def build_status_bar(app) -> ft.Control:
     pal = app._palette()
+    # Static chips (no handler): built once per palette, shared by home and settings
+    files_chip, stats_chip, api_chip = _palette_cached(app, "_status_chips_cache", _make_status_chips)
 
     # dynamic texts stored on app for updates elsewhere in the app
-    app.file_status = ft.Text("📂 Aucun fichier", color=pal["muted"], size=12)
+    app.file_status = ft.Text("📂 Aucun fichier", color=pal.muted, size=12)
     app.api_status = ft.Text(
         "🔑 API: Connectée" if app.cfg.get("api_key") else "🔑 API: Non connectée",
-        color=pal["ok"] if app.cfg.get("api_key") else pal["err"],
+        color=pal.ok if app.cfg.get("api_key") else pal.err,
         size=12,
         weight=ft.FontWeight.W_500,
     )
-    app.stats_badge = ft.Text("", size=12, color=pal["muted"])  # e.g., "42 faits • 36 cartes"
+    app.stats_badge = ft.Text("", size=12, color=pal.muted)  # e.g., "42 faits • 36 cartes"
 
     left = ft.Row([
-        _stat_chip("Fichiers", pal["muted"], ft.Icons.ATTACH_FILE),
+        files_chip,
         app.file_status,
     ], spacing=10)
 
     middle = ft.Row([
-        _stat_chip("Stats", pal["muted"], ft.Icons.ANALYTICS_OUTLINED),
+        stats_chip,
         app.stats_badge,
     ], spacing=10)
 
     right = ft.Row([
-        _stat_chip("API", pal["muted"], ft.Icons.VPN_KEY),
+        api_chip,
         app.api_status,
     ], spacing=10)
 
     return ft.Container(
         content=ft.Row([left, middle, right], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
-        padding=ft.padding.symmetric(14, 10),
-        bgcolor=pal["surface_alt"],
+        padding=_PAD_STATUS,
+        bgcolor=pal.surface_alt,
         border_radius=12,
     )
 
@@ -131,69 +185,65 @@ def build_status_bar(app) -> ft.Control:
 
 def build_home(app) -> ft.Control:
     pal = app._palette()
+    # Palette colors hoisted to locals once per build
+    surface, shadow, text, muted, accent, accent_hover, border = (
+        pal.surface, pal.shadow, pal.text, pal.muted, pal.accent, pal.accent_hover, pal.border
+    )
 
     # ----- Controls (Sidebar) ----- #
     model_dd = ft.Dropdown(
         label="Modèle IA",
-        options=[
-            ft.dropdown.Option("Ultra Fast (Gemini 2.5 Flash)"),
-            ft.dropdown.Option("Fast (Gemini 2.5 Flash + thinking)"),
-            ft.dropdown.Option("Smart (Gemini 2.5 Pro + thinking)"),
-            ft.dropdown.Option("Fast advanced (Gemini 3.0 Flash)"),
-            ft.dropdown.Option("Advanced (Gemini 3.0 Flash + thinking)"),
-            ft.dropdown.Option("Smart advanced (Gemini 3.0 Pro + thinking)"),
-        ],
+        options=_MODEL_OPTIONS,
         value=app.model_mode,
         width=300,
         border_radius=12,
-        text_style=ft.TextStyle(size=14, color=pal["text"]),
+        text_style=ft.TextStyle(size=14, color=text),
         on_change=app._on_model_change,
     )
 
-    density_label = ft.Text("Normal", size=12, color=pal["muted"])
+    density_label = ft.Text("Normal", size=12, color=muted)
     density_slider = ft.Slider(
         min=1,
         max=3,
         divisions=2,
         value=app.density_level,
         width=300,
-        active_color=pal["accent"],
+        active_color=accent,
         on_change=lambda e: app._update_density(e, density_label),
     )
 
     reverse_sw = ft.Switch(
         label="Créer des cartes inversées",
         value=app.reverse_card,
-        active_color=pal["accent"],
-        on_change=lambda e: setattr(app, "reverse_card", e.control.value),
+        active_color=accent,
+        on_change=_make_attr_setter(app, "reverse_card"),
     )
     split_sw = ft.Switch(
         label="Séparer les decks par topic",
         value=app.split_by_topic,
-        active_color=pal["accent"],
-        on_change=lambda e: setattr(app, "split_by_topic", e.control.value),
+        active_color=accent,
+        on_change=_make_attr_setter(app, "split_by_topic"),
     )
     double_check = ft.Switch(
         label="Vérification double",
         value=app.double_check,
-        active_color=pal["accent"],
-        on_change=lambda e: setattr(app, "double_check", e.control.value),
+        active_color=accent,
+        on_change=_make_attr_setter(app, "double_check"),
     )
     new_pipeline = ft.Switch(
         label="Nouveau pipeline",
         value=app.new_pipeline,
-        active_color=pal["accent"],
-        on_change=lambda e: setattr(app, "new_pipeline", e.control.value),
+        active_color=accent,
+        on_change=_make_attr_setter(app, "new_pipeline"),
     )
 
     # Batch file picker
-    fp = ft.FilePicker(on_result=app._on_pick)
-    app.page.overlay.append(fp)
+    fp = app._ensure_filepicker()
     pick_btn = ft.FilledButton(
-        content=ft.Row([ft.Icon(ft.Icons.UPLOAD_FILE), ft.Text("Importer PDF/TXT", size=14)]),
+        content=ft.Row([ft.Icon(_I.UPLOAD_FILE), ft.Text("Importer PDF/TXT", size=14)]),
         width=300,
-        style=ft.ButtonStyle(bgcolor={"": pal["accent"], "hovered": pal["accent_hover"]}, color=ft.Colors.WHITE),
-        on_click=lambda e: fp.pick_files(allow_multiple=True, allowed_extensions=["pdf", "txt"]),
+        style=ft.ButtonStyle(bgcolor={"": accent, "hovered": accent_hover}, color=ft.Colors.WHITE),
+        on_click=lambda e: fp.pick_files(allow_multiple=True, allowed_extensions=_IMPORT_EXTENSIONS),
     )
 
     # Inline text input
@@ -204,7 +254,7 @@ def build_home(app) -> ft.Control:
         max_lines=10,
         width=300,
         border_radius=12,
-        text_style=ft.TextStyle(color=pal["text"], size=14),
+        text_style=ft.TextStyle(color=text, size=14),
         hint_text="Colle le texte ici si tu n'utilises pas de fichier",
     )
 
@@ -215,42 +265,43 @@ def build_home(app) -> ft.Control:
     max_lines=4,
     width=300,
     border_radius=12,
-    text_style=ft.TextStyle(color=pal["text"], size=14),
+    text_style=ft.TextStyle(color=text, size=14),
     hint_text="Ex: Toujours inclure les dates historiques...",
-    on_change=lambda e: setattr(app, "custom_add", e.control.value),
+    on_change=_make_attr_setter(app, "custom_add"),
     )
 
     # Run / Cancel / Export
-    app.progress = ft.ProgressBar(width=300, color=pal["accent"], bgcolor="#00000010", height=6)
-    app.progress_label = ft.Text("", color=pal["muted"], size=12)
+    app.progress = ft.ProgressBar(width=300, color=accent, bgcolor="#00000010", height=6)
+    app.progress_label = ft.Text("", color=muted, size=12)
 
     run_btn = ft.FilledButton(
-        content=ft.Row([ft.Icon(ft.Icons.FLASH_ON), ft.Text("Générer les flashcards", size=14)]),
+        content=ft.Row([ft.Icon(_I.FLASH_ON), ft.Text("Générer les flashcards", size=14)]),
         width=300,
-        style=ft.ButtonStyle(bgcolor={"": pal["accent"], "hovered": pal["accent_hover"]}, color=ft.Colors.WHITE),
+        style=ft.ButtonStyle(bgcolor={"": accent, "hovered": accent_hover}, color=ft.Colors.WHITE),
         on_click=lambda e: app.page.run_task(app._start_pipeline, text_area.value),
     )
     cancel_btn = ft.OutlinedButton(
-        content=ft.Row([ft.Icon(ft.Icons.CANCEL), ft.Text("Annuler", size=14)]),
+        content=ft.Row([ft.Icon(_I.CANCEL), ft.Text("Annuler", size=14)]),
         width=300,
-        on_click=lambda e: app.cancel_event.set(),
+        on_click=app._request_cancel,
     )
     export_btn = ft.FilledButton(
-        content=ft.Row([ft.Icon(ft.Icons.DOWNLOAD), ft.Text("Exporter", size=14)]),
+        content=ft.Row([ft.Icon(_I.DOWNLOAD), ft.Text("Exporter", size=14)]),
         width=300,
-        style=ft.ButtonStyle(bgcolor={"": pal["accent"], "hovered": pal["accent_hover"]}, color=ft.Colors.WHITE),
+        style=ft.ButtonStyle(bgcolor={"": accent, "hovered": accent_hover}, color=ft.Colors.WHITE),
         on_click=lambda e: app.page.run_task(app._save_outputs),
     )
 
     controls = _card(
-        pal=pal,
+        bg=surface,
+        shadow=shadow,
         content=ft.Column(
             [
-                ft.Text("⚙️ Contrôles", size=18, weight=ft.FontWeight.W_600, color=pal["text"]),
-                ft.Divider(color=pal["border"], height=16, thickness=1),
+                ft.Text("⚙️ Contrôles", size=18, weight=ft.FontWeight.W_600, color=text),
+                ft.Divider(color=border, height=16, thickness=1),
                 model_dd,
                 ft.Row(
-                    [ft.Text("Densité des cartes", size=13, color=pal["text"]), density_label],
+                    [ft.Text("Densité des cartes", size=13, color=text), density_label],
                     alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
                 ),
                 density_slider,
@@ -258,7 +309,7 @@ def build_home(app) -> ft.Control:
                 split_sw,
                 double_check,
                 new_pipeline,
-                ft.Divider(color=pal["border"], height=20, thickness=1),
+                ft.Divider(color=border, height=20, thickness=1),
                 pick_btn,
                 text_area,
                 custom_add_field,
@@ -275,68 +326,75 @@ def build_home(app) -> ft.Control:
     controls.width = 340
 
     # ----- Workspace (Tabs + Tables + Logs) ----- #
-    app.log_view = ft.ListView(expand=True, spacing=6, auto_scroll=True, padding=12)
+    # Log entries and tables survive rebuilds: coming back home no longer clears the preview
+    # or rebuilds the tables
+    previous_logs = app.log_view.controls if app.log_view is not None else None
+    app.log_view = ft.ListView(previous_logs, expand=True, spacing=6, auto_scroll=True, padding=12)
 
     # Data tables
-    app.fact_preview = ft.DataTable(
-        columns=[
-            ft.DataColumn(ft.Text("Topic")),
-            ft.DataColumn(ft.Text("Subtopic")),
-            ft.DataColumn(ft.Text("Fact")),
-            ft.DataColumn(ft.Text("Source")),
-        ],
-        rows=[],
-    )
-
-    app.cards_preview = ft.DataTable(
-        columns=[
-            ft.DataColumn(ft.Text("Topic")),
-            ft.DataColumn(ft.Text("Subtopic")),
-            ft.DataColumn(ft.Text("Question")),
-            ft.DataColumn(ft.Text("Answer")),
-            ft.DataColumn(ft.Text("Source")),
-            ft.DataColumn(ft.Text("Details")),
-            ft.DataColumn(ft.Text("Edit")),
-            ft.DataColumn(ft.Text("Delete")),
-        ],
-        rows=[],
-    )
+    if app.fact_preview is None:
+        app.fact_preview = ft.DataTable(
+            columns=[
+                ft.DataColumn(ft.Text("Topic")),
+                ft.DataColumn(ft.Text("Subtopic")),
+                ft.DataColumn(ft.Text("Fact")),
+                ft.DataColumn(ft.Text("Source")),
+            ],
+            rows=[],
+        )
+
+    if app.cards_preview is None:
+        app.cards_preview = ft.DataTable(
+            columns=[
+                ft.DataColumn(ft.Text("Topic")),
+                ft.DataColumn(ft.Text("Subtopic")),
+                ft.DataColumn(ft.Text("Question")),
+                ft.DataColumn(ft.Text("Answer")),
+                ft.DataColumn(ft.Text("Source")),
+                ft.DataColumn(ft.Text("Details")),
+                ft.DataColumn(ft.Text("Edit")),
+                ft.DataColumn(ft.Text("Delete")),
+            ],
+            rows=[],
+        )
 
+    # Each tab carries its own content: the client switches tabs without a round-trip
+    # to Python (no on_change or page.update() per switch)
     app.preview_tab = ft.Tabs(
-        tabs=[ft.Tab(text="Faits"), ft.Tab(text="Cartes"), ft.Tab(text="Logs")],
+        tabs=[
+            ft.Tab(
+                text="Faits",
+                content=ft.Container(
+                    ft.Column([app.fact_preview], scroll=ft.ScrollMode.AUTO),
+                    padding=_PAD_TOP8,
+                ),
+            ),
+            ft.Tab(
+                text="Cartes",
+                content=ft.Container(
+                    ft.Column([app.cards_preview], scroll=ft.ScrollMode.AUTO),
+                    padding=_PAD_TOP8,
+                ),
+            ),
+            ft.Tab(text="Logs", content=ft.Container(app.log_view, padding=_PAD_TOP8)),
+        ],
         selected_index=0,
         expand=True,
     )
 
-    # stack to flip visibility on tab change
-    tab_stack = ft.Stack([
-        ft.Container(content=ft.ListView([app.fact_preview], spacing=0, auto_scroll=False), visible=True, height=420),
-        ft.Container(content=ft.ListView([app.cards_preview], spacing=0, auto_scroll=False), visible=False, height=420),
-        ft.Container(content=app.log_view, visible=False, height=420),
-    ])
-
-    def on_tab_change(_e: ft.ControlEvent):
-        idx = app.preview_tab.selected_index
-        tab_stack.controls[0].visible = idx == 0
-        tab_stack.controls[1].visible = idx == 1
-        tab_stack.controls[2].visible = idx == 2
-        app.page.update()
-
-    app.preview_tab.on_change = on_tab_change
-
     workspace = _card(
-        pal=pal,
+        bg=surface,
+        shadow=shadow,
         content=ft.Column(
             [
                 ft.Row(
                     [
-                        ft.Text("👁️\u200d🗨️ Aperçu", size=18, weight=ft.FontWeight.W_600, color=pal["text"]),
-                        ft.Container(expand=True),
-                        ft.Text("Astuce: double-clique sur ✏️ pour éditer avant l'export", size=12, color=pal["muted"]),
-                    ]
+                        ft.Text("👁️\u200d🗨️ Aperçu", size=18, weight=ft.FontWeight.W_600, color=text),
+                        ft.Text("Astuce: double-clique sur ✏️ pour éditer avant l'export", size=12, color=muted),
+                    ],
+                    alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
                 ),
                 app.preview_tab,
-                ft.Container(tab_stack, expand=True, padding=ft.padding.only(top=8)),
             ],
             spacing=10,
             expand=True,
@@ -346,11 +404,12 @@ def build_home(app) -> ft.Control:
 
     # ----- Title banner ----- #
     hero = _card(
-        pal=pal,
+        bg=surface,
+        shadow=shadow,
         content=ft.Column(
             [
-                ft.Text("⚡ Ankibot", size=30, weight=ft.FontWeight.W_700, color=pal["text"]),
-                ft.Text("Convertis tes PDF en flashcards Anki automatiquement", size=14, color=pal["muted"]),
+                ft.Text("⚡ Ankibot", size=30, weight=ft.FontWeight.W_700, color=text),
+                ft.Text("Convertis tes PDF en flashcards Anki automatiquement", size=14, color=muted),
             ],
             spacing=6,
         ),
@@ -377,6 +436,10 @@ def build_home(app) -> ft.Control:
 
 def build_settings(app) -> ft.Control:
     pal = app._palette()
+    # Palette colors hoisted to locals once per build
+    surface, shadow, text, muted, accent, accent_hover, border = (
+        pal.surface, pal.shadow, pal.text, pal.muted, pal.accent, pal.accent_hover, pal.border
+    )
 
     # ---- Sidebar: Preferences ---- #
     api_field = ft.TextField(
@@ -386,20 +449,16 @@ def build_settings(app) -> ft.Control:
         can_reveal_password=True,
         width=300,
         border_radius=12,
-        text_style=ft.TextStyle(color=pal["text"], size=14),
+        text_style=ft.TextStyle(color=text, size=14),
     )
 
     theme_dd = ft.Dropdown(
         label="Thème",
-        options=[
-            ft.dropdown.Option("system"),
-            ft.dropdown.Option("light"),
-            ft.dropdown.Option("dark"),
-        ],
+        options=_THEME_OPTIONS,
         value=app.cfg.get("theme", "system"),
         width=300,
         border_radius=12,
-        text_style=ft.TextStyle(color=pal["text"]),
+        text_style=ft.TextStyle(color=text),
         on_change=lambda e: app._set_theme(e.control.value),
     )
 
@@ -408,7 +467,7 @@ def build_settings(app) -> ft.Control:
         value=app.cfg.get("accent", "#40C4FF"),
         width=300,
         border_radius=12,
-        text_style=ft.TextStyle(color=pal["text"], size=14),
+        text_style=ft.TextStyle(color=text, size=14),
         on_change=lambda e: app._set_accent(e.control.value),
     )
 
@@ -419,20 +478,36 @@ def build_settings(app) -> ft.Control:
         value=getattr(app, "language", "fr"),
         width=300,
         border_radius=12,
-        text_style=ft.TextStyle(size=14, color=pal["text"]),
-        on_change=lambda e: setattr(app, "language", e.control.value),
+        text_style=ft.TextStyle(size=14, color=text),
+        on_change=_make_attr_setter(app, "language"),
     )
 
     font_slider_val = getattr(app, "font_size", 14)
-    font_val_txt = ft.Text(str(font_slider_val), size=12, color=pal["muted"])
+    font_val_txt = ft.Text(str(font_slider_val), size=12, color=muted)
+    font_timer: threading.Timer | None = None
+
+    def _apply_font_size(size: int):
+        app.font_size = size
+        font_val_txt.value = str(size)
+        _restyle_preview()
+        app.page.update()
+
+    def on_font_change(e: ft.ControlEvent):
+        # Debounce: a drag fires one on_change per step, only the last of a 50 ms burst is applied
+        nonlocal font_timer
+        if font_timer is not None:
+            font_timer.cancel()
+        font_timer = threading.Timer(0.05, _apply_font_size, (int(e.control.value),))
+        font_timer.start()
+
     font_slider = ft.Slider(
         min=12,
         max=22,
         divisions=10,
         value=font_slider_val,
         width=300,
-        active_color=pal["accent"],
-        on_change=lambda e: (setattr(app, "font_size", int(e.control.value)), setattr(font_val_txt, "value", str(int(e.control.value))), app.page.update()),
+        active_color=accent,
+        on_change=on_font_change,
     )
 
     def save_click(_):
@@ -440,10 +515,10 @@ def build_settings(app) -> ft.Control:
         app.cfg["api_key"] = api_field.value.strip()
         save_config(app.cfg)
         # Rebuild backend with new key, keep model
-        app.backend = app.backend.__class__(app.cfg.get("api_key", ""), model=app.backend.cfg.model)
+        app.backend = app.backend.__class__(app.cfg.get("api_key", ""), model=app.backend.cfg.model, logger=app.logger, app_cfg=app.cfg)
         app._apply_theme()
         app.page.appbar = build_appbar(app)
-        app.content_area.content = build_settings(app)
+        _restyle_preview()
         app.snack("Paramètres enregistrés")
 
     def reset_click(_):
@@ -451,38 +526,39 @@ def build_settings(app) -> ft.Control:
         theme_dd.value = "system"
         accent_field.value = "#40C4FF"
         lang_dd.value = "fr"
-        setattr(app, "font_size", 14)
+        if font_timer is not None:
+            font_timer.cancel()
         font_slider.value = 14
-        font_val_txt.value = "14"
-        app.page.update()
+        _apply_font_size(14)
         app.snack("Paramètres réinitialisés (non enregistrés)")
 
     save_btn = ft.FilledButton(
-        content=ft.Row([ft.Icon(ft.Icons.SAVE), ft.Text("Enregistrer", size=14)]),
+        content=ft.Row([ft.Icon(_I.SAVE), ft.Text("Enregistrer", size=14)]),
         width=300,
-        style=ft.ButtonStyle(bgcolor={"": pal["accent"], "hovered": pal["accent_hover"]}, color=ft.Colors.WHITE),
+        style=ft.ButtonStyle(bgcolor={"": accent, "hovered": accent_hover}, color=ft.Colors.WHITE),
         on_click=save_click,
     )
 
     reset_btn = ft.OutlinedButton(
-        content=ft.Row([ft.Icon(ft.Icons.RESTART_ALT), ft.Text("Réinitialiser", size=14)]),
+        content=ft.Row([ft.Icon(_I.RESTART_ALT), ft.Text("Réinitialiser", size=14)]),
         width=300,
         on_click=reset_click,
     )
 
     sidebar = _card(
-        pal=pal,
+        bg=surface,
+        shadow=shadow,
         content=ft.Column(
             [
                 ft.Row([
-                    ft.Icon(ft.Icons.SETTINGS, color=pal["text"]),
-                    ft.Text("Préférences", size=20, weight=ft.FontWeight.W_700, color=pal["text"]),
+                    ft.Icon(_I.SETTINGS, color=text),
+                    ft.Text("Préférences", size=20, weight=ft.FontWeight.W_700, color=text),
                 ], spacing=10),
-                ft.Divider(color=pal["border"], height=20, thickness=1),
+                ft.Divider(color=border, height=20, thickness=1),
                 theme_dd,
                 accent_field,
                 lang_dd,
-                ft.Row([ft.Text("Taille police", size=14, color=pal["text"]), font_val_txt], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                ft.Row([ft.Text("Taille police", size=14, color=text), font_val_txt], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
                 font_slider,
                 api_field,
                 save_btn,
@@ -496,30 +572,40 @@ def build_settings(app) -> ft.Control:
     # ---- Live Preview ---- #
     def _preview_card() -> ft.Container:
         size = getattr(app, "font_size", 14)
+        app._preview_texts = (
+            ft.Text("Exemple de carte", size=size + 2, weight=ft.FontWeight.W_600, color=text),
+            ft.Text("Q : Quelle est la capitale de la France ?", size=size, color=text),
+            ft.Text("A : Paris", size=size, color=accent, weight=ft.FontWeight.W_600),
+        )
         return ft.Container(
-            bgcolor=pal["surface"],
+            bgcolor=surface,
             padding=20,
             border_radius=16,
-            shadow=ft.BoxShadow(blur_radius=15, color=pal["shadow"]),
-            content=ft.Column(
-                [
-                    ft.Text("Exemple de carte", size=size + 2, weight=ft.FontWeight.W_600, color=pal["text"]),
-                    ft.Text("Q : Quelle est la capitale de la France ?", size=size, color=pal["text"]),
-                    ft.Text("A : Paris", size=size, color=pal["accent"], weight=ft.FontWeight.W_600),
-                ],
-                spacing=10,
-            ),
+            shadow=_shadow(15, shadow),
+            content=ft.Column(list(app._preview_texts), spacing=10),
         )
 
+    def _restyle_preview():
+        # Size and colors applied in place: the preview follows the settings without rebuilding the page
+        p = app._palette()
+        size = getattr(app, "font_size", 14)
+        title, question, answer = app._preview_texts
+        title.size = size + 2
+        question.size = answer.size = size
+        title.color = question.color = p.text
+        answer.color = p.accent
+        app.preview_card_container.bgcolor = p.surface
+
     app.preview_card_container = _preview_card()
 
     workspace = _card(
-        pal=pal,
+        bg=surface,
+        shadow=shadow,
         expand=True,
         content=ft.Column(
             [
-                ft.Text("👀 Aperçu en direct", size=18, weight=ft.FontWeight.W_600, color=pal["text"]),
-                ft.Divider(color=pal["border"], height=16, thickness=1),
+                ft.Text("👀 Aperçu en direct", size=18, weight=ft.FontWeight.W_600, color=text),
+                ft.Divider(color=border, height=16, thickness=1),
                 app.preview_card_container,
             ],
             spacing=16,
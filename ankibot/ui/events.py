@@ -1,8 +1,13 @@
 from __future__ import annotations
+import asyncio
+import logging
 import os
 import re
+from contextlib import contextmanager
 import flet as ft
-from ankibot.config import save_config
+from ankibot.config import DEFAULT_MODEL, MODEL_MODES, save_config
+
+_HEX_COLOR_RE = re.compile(r"#[0-9A-Fa-f]{6}")
 
 
 def attach(app):
@@ -16,119 +21,62 @@ def attach(app):
     def _toggle_theme(_):
         app.cfg["theme"] = "light" if app._is_dark() else "dark"
         save_config(app.cfg)
-        
-        # Applique le thème SANS reconstruire l'interface
-        app._apply_theme()
-        
-        # Met à jour uniquement l'app bar
-        app.page.appbar = app._build_appbar()
-        
-        # Rafraîchit l'affichage des données existantes
-        _refresh_current_view()
-        
-        app.page.update()
+        app._palette_version += 1  # invalide les couleurs dérivées mémoïsées
+        _repaint_theme()
 
     def _set_theme(val: str):
+        if app.cfg.get("theme", "system") == val:  # même thème : ni sauvegarde ni recoloration
+            return
         app.cfg["theme"] = val
         save_config(app.cfg)
-        
-        # Applique le thème SANS reconstruire
-        app._apply_theme()
-        app.page.appbar = app._build_appbar()
-        
-        _refresh_current_view()
-        app.page.update()
+        app._palette_version += 1  # invalide les couleurs dérivées mémoïsées
+        _repaint_theme()
 
     def _set_accent(val: str):
-        if re.fullmatch(r"#[0-9A-Fa-f]{6}", (val or "").strip() or "#40C4FF"):
+        if _HEX_COLOR_RE.fullmatch((val or "").strip() or "#40C4FF"):
+            if app.cfg.get("accent") == val.strip():
+                return
             app.cfg["accent"] = val.strip()
             save_config(app.cfg)
-            
-            # Applique le thème SANS reconstruire
+            app._palette_version += 1  # invalide les couleurs dérivées mémoïsées
+            _repaint_theme()
+
+    def _repaint_theme():
+        # Applique le thème SANS reconstruire : app bar et vue courante recolorées en place,
+        # envoyées en une seule mise à jour
+        with _batch_updates():
             app._apply_theme()
-            app.page.appbar = app._build_appbar()
-            
             _refresh_current_view()
-            app.page.update()
+
+    def _register_themed(name: str, ctrl: ft.Control, restyle):
+        # Un nom = un contrôle : une reconstruction remplace l'entrée au lieu d'en empiler
+        app._themed_controls[name] = (ctrl, restyle)
 
     def _refresh_current_view():
         """Rafraîchit uniquement les couleurs de la vue actuelle sans reconstruire."""
         pal = app._palette()
-        
-        # Met à jour les couleurs des éléments existants
-        if hasattr(app, 'facts_stats') and app.facts_stats:
-            app.facts_stats.bgcolor = pal["surface_alt"]
-            if app.facts_stats.content and hasattr(app.facts_stats.content, 'controls'):
-                for ctrl in app.facts_stats.content.controls:
-                    if isinstance(ctrl, ft.Icon):
-                        ctrl.color = pal["muted"]
-                    elif isinstance(ctrl, ft.Text):
-                        ctrl.color = pal["muted"]
-        
-        if hasattr(app, 'cards_stats') and app.cards_stats:
-            app.cards_stats.bgcolor = pal["surface_alt"]
-            if app.cards_stats.content and hasattr(app.cards_stats.content, 'controls'):
-                for ctrl in app.cards_stats.content.controls:
-                    if isinstance(ctrl, ft.Icon):
-                        ctrl.color = pal["muted"]
-                    elif isinstance(ctrl, ft.Text):
-                        ctrl.color = pal["muted"]
-        
-        # Met à jour les champs de recherche
-        if hasattr(app, 'search_facts') and app.search_facts:
-            app.search_facts.bgcolor = pal["surface_alt"]
-            app.search_facts.border_color = pal["border"]
-            app.search_facts.focused_border_color = pal["accent"]
-            if app.search_facts.text_style:
-                app.search_facts.text_style.color = pal["text"]
-        
-        if hasattr(app, 'search_cards') and app.search_cards:
-            app.search_cards.bgcolor = pal["surface_alt"]
-            app.search_cards.border_color = pal["border"]
-            app.search_cards.focused_border_color = pal["accent"]
-            if app.search_cards.text_style:
-                app.search_cards.text_style.color = pal["text"]
-        
-        # Met à jour les tables
-        if hasattr(app, 'fact_preview') and app.fact_preview:
-            app.fact_preview.heading_row_color = pal["surface_alt"]
-            app.fact_preview.border = ft.border.all(1, pal["border"])
-            app.fact_preview.horizontal_lines = ft.BorderSide(1, pal["border"] + "40")
-        
-        if hasattr(app, 'cards_preview') and app.cards_preview:
-            app.cards_preview.heading_row_color = pal["surface_alt"]
-            app.cards_preview.border = ft.border.all(1, pal["border"])
-            app.cards_preview.horizontal_lines = ft.BorderSide(1, pal["border"] + "40")
-        
-        # Met à jour les tabs
-        if hasattr(app, 'preview_tab') and app.preview_tab:
-            app.preview_tab.label_color = pal["accent"]
-            app.preview_tab.indicator_color = pal["accent"]
-            app.preview_tab.divider_color = pal["border"]
-            app.preview_tab.overlay_color = {ft.ControlState.HOVERED: pal["accent"] + "10"}
+        # Couleurs identiques à celles déjà appliquées (ex. "system" résolu vers le même mode) :
+        # les contrôles enregistrés sont déjà à jour
+        key = (pal, app._is_dark())
+        if key == app._last_palette_key:
+            return
+        app._last_palette_key = key
+        pd = app._palette_derived()
+        for ctrl, restyle in app._themed_controls.values():
+            restyle(ctrl, pal, pd)
 
     # ----- Model / density -----
     def _on_model_change(e: ft.ControlEvent):
         label = e.control.value
         app.model_mode = label
-        if "2.5 Flash" in label:
-            app.backend.cfg.model = "gemini-2.5-flash"
-        elif "2.5 Pro" in label:
-            app.backend.cfg.model = "gemini-2.5-pro"
-        elif "3.0 Flash" in label:
-            app.backend.cfg.model = "gemini-3.0-flash"
-        elif "3.0 Pro" in label:
-            app.backend.cfg.model = "gemini-3.0-pro"
-        else:
-            app.backend.cfg.model = "gemini-2.5-flash"
-            app.logger.warn(f"Modèle inconnu sélectionné: {label}, retour à gemini-2.5-flash")
-        if "thinking" in label:
-            app.backend.cfg.thinking_budget = -1
-        else:
-            app.backend.cfg.thinking_budget = 0
+        mode = MODEL_MODES.get(label)
+        if mode is None:
+            mode = (DEFAULT_MODEL, 0)
+            app.logger.warning("Modèle inconnu sélectionné: %s, retour à %s", label, DEFAULT_MODEL)
+        app.backend.cfg.model, app.backend.cfg.thinking_budget = mode
         app.cfg["model_mode"] = label
         save_config(app.cfg)
-        app.logger.info(f"Modèle changé → {app.backend.cfg.model} (thinking={app.backend.cfg.thinking_budget})")
+        app.logger.info("Modèle changé → %s (thinking=%s)", app.backend.cfg.model, app.backend.cfg.thinking_budget)
 
     def _update_density(e: ft.ControlEvent, lbl: ft.Text):
         mapping = {1: "Faible", 2: "Normal", 3: "Élevée"}
@@ -144,25 +92,96 @@ def attach(app):
         if e.files:
             app.selected_files = [f.path for f in e.files]
             app.last_dir = os.path.dirname(app.selected_files[0])
-            names = ", ".join(os.path.basename(f) for f in app.selected_files[:3])
+            names = ", ".join([os.path.basename(f) for f in app.selected_files[:3]])
             if len(app.selected_files) > 3:
                 names += f" … (+{len(app.selected_files)-3})"
             app.file_status.value = f"📂 {len(app.selected_files)} fichiers : {names}"
-            app.file_status.color = pal["ok"]
-            app.logger.info(f"Fichiers chargés: {', '.join(app.selected_files)}")
+            app.file_status.color = pal.ok
+            # La liste complète n'est jointe que si le message sera réellement émis
+            if app.logger.isEnabledFor(logging.INFO):
+                app.logger.info("Fichiers chargés: %s", ", ".join(app.selected_files))
         else:
             app.selected_files = []
             app.file_status.value = "📂 Aucun fichier"
-            app.file_status.color = pal["warn"]
+            app.file_status.color = pal.warn
         app.page.update()
 
+    def _ensure_filepicker() -> ft.FilePicker:
+        # Un seul FilePicker dans l'overlay, réutilisé par chaque reconstruction de l'accueil
+        if app._fp is None:
+            app._fp = ft.FilePicker(on_result=_on_pick)
+            app.page.overlay.append(app._fp)
+        return app._fp
+
+    # ----- Search -----
+    def _apply_search(name: str):
+        """Rebuild the "facts" or "cards" table from the rows matching its current query.
+
+        The filter runs on the data, so it also reaches rows not loaded yet.
+        """
+        with _batch_updates():
+            if name == "facts":
+                app._refresh_fact_preview()
+                if app.update_facts_view:
+                    app.update_facts_view(defer_update=True)
+            else:
+                app._refresh_cards_preview()
+                if app.update_cards_view:
+                    app.update_cards_view(defer_update=True)
+
+    async def _debounced_search(name: str, query: str):
+        await asyncio.sleep(0.12)
+        app._search_queries[name] = query
+        _apply_search(name)
+
+    def _on_search(e: ft.ControlEvent):
+        # Debounce sur la boucle d'événements : chaque frappe annule le filtrage en attente,
+        # seule la dernière d'une rafale de 120 ms filtre les lignes
+        name = "facts" if e.control is app.search_facts else "cards"
+        pending = app._search_tasks.get(name)
+        if pending is not None:
+            pending.cancel()
+        app._search_tasks[name] = app.page.run_task(_debounced_search, name, e.control.value or "")
+
+    # ----- Batched updates -----
+    def _flush():
+        """page.update(), unless a _batch_updates() block will flush on exit."""
+        if not app._update_depth:
+            app.page.update()
+
+    @contextmanager
+    def _batch_updates():
+        # Flet n'expose pas de page.batch_updates() : on suspend les flush des helpers
+        # et on envoie une seule mise à jour en sortie. Les blocs peuvent se chevaucher entre
+        # threads (handlers synchrones) et boucle d'événements : un compteur sous verrou, et
+        # c'est le dernier bloc à sortir qui flushe, quel que soit l'ordre de sortie
+        with app._update_lock:
+            app._update_depth += 1
+        try:
+            yield
+        finally:
+            with app._update_lock:
+                app._update_depth -= 1
+                last = app._update_depth == 0
+            if last:
+                app.page.update()
+
     # ----- Content fade -----
     def _fade_to(content: ft.Control):
         app.content_area.opacity = 0
         app.content_area.content = content
         app.page.update()
+        # Le fondu entrant part au prochain tour de boucle et ne renvoie que content_area,
+        # au lieu d'un second page.update() synchrone
+        app.page.run_task(_fade_in)
+
+    async def _fade_in():
+        await asyncio.sleep(0)
         app.content_area.opacity = 1
-        app.page.update()
+        if app.content_area.page is not None:
+            app.content_area.update()
+        else:
+            app.page.update()
 
     # bind
     app._go_home = _go_home
@@ -170,7 +189,12 @@ def attach(app):
     app._set_theme = _set_theme
     app._set_accent = _set_accent
     app._refresh_current_view = _refresh_current_view
+    app._register_themed = _register_themed
     app._on_model_change = _on_model_change
     app._update_density = _update_density
     app._on_pick = _on_pick
+    app._ensure_filepicker = _ensure_filepicker
+    app._on_search = _on_search
+    app._flush = _flush
+    app._batch_updates = _batch_updates
     app._fade_to = _fade_to
\ No newline at end of file
@@ -6,6 +6,8 @@ import csv
 import asyncio
 import flet as ft
 
+_UNSAFE_FILENAME_RE = re.compile(r"[^\w\- ]+")
+
 
 def attach(app):
     def _rows_to_csv_text() -> str:
@@ -26,7 +28,7 @@ def attach(app):
         if not csv_verified.strip():
             csv_verified = app.verified_csv or app.generated_csv
         if not csv_verified.strip():
-            app.snack("Aucun CSV à enregistrer", pal["err"])
+            app.snack("Aucun CSV à enregistrer", pal.err)
             return
 
         base_name = "ankibot"
@@ -65,7 +67,7 @@ def attach(app):
             app.logger.info("Exporté (RAW): %s", raw_path)
         except Exception as e:
             app.logger.error("Échec d'écriture: %s", e)
-            app.snack(f"Échec d'écriture: {e}", pal["err"])
+            app.snack(f"Échec d'écriture: {e}", pal.err)
             return
 
         if app.split_by_topic:
@@ -85,7 +87,7 @@ def attach(app):
             topic = (r[0] if len(r) > 0 else "Untitled").strip() or "Untitled"
             by_topic.setdefault(topic, []).append(r)
         for topic, items in by_topic.items():
-            safe = re.sub(r"[^\w\- ]+", "_", topic)[:60].strip().replace(" ", "_") or "Untitled"
+            safe = _UNSAFE_FILENAME_RE.sub("_", topic)[:60].strip().replace(" ", "_") or "Untitled"
             out = os.path.join(folder, f"{safe}.anki.csv")
             with open(out, "w", encoding="utf-8", newline="") as f:
                 w = csv.writer(f, quoting=csv.QUOTE_ALL)
@@ -21,27 +21,36 @@ def append_log(app, msg: str, levelno: int):
     if app.log_view is None:
         return
     pal = app._palette()
-    color = pal["text"]
+    color = pal.text
     if levelno >= logging.ERROR:
-        color = pal["err"]
+        color = pal.err
     elif levelno >= logging.WARNING:
-        color = pal["warn"]
+        color = pal.warn
     elif levelno <= logging.INFO:
-        color = pal["text"]
+        color = pal.text
     app.log_view.controls.append(ft.Text(msg, size=13, color=color))
+    app._logs_dirty = True
     app.log_view.auto_scroll = True
-    app.page.update()
+    if not app._logs_populated and app._logs_empty is not None:
+        # First message: the empty state gives way to the list, once
+        app._logs_populated = True
+        app.log_view.visible = True
+        app._logs_empty.visible = False
+        app.page.update()
+    elif app.log_view.page is not None:
+        # After that only the list is sent to the renderer
+        app.log_view.update()
 
 
 def snack(app, msg: str, color: str | None = None):
     pal = app._palette()
     sb = ft.SnackBar(
         content=ft.Text(msg, color="white"),
-        bgcolor=color or pal["accent"],
+        bgcolor=color or pal.accent,
         behavior=ft.SnackBarBehavior.FLOATING,
         duration=3000,
         show_close_icon=True,
     )
     app.page.overlay.append(sb)
     sb.open = True
-    app.page.update()
+    app._flush()
@@ -4,17 +4,96 @@ import os
 import io
 import csv
 import asyncio
+import time
 import traceback
-import flet as ft
+from functools import lru_cache
 
-from ankibot.ui import app
 from ankibot.utils import extract_text_from_pdf, chunk_text, deduplicate_facts
 from ankibot.backend import Fact
 
+# Minimum spacing between two throttled progress pushes to the renderer (~20 Hz)
+_PROGRESS_PUSH_INTERVAL_S = 0.05
+
+
+async def _run_pool(items, work, workers: int, on_done) -> None:
+    """Run work(item) over items with a fixed pool of worker tasks draining one queue.
+
+    on_done(item, result) is called as each item finishes, in completion order.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in items:
+        queue.put_nowait(item)
+
+    async def worker():
+        # Workers drain the queue without a lock: it is filled before they start
+        while True:
+            try:
+                item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            on_done(item, await work(item))
+
+    tasks = [asyncio.create_task(worker()) for _ in range(min(workers, len(items)))]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@lru_cache(maxsize=4)
+def _chunk_cached(text: str, size: int, overlap: int) -> tuple[str, ...]:
+    """chunk_text memoized per (text, size, overlap): re-running on the same source skips the token scan."""
+    return tuple(chunk_text(text, size, overlap))
+
+
+async def _until_cancelled(aw, cancel_event: asyncio.Event):
+    """Await aw, racing it against cancel_event: a cancel aborts the in-flight work at once and raises CancelledError."""
+    main = asyncio.ensure_future(aw)
+    waiter = asyncio.create_task(cancel_event.wait())
+    try:
+        await asyncio.wait({main, waiter}, return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        main.cancel()
+        raise
+    finally:
+        waiter.cancel()
+    if not main.done():
+        # Cancel requested: abort the calls still in flight instead of waiting for their turn
+        main.cancel()
+        await asyncio.gather(main, return_exceptions=True)
+        raise asyncio.CancelledError
+    return main.result()
+
+
+def _combine_csvs(csvs) -> str:
+    """Concatenate per-chunk CSVs under one pooled header, dropping blank data lines; "" if none."""
+    header = None
+    body_buf = io.StringIO()
+    sep = ""
+    for csv_str in csvs:
+        # All chunks share the header: detect it once (first non-empty chunk), then only partition the rest
+        head, _, body = csv_str.partition("\n")
+        if header is None:
+            if not head.strip():
+                continue
+            header = head.rstrip("\r")
+        for line in body.splitlines():
+            if line.strip():
+                body_buf.write(sep)
+                body_buf.write(line)
+                sep = "\n"
+    if header is None:
+        return ""
+    return header + "\n" + body_buf.getvalue()
+
 
 def attach(app):
     async def _start_pipeline(pasted_text: str):
         app.cancel_event = asyncio.Event()
+        app.backend.read_cache = not app.skip_cache
+        app._ensure_results_widgets()  # tables are built lazily, on the first run
         if app.progress:
             app.progress.value = 0.0
         if app.progress_label:
@@ -24,163 +103,194 @@ def attach(app):
             await _pipeline(pasted_text, app.new_pipeline)
         except asyncio.CancelledError:
             app.logger.warning("Pipeline annulé.")
-            app.snack("Opération annulée", app._palette()["warn"])
+            app.snack("Opération annulée", app._palette().warn)
         except Exception as e:
             app.logger.error("Erreur fatale: %s\n%s", e, traceback.format_exc())
-            app.snack(f"Erreur: {e}", app._palette()["err"])
+            app.snack(f"Erreur: {e}", app._palette().err)
         finally:
             if app.progress:
                 app.progress.value = None  # stop animation
             app.page.update()
 
-    def _set_stage(label: str, value: float):
+    async def _cancel():
+        app.cancel_event.set()
+
+    def _request_cancel(e=None):
+        """Cancel button handler: set cancel_event on the event loop.
+
+        Sync handlers run in an executor thread, and an asyncio.Event set from there never wakes
+        the tasks waiting on it (_until_cancelled would miss the cancel).
+        """
+        app.page.run_task(_cancel)
+
+    def _push_progress(throttle: bool = False):
+        # Progress bursts (one tick per file / batch / chunk) are capped at ~20 pushes per second;
+        # stage changes always go out
+        now = time.monotonic()
+        if throttle and now - app._last_ui_push < _PROGRESS_PUSH_INTERVAL_S:
+            return
+        app._last_ui_push = now
+        app._flush()
+
+    def _set_stage(label: str, value: float, throttle: bool = False):
         if app.progress:
             app.progress.value = value
         if app.progress_label:
             app.progress_label.value = label
-        app.page.update()
+        _push_progress(throttle)
+
+    def _read_input(path: str) -> str:
+        if path.lower().endswith(".pdf"):
+            return extract_text_from_pdf(path)
+        try:
+            # One binary read and a single UTF-8 decode, no TextIOWrapper
+            with open(path, "rb") as f:
+                return f.read().decode("utf-8", "replace")
+        except Exception as e:
+            app.logger.error("Erreur lecture '%s': %s", path, e)
+            return ""
+
+    async def _read_inputs() -> list[str]:
+        """Read every selected file in its own thread, concurrently; texts keep the selection order."""
+        if app.cancel_event.is_set():
+            raise asyncio.CancelledError
+        paths = app.selected_files
+        done = 0
+
+        async def read(path: str) -> str:
+            nonlocal done
+            text = await asyncio.to_thread(_read_input, path)
+            # Progress advances as each file finishes, in completion order
+            done += 1
+            if app.progress and not app.cancel_event.is_set():
+                app.progress.value = 0.02 + 0.10 * (done / len(paths))
+                _push_progress(throttle=True)
+            return text
+
+        # gather keeps the selection order; a failed read becomes ""
+        results = await asyncio.gather(*(read(p) for p in paths), return_exceptions=True)
+        if app.cancel_event.is_set():
+            raise asyncio.CancelledError
+        texts: list[str] = []
+        for path, res in zip(paths, results):
+            if isinstance(res, BaseException):
+                app.logger.error("Erreur lecture '%s': %s", path, res)
+                res = ""
+            if not res.strip():
+                app.logger.warning("Aucun texte détecté dans: %s", os.path.basename(path))
+            texts.append(res)
+        return texts
 
     async def _pipeline(pasted_text: str, newpipeline: bool):
         pal = app._palette()
         if not app.selected_files and not pasted_text.strip():
-            app.snack("Sélectionne un fichier ou colle du texte", pal["err"])
+            app.snack("Sélectionne un fichier ou colle du texte", pal.err)
             return
         if not getattr(app.backend, "client", None):
-            app.snack("Clé API manquante (Paramètres)", pal["err"])
+            app.snack("Clé API manquante (Paramètres)", pal.err)
             return
 
         if newpipeline:
                 # Stage 1: Read & concat
                 _set_stage("Lecture des entrées…", 0.02)
-                texts: list[str] = []
-                for idx, path in enumerate(app.selected_files):
-                    if app.cancel_event.is_set():
-                        raise asyncio.CancelledError
-                    if path.lower().endswith(".pdf"):
-                        t = await asyncio.to_thread(extract_text_from_pdf, path)
-                    else:
-                        try:
-                            with open(path, "r", encoding="utf-8") as f:
-                                t = f.read()
-                        except Exception as e:
-                            app.logger.error("Erreur lecture '%s': %s", path, e)
-                            t = ""
-                    if not t.strip():
-                        app.logger.warning("Aucun texte détecté dans: %s", os.path.basename(path))
-                    texts.append(t)
-                    if app.progress:
-                        app.progress.value = 0.02 + 0.10 * ((idx + 1) / max(1, len(app.selected_files)))
-                        app.page.update()
+                texts = await _read_inputs()
                 if pasted_text.strip():
                     texts.append(pasted_text)
                 app.source_full_text = "\n\n".join(t for t in texts if t)
                 if not app.source_full_text.strip():
-                    app.snack("Aucun texte exploitable.", pal["err"])
+                    app.snack("Aucun texte exploitable.", pal.err)
                     return
 
                 # Stage 2: Chunk
                 _set_stage("Découpage en segments…", 0.16)
-                chunks = await asyncio.to_thread(chunk_text, app.source_full_text, 2000, 120)
+                chunks = await asyncio.to_thread(_chunk_cached, app.source_full_text, 2000, 120)
                 app.logger.info("Segments: %d", len(chunks))
                 _set_stage(f"Découpage terminé → {len(chunks)} segments", 0.20)
 
-                # Stage 3: Extract facts (parallel with adaptive throttling)
+                # Stage 3: Extract facts (concurrent batches, bounded by the backend semaphore)
                 _set_stage("Extraction des faits…", 0.22)
                 max_workers = min(8, (os.cpu_count() or 4))
-                semaphore = asyncio.Semaphore(max_workers)
-                facts_all: list[tuple[int, Fact]] = []  # (chunk_id, fact)
-
-                async def extract_one(i: int, ch: str):
-                    async with semaphore:
-                        if app.cancel_event.is_set():
-                            return []
-                        app.logger.info("Segment %d/%d…", i + 1, len(chunks))
-                        try:
-                            facts = await app.backend.extract_facts(ch)
-                            app.logger.info("Segment %d: %d faits", i + 1, len(facts))
-                            return [(i, f) for f in facts]
-                        except Exception as e:
-                            app.logger.error("Erreur extraction (segment %d): %s", i + 1, e)
-                            return []
-
-                tasks = [extract_one(i, ch) for i, ch in enumerate(chunks)]
+                # Several chunks per request to amortize the prompt and the round-trip
+                batch_size = max(1, int(app.cfg.get("extract_batch_size", 4)))
                 done = 0
-                for coro in asyncio.as_completed(tasks):
-                    if app.cancel_event.is_set():
-                        raise asyncio.CancelledError
-                    res = await coro
-                    facts_all.extend(res)
-                    done += 1
-                    _set_stage(f"Extraction des faits… ({done}/{len(chunks)})", 0.22 + 0.28 * (done / max(1, len(chunks))))
+
+                def on_batch(ids: list[int], per_chunk: list[list[Fact]]):
+                    nonlocal done
+                    for i, facts in zip(ids, per_chunk):
+                        app.logger.info("Segment %d: %d faits", i + 1, len(facts))
+                    done += len(ids)
+                    _set_stage(f"Extraction des faits… ({done}/{len(chunks)})", 0.22 + 0.28 * (done / max(1, len(chunks))), throttle=True)
+
+                facts_per_chunk = await _until_cancelled(
+                    app.backend.extract_facts_all(chunks, batch_size, on_batch=on_batch),
+                    app.cancel_event,
+                )
+                facts_all: list[tuple[int, Fact]] = [(i, f) for i, facts in enumerate(facts_per_chunk) for f in facts]  # (chunk_id, fact)
 
                 # Stage 4: Deduplicate globally, keeping the first chunk_id for duplicates
                 _set_stage("Déduplication…", 0.52)
                 facts_unique: list[tuple[int, Fact]] = []
                 seen = set()
                 for chunk_id, f in facts_all:
-                    key = tuple(sorted(f.__dict__.items()))  # Assuming facts are deduped based on exact field matches
+                    # Exact match on every field: a flat tuple of the slots, no dict or sort per fact
+                    key = (f.topic, f.subtopic, f.fact, f.source)
                     if key not in seen:
                         seen.add(key)
                         facts_unique.append((chunk_id, f))
                 app.all_facts = [f for _, f in facts_unique]
                 app.logger.info("✅ %d faits uniques", len(app.all_facts))
-                _set_stage(f"Faits uniques: {len(app.all_facts)}", 0.57)
-                app._refresh_fact_preview()
+                with app._batch_updates():
+                    _set_stage(f"Faits uniques: {len(app.all_facts)}", 0.57)
+                    app._refresh_fact_preview()
 
-                # Group facts by chunk_id
-                from collections import defaultdict
-                facts_by_chunk: defaultdict[int, list[Fact]] = defaultdict(list)
+                # Group facts by chunk_id (facts_unique is already in chunk order, so insertion order is sorted)
+                facts_by_chunk: dict[int, list[Fact]] = {}
                 for chunk_id, f in facts_unique:
-                    facts_by_chunk[chunk_id].append(f)
-
-                # Stage 5: Generate CSV per chunk (parallel)
+                    facts_by_chunk.setdefault(chunk_id, []).append(f)
+                chunk_items: list[tuple[int, list[Fact]]] = list(facts_by_chunk.items())
+
+                # Several chunks per card request, like the extraction batches: generation and verification
+                # then make one round-trip per group, keyed by the group's first chunk_id
+                card_batch = max(1, int(app.cfg.get("card_batch_size", 4)))
+                groups: list[tuple[list[int], list[Fact]]] = []
+                for b in range(0, len(chunk_items), card_batch):
+                    part = chunk_items[b:b + card_batch]
+                    groups.append(([chunk_id for chunk_id, _ in part], [f for _, facts in part for f in facts]))
+                group_sources = {ids[0]: "\n\n".join(chunks[i] for i in ids) for ids, _ in groups}
+
+                # Stage 5: Generate CSV per group of chunks (parallel)
                 _set_stage("Génération des cartes…", 0.61)
-                active_chunks = sorted(facts_by_chunk.keys())
-                semaphore = asyncio.Semaphore(max_workers)  # Reuse semaphore
-
-                async def generate_one(chunk_id: int):
-                    async with semaphore:
-                        if app.cancel_event.is_set():
-                            return chunk_id, ""
-                        facts = facts_by_chunk[chunk_id]
-                        try:
-                            csv_str = await app.backend.generate_csv(
-                                facts, reverse=app.reverse_card, density_level=app.density_level, custom_add=app.custom_add
-                            )
-                            return chunk_id, csv_str
-                        except Exception as e:
-                            app.logger.error("Erreur génération CSV (segment %d): %s", chunk_id + 1, e)
-                            return chunk_id, ""
 
-                tasks = [generate_one(chunk_id) for chunk_id in active_chunks]
+                async def generate_one(group: tuple[list[int], list[Fact]]) -> str:
+                    ids, facts = group
+                    try:
+                        return await app.backend.generate_csv(
+                            facts, reverse=app.reverse_card, density_level=app.density_level, custom_add=app.custom_add
+                        )
+                    except Exception as e:
+                        app.logger.error("Erreur génération CSV (segments %d-%d): %s", ids[0] + 1, ids[-1] + 1, e)
+                        return ""
+
                 generated_dict = {}
                 done = 0
-                for coro in asyncio.as_completed(tasks):
-                    if app.cancel_event.is_set():
-                        raise asyncio.CancelledError
-                    chunk_id, csv_str = await coro
+
+                def on_generated(group: tuple[list[int], list[Fact]], csv_str: str):
+                    nonlocal done
                     if csv_str:
-                        generated_dict[chunk_id] = csv_str
+                        generated_dict[group[0][0]] = csv_str
                     done += 1
-                    _set_stage(f"Génération des cartes… ({done}/{len(active_chunks)})", 0.61 + 0.09 * (done / max(1, len(active_chunks))))
+                    _set_stage(f"Génération des cartes… ({done}/{len(groups)})", 0.61 + 0.09 * (done / max(1, len(groups))), throttle=True)
+
+                await _until_cancelled(_run_pool(groups, generate_one, max_workers, on_generated), app.cancel_event)
 
                 # Combine generated CSVs into one
-                if generated_dict:
-                    # Assume all CSVs have the same header; take from first
-                    first_csv = next(iter(generated_dict.values()))
-                    header = first_csv.splitlines()[0]
-                    data_lines = []
-                    for csv_str in generated_dict.values():
-                        lines = csv_str.splitlines()[1:]
-                        data_lines.extend(l for l in lines if l.strip())
-                    app.generated_csv = header + '\n' + '\n'.join(data_lines)
-                else:
-                    app.generated_csv = ""
-                _set_stage("Cartes générées (brut)", 0.70)
+                app.generated_csv = _combine_csvs(generated_dict.values())
+                with app._batch_updates():
+                    _set_stage("Cartes générées (brut)", 0.70)
 
-                # Fill editable table from generated CSV
-                app._parse_cards_to_rows(app.generated_csv)
-                app._refresh_cards_preview()
+                    # Fill editable table from generated CSV
+                    app._parse_cards_to_rows(app.generated_csv)
+                    app._refresh_cards_preview()
 
                 if app.cancel_event.is_set():
                     raise asyncio.CancelledError
@@ -188,50 +298,33 @@ def attach(app):
                 # Prepare current_csv_per_chunk for verification
                 current_csv_per_chunk = generated_dict.copy()
 
-                # Stage 6: Verify CSV per chunk (configurable runs)
+                # Stage 6: Verify CSV per group, against the group's source text (configurable runs)
                 app.verification_runs = 2 if app.double_check else 1
                 for run in range(app.verification_runs or 1):  # Default to 1 run
                     _set_stage(f"Vérification & correction ({run+1}/{app.verification_runs or 1})…", 0.75 + 0.08 * run)
 
-                    async def verify_one(chunk_id: int):
-                        async with semaphore:
-                            if app.cancel_event.is_set():
-                                return chunk_id, current_csv_per_chunk[chunk_id]
-                            chunk_text = chunks[chunk_id]
-                            csv_to_verify = current_csv_per_chunk[chunk_id]
-                            try:
-                                verified_csv = await app.backend.verify_csv(chunk_text, csv_to_verify)
-                                return chunk_id, verified_csv
-                            except Exception as e:
-                                app.logger.warning(f"Erreur vérification CSV (segment {chunk_id+1}, run {run+1}): %s — utilisation du CSV précédent.", e)
-                                return chunk_id, csv_to_verify
-
-                    tasks = [verify_one(chunk_id) for chunk_id in active_chunks]
-                    done = 0
-                    verified_dict = {}
-                    for coro in asyncio.as_completed(tasks):
-                        if app.cancel_event.is_set():
-                            raise asyncio.CancelledError
-                        chunk_id, verified_csv = await coro
-                        verified_dict[chunk_id] = verified_csv
-                        done += 1
-                        # Approximate sub-progress within the run
-                        sub_prog = (done / max(1, len(active_chunks))) * 0.08
-                        _set_stage(f"Vérification & correction ({run+1}/{app.verification_runs or 1})… ({done}/{len(active_chunks)})", 0.75 + 0.08 * run + sub_prog)
+                    async def verify_one(chunk_id: int, csv_to_verify: str) -> tuple[int, str]:
+                        try:
+                            return chunk_id, await app.backend.verify_csv(group_sources[chunk_id], csv_to_verify)
+                        except Exception as e:
+                            app.logger.warning(f"Erreur vérification CSV (lot du segment {chunk_id+1}, run {run+1}): %s — utilisation du CSV précédent.", e)
+                            return chunk_id, csv_to_verify
+
+                    # Per-chunk progress is cosmetic here: one gather (self._sem in the backend bounds the API
+                    # concurrency), results in input order, and a single stage update once the run is done
+                    verified_dict = dict(await _until_cancelled(
+                        asyncio.gather(*(verify_one(chunk_id, csv_str) for chunk_id, csv_str in current_csv_per_chunk.items())),
+                        app.cancel_event,
+                    ))
+                    _set_stage(
+                        f"Vérification & correction ({run+1}/{app.verification_runs or 1})… ({len(verified_dict)} lots)",
+                        0.75 + 0.08 * (run + 1),
+                    )
 
                     current_csv_per_chunk = verified_dict
 
                     # Combine verified CSVs for preview
-                    if verified_dict:
-                        first_csv = next(iter(verified_dict.values()))
-                        header = first_csv.splitlines()[0]
-                        data_lines = []
-                        for csv_str in verified_dict.values():
-                            lines = csv_str.splitlines()[1:]
-                            data_lines.extend(l for l in lines if l.strip())
-                        app.verified_csv = header + '\n' + '\n'.join(data_lines)
-                    else:
-                        app.verified_csv = ""
+                    app.verified_csv = _combine_csvs(verified_dict.values())
 
                     app._parse_cards_to_rows(app.verified_csv)
                     app._refresh_cards_preview()
@@ -240,105 +333,89 @@ def attach(app):
 
                 # Stage 7: Save (picker + options)
                 _set_stage("Terminé ✅ — Cliquez sur Exporter pour sauvegarder", 1.0)
-                app.snack("Cartes prêtes ! Cliquez sur Exporter pour sauvegarder.", pal["ok"])
+                app.snack("Cartes prêtes ! Cliquez sur Exporter pour sauvegarder.", pal.ok)
 
                 # Stats
                 app._update_deck_stats()
-                app.snack("Deck(s) généré(s)", pal["ok"])
+                app.snack("Deck(s) généré(s)", pal.ok)
         else:
             # Stage 1: Read & concat
             _set_stage("Lecture des entrées…", 0.02)
-            texts: list[str] = []
-            for idx, path in enumerate(app.selected_files):
-                if app.cancel_event.is_set():
-                    raise asyncio.CancelledError
-                if path.lower().endswith(".pdf"):
-                    t = await asyncio.to_thread(extract_text_from_pdf, path)
-                else:
-                    try:
-                        with open(path, "r", encoding="utf-8") as f:
-                            t = f.read()
-                    except Exception as e:
-                        app.logger.error("Erreur lecture '%s': %s", path, e)
-                        t = ""
-                if not t.strip():
-                    app.logger.warning("Aucun texte détecté dans: %s", os.path.basename(path))
-                texts.append(t)
-                if app.progress:
-                    app.progress.value = 0.02 + 0.10 * ((idx + 1) / max(1, len(app.selected_files)))
-                    app.page.update()
+            texts = await _read_inputs()
             if pasted_text.strip():
                 texts.append(pasted_text)
             app.source_full_text = "\n\n".join(t for t in texts if t)
             if not app.source_full_text.strip():
-                app.snack("Aucun texte exploitable.", pal["err"])
+                app.snack("Aucun texte exploitable.", pal.err)
                 return
 
             # Stage 2: Chunk
             _set_stage("Découpage en segments…", 0.16)
-            chunks = await asyncio.to_thread(chunk_text, app.source_full_text, 2000, 120)
+            chunks = await asyncio.to_thread(_chunk_cached, app.source_full_text, 2000, 120)
             app.logger.info("Segments: %d", len(chunks))
             _set_stage(f"Découpage terminé → {len(chunks)} segments", 0.20)
 
-            # Stage 3: Extract facts (parallel with adaptive throttling)
+            # Stage 3: Extract facts (concurrent batches, bounded by the backend semaphore)
             _set_stage("Extraction des faits…", 0.22)
-            max_workers = min(8, (os.cpu_count() or 4))
-            semaphore = asyncio.Semaphore(max_workers)
-            facts_all: list[Fact] = []
-
-            async def extract_one(i: int, ch: str):
-                async with semaphore:
-                    if app.cancel_event.is_set():
-                        return []
-                    app.logger.info("Segment %d/%d…", i + 1, len(chunks))
-                    try:
-                        facts = await app.backend.extract_facts(ch)
-                        app.logger.info("Segment %d: %d faits", i + 1, len(facts))
-                        return facts
-                    except Exception as e:
-                        app.logger.error("Erreur extraction (segment %d): %s", i + 1, e)
-                        return []
-
-            tasks = [extract_one(i, ch) for i, ch in enumerate(chunks)]
+            # Several chunks per request to amortize the prompt and the round-trip
+            batch_size = max(1, int(app.cfg.get("extract_batch_size", 4)))
             done = 0
-            for coro in asyncio.as_completed(tasks):
-                if app.cancel_event.is_set():
-                    raise asyncio.CancelledError
-                res = await coro
-                facts_all.extend(res)
-                done += 1
-                _set_stage(f"Extraction des faits… ({done}/{len(chunks)})", 0.22 + 0.28 * (done / max(1, len(chunks))))
 
+            def on_batch(ids: list[int], per_chunk: list[list[Fact]]):
+                nonlocal done
+                for i, facts in zip(ids, per_chunk):
+                    app.logger.info("Segment %d: %d faits", i + 1, len(facts))
+                done += len(ids)
+                _set_stage(f"Extraction des faits… ({done}/{len(chunks)})", 0.22 + 0.28 * (done / max(1, len(chunks))), throttle=True)
+
+            facts_per_chunk = await _until_cancelled(
+                app.backend.extract_facts_all(chunks, batch_size, on_batch=on_batch),
+                app.cancel_event,
+            )
+            facts_all: list[Fact] = [f for facts in facts_per_chunk for f in facts]
 
             # Stage 4: Deduplicate
             _set_stage("Déduplication…", 0.52)
 
             # Convert Fact objects → dict → dedup → back to Fact objects
             facts_all = await asyncio.to_thread(
-                lambda: [Fact(**f) for f in deduplicate_facts([f.__dict__ for f in facts_all])]
+                lambda: [Fact(**f) for f in deduplicate_facts([f.as_dict() for f in facts_all])]
             )
 
             app.all_facts = facts_all
             app.logger.info("✅ %d faits uniques", len(app.all_facts))
-            _set_stage(f"Faits uniques: {len(app.all_facts)}", 0.57)
-            app._refresh_fact_preview()
+            with app._batch_updates():
+                _set_stage(f"Faits uniques: {len(app.all_facts)}", 0.57)
+                app._refresh_fact_preview()
 
 
-            # Stage 5: Generate CSV
+            # Stage 5: Generate CSV (streamed: rows fill the editable table as the model writes them)
             _set_stage("Génération des cartes…", 0.61)
+            app._parse_cards_to_rows("")  # header only
+            out = io.StringIO()
+            writer = csv.writer(out, lineterminator="\n")
+            header_seen = False
             try:
-                app.generated_csv = await app.backend.generate_csv(
+                async for row in app.backend.generate_csv_rows(
                     app.all_facts, reverse=app.reverse_card, density_level=app.density_level, custom_add=app.custom_add
-                )
+                ):
+                    if app.cancel_event.is_set():
+                        raise asyncio.CancelledError
+                    writer.writerow(row)
+                    if not header_seen:  # first line is the CSV header
+                        header_seen = True
+                        continue
+                    app.card_rows.append((row + [""] * 6)[:6])
+                    if len(app.card_rows) % 10 == 0:
+                        app._refresh_cards_preview()
             except Exception as e:
                 app.logger.error("Erreur génération CSV: %s", e)
-                app.snack(f"Erreur génération CSV: {e}", pal["err"])
+                app.snack(f"Erreur génération CSV: {e}", pal.err)
                 return
-            _set_stage("Cartes générées (brut)", 0.70)
-
-            # Fill editable table from generated CSV
-            app._parse_cards_to_rows(app.generated_csv)
-            app._refresh_cards_preview()
+            app.generated_csv = out.getvalue()
+            with app._batch_updates():
+                _set_stage("Cartes générées (brut)", 0.70)
+                app._refresh_cards_preview()
 
             if app.cancel_event.is_set():
                 raise asyncio.CancelledError
@@ -360,13 +437,14 @@ def attach(app):
 
             # Stage 7: Save (picker + options)
             _set_stage("Terminé ✅ — Cliquez sur Exporter pour sauvegarder", 1.0)
-            app.snack("Cartes prêtes ! Cliquez sur Exporter pour sauvegarder.", pal["ok"])
+            app.snack("Cartes prêtes ! Cliquez sur Exporter pour sauvegarder.", pal.ok)
 
             # Stats
             app._update_deck_stats()
-            app.snack("Deck(s) généré(s)", pal["ok"])
+            app.snack("Deck(s) généré(s)", pal.ok)
 
     # bind
     app._start_pipeline = _start_pipeline
+    app._request_cancel = _request_cancel
     app._pipeline = _pipeline
     app._set_stage = _set_stage
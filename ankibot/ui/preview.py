@@ -4,6 +4,18 @@ import io
 import csv
 import flet as ft
 
+# Rows added to a preview table per window; further windows load as the table is scrolled
+FACTS_WINDOW = 50
+CARDS_WINDOW = 100
+# Rows a preview table holds at most, whatever the scrolling; the search reaches the rest
+FACTS_MAX_ROWS = 1000
+CARDS_MAX_ROWS = 1000
+
+
+def _matches(query: str, fields) -> bool:
+    """True when the lowercased query is empty or found in one of the fields."""
+    return not query or any(query in str(v or "").lower() for v in fields)
+
 
 def attach(app):
     # ---------------- Editable Cards Preview ---------------- #
@@ -21,35 +33,66 @@ def attach(app):
             normalized.append(padded)
         app.card_rows = normalized
 
+    # Handlers shared by every row: the row index travels in the button's data
+    def _on_edit_click(e: ft.ControlEvent):
+        _open_edit_dialog(e.control.data)
+
+    def _on_delete_click(e: ft.ControlEvent):
+        row_index = e.control.data
+        if 0 < row_index < len(app.card_rows):
+            del app.card_rows[row_index]
+            with app._batch_updates():
+                _refresh_cards_preview()
+                app.snack("Carte supprimée")
+
     def _refresh_cards_preview():
         if not app.cards_preview:
             return
-        pal = app._palette()
         app.cards_preview.rows = []
-
-        for idx, r in enumerate(app.card_rows[1:101], start=1):  # show max 100
+        # Topic counts kept up to date with the rows: the tab stats have nothing to rescan
+        app._cards_topic_counts = {}
+        app._cards_cursor = 1  # card_rows[0] is the header
+        _append_card_rows()
+        app._flush()
+
+    def _extend_cards_preview():
+        """Append the next window of cards once the user scrolls near the end of the table."""
+        if app.cards_preview and _append_card_rows():
+            app._flush()
+
+    def _append_card_rows() -> bool:
+        # Next window only, filtered on the data (rows not loaded yet included): rows already
+        # shown are not rebuilt, and the table stops at CARDS_MAX_ROWS
+        rows = app.cards_preview.rows
+        room = min(CARDS_WINDOW, CARDS_MAX_ROWS - len(rows))
+        query = app._search_queries["cards"].strip().lower()
+        source = app.card_rows
+        window: list[tuple[int, list[str]]] = []
+        idx = app._cards_cursor
+        while idx < len(source) and len(window) < room:
+            if _matches(query, source[idx]):
+                window.append((idx, source[idx]))
+            idx += 1
+        app._cards_cursor = idx
+        if not window:
+            return False
+        counts = app._cards_topic_counts
+        app._cards_dirty = True
+
+        for idx, r in window:
             topic, subtopic, q, a, src, details = (r + [""] * 6)[:6]
 
-            def make_edit_handler(row_index: int):
-                def _(_e=None):
-                    _open_edit_dialog(row_index)
-                return _
-
-            def make_delete_handler(row_index: int):
-                def _(_e=None):
-                    if 0 < row_index < len(app.card_rows):
-                        del app.card_rows[row_index]
-                        _refresh_cards_preview()
-                        app.snack("Carte supprimée")
-                return _
+            topic = topic[:40]
+            counts[topic] = counts.get(topic, 0) + 1
 
-            edit_btn = ft.IconButton(icon=ft.Icons.EDIT, tooltip="Éditer", on_click=make_edit_handler(idx))
-            del_btn = ft.IconButton(icon=ft.Icons.DELETE, tooltip="Supprimer", on_click=make_delete_handler(idx))
+            edit_btn = ft.IconButton(icon=ft.Icons.EDIT, tooltip="Éditer", on_click=_on_edit_click, data=idx)
+            del_btn = ft.IconButton(icon=ft.Icons.DELETE, tooltip="Supprimer", on_click=_on_delete_click, data=idx)
 
-            app.cards_preview.rows.append(
+            rows.append(
                 ft.DataRow(
+                    data=topic,  # canonical topic, read without going back through the cells
                     cells=[
-                        ft.DataCell(ft.Text(topic[:40])),
+                        ft.DataCell(ft.Text(topic)),
                         ft.DataCell(ft.Text(subtopic[:40])),
                         ft.DataCell(ft.Text(q[:80])),
                         ft.DataCell(ft.Text(a[:80])),
@@ -60,7 +103,7 @@ def attach(app):
                     ]
                 )
             )
-        app.page.update()
+        return True
 
     def _open_edit_dialog(row_index: int):
         if not (0 < row_index < len(app.card_rows)):
@@ -76,10 +119,11 @@ def attach(app):
 
         def on_save(_):
             app.card_rows[row_index] = [tf_topic.value, tf_subtopic.value, tf_q.value, tf_a.value, tf_src.value, tf_det.value]
-            dlg.open = False
-            app.page.update()
-            _refresh_cards_preview()
-            app.snack("Carte mise à jour")
+            # Closing, table and snack go out in a single page.update()
+            with app._batch_updates():
+                dlg.open = False
+                _refresh_cards_preview()
+                app.snack("Carte mise à jour")
 
         def on_cancel(_):
             dlg.open = False
@@ -92,7 +136,7 @@ def attach(app):
             actions=[
                 ft.TextButton("Annuler", on_click=on_cancel),
                 ft.FilledButton("Enregistrer", on_click=on_save,
-                                style=ft.ButtonStyle(bgcolor={"": pal["accent"], "hovered": pal["accent_hover"]}, color=ft.Colors.WHITE)),
+                                style=ft.ButtonStyle(bgcolor={"": pal.accent, "hovered": pal.accent_hover}, color=ft.Colors.WHITE)),
             ],
             actions_alignment=ft.MainAxisAlignment.END,
         )
@@ -103,27 +147,56 @@ def attach(app):
     def _refresh_fact_preview():
         if not app.fact_preview:
             return
-        rows = []
-        for f in app.all_facts[:50]:
+        app.fact_preview.rows = []
+        app._facts_topic_counts = {}
+        app._facts_cursor = 0
+        _append_fact_rows()
+        app._flush()
+
+    def _extend_fact_preview():
+        """Append the next window of facts once the user scrolls near the end of the table."""
+        if app.fact_preview and _append_fact_rows():
+            app._flush()
+
+    def _append_fact_rows() -> bool:
+        rows = app.fact_preview.rows
+        room = min(FACTS_WINDOW, FACTS_MAX_ROWS - len(rows))
+        query = app._search_queries["facts"].strip().lower()
+        source = app.all_facts
+        window = []
+        idx = app._facts_cursor
+        while idx < len(source) and len(window) < room:
+            f = source[idx]
+            if _matches(query, (f.topic, f.subtopic, f.fact, f.source)):
+                window.append(f)
+            idx += 1
+        app._facts_cursor = idx
+        if not window:
+            return False
+        counts = app._facts_topic_counts
+        app._facts_dirty = True
+        for f in window:
+            topic = str(f.topic or "")[:60]
+            counts[topic] = counts.get(topic, 0) + 1
             rows.append(
                 ft.DataRow(
+                    data=topic,
                     cells=[
-                        ft.DataCell(ft.Text(str(f.topic or "")[:60])),
+                        ft.DataCell(ft.Text(topic)),
                         ft.DataCell(ft.Text(str(f.subtopic or "")[:60])),
                         ft.DataCell(ft.Text(str(f.fact or "")[:120])),
                         ft.DataCell(ft.Text(str(f.source or "")[:40])),
                     ]
                 )
             )
-        app.fact_preview.rows = rows
-        app.page.update()
+        return True
 
     # ---------------- Stats ---------------- #
     def _update_deck_stats():
         if not app.card_rows or len(app.card_rows) <= 1:
             if app.stats_badge:
                 app.stats_badge.value = ""
-                app.page.update()
+                app._flush()
             return
         data = app.card_rows[1:]
         total = len(data)
@@ -137,11 +210,13 @@ def attach(app):
         if app.stats_badge:
             app.stats_badge.value = badge
         app.logger.info(badge)
-        app.page.update()
+        app._flush()
 
     # bind
     app._parse_cards_to_rows = _parse_cards_to_rows
     app._refresh_cards_preview = _refresh_cards_preview
     app._open_edit_dialog = _open_edit_dialog
     app._refresh_fact_preview = _refresh_fact_preview
+    app._extend_fact_preview = _extend_fact_preview
+    app._extend_cards_preview = _extend_cards_preview
     app._update_deck_stats = _update_deck_stats
@@ -1,6 +1,8 @@
 from __future__ import annotations
+from dataclasses import dataclass
+from functools import lru_cache
 import flet as ft
-from ankibot.utils import with_opacity
+from ankibot.utils import with_alpha, with_opacity
 
 
 def is_dark(app) -> bool:
@@ -10,89 +12,184 @@ def is_dark(app) -> bool:
         return True
     if mode == "light":
         return False
-    return str(app.page.platform_brightness).lower() == "dark"
+    # Enum comparison: no str()/lower() per call (str(Brightness.DARK) is "Brightness.DARK",
+    # so the old string test never matched)
+    return app.page.platform_brightness == ft.Brightness.DARK
 
 
-def palette(app) -> dict[str, str]:
+@dataclass(frozen=True, slots=True)
+class Palette:
+    """Semantic colors of the current theme; read as attributes (pal.accent)."""
+    # Backgrounds
+    bg: str
+    surface: str
+    surface_alt: str
+    # Text colors
+    text: str
+    text_secondary: str
+    muted: str
+    # UI Elements
+    border: str
+    shadow: str
+    # Accent and semantic colors
+    accent: str
+    accent_hover: str
+    accent_light: str
+    # Status colors
+    ok: str
+    ok_light: str
+    warn: str
+    warn_light: str
+    err: str
+    err_light: str
+    info: str
+    info_light: str
+    # Interactive states
+    hover: str
+    active: str
+    chip: str
+
+
+def palette(app) -> Palette:
     """
     Enhanced color palette with better contrast and modern aesthetics.
     Returns a complete set of semantic colors for the UI.
+
+    The instance is shared until the palette version changes.
     """
+    return _palette(app, app._palette_version, is_dark(app))
+
+
+@lru_cache(maxsize=4)
+def _palette(app, version: int, dark: bool) -> Palette:
+    # Keyed on the int version bumped by the theme/accent handlers; dark is part of the
+    # key because the system theme can flip without a bump
     accent = app.cfg.get("accent", "#40C4FF")
-    dark = is_dark(app)
     
     if dark:
-        return {
+        return Palette(
             # Backgrounds
-            "bg": "#0A0E12",                    # Deep dark background
-            "surface": "#151B23",               # Card surface
-            "surface_alt": "#1E252E",           # Alternative surface (slightly lighter)
+            bg="#0A0E12",                    # Deep dark background
+            surface="#151B23",               # Card surface
+            surface_alt="#1E252E",           # Alternative surface (slightly lighter)
             
             # Text colors
-            "text": "#F1F3F5",                  # Primary text - high contrast
-            "text_secondary": "#B4BCC6",        # Secondary text
-            "muted": "#8A95A3",                 # Muted/disabled text
+            text="#F1F3F5",                  # Primary text - high contrast
+            text_secondary="#B4BCC6",        # Secondary text
+            muted="#8A95A3",                 # Muted/disabled text
             
             # UI Elements
-            "border": "#2A3441",                # Borders and dividers
-            "shadow": "#00000055",              # Shadows (with opacity)
+            border="#2A3441",                # Borders and dividers
+            shadow="#00000055",              # Shadows (with opacity)
             
             # Accent and semantic colors
-            "accent": accent,
-            "accent_hover": with_opacity(0.85, accent),
-            "accent_light": accent + "30",      # Translucent accent
+            accent=accent,
+            accent_hover=with_opacity(0.85, accent),
+            accent_light=with_alpha(accent, "30"),  # Translucent accent
             
             # Status colors
-            "ok": "#4ADE80",                    # Success/OK green
-            "ok_light": "#4ADE8030",
-            "warn": "#FBBF24",                  # Warning yellow
-            "warn_light": "#FBBF2430",
-            "err": "#F87171",                   # Error red
-            "err_light": "#F8717130",
-            "info": "#60A5FA",                  # Info blue
-            "info_light": "#60A5FA30",
+            ok="#4ADE80",                    # Success/OK green
+            ok_light="#4ADE8030",
+            warn="#FBBF24",                  # Warning yellow
+            warn_light="#FBBF2430",
+            err="#F87171",                   # Error red
+            err_light="#F8717130",
+            info="#60A5FA",                  # Info blue
+            info_light="#60A5FA30",
             
             # Interactive states
-            "hover": "#252D38",
-            "active": "#2A3441",
-            "chip": "#232A35",
-        }
+            hover="#252D38",
+            active="#2A3441",
+            chip="#232A35",
+        )
     else:
-        return {
+        return Palette(
             # Backgrounds
-            "bg": "#F8FAFC",                    # Soft light background
-            "surface": "#FFFFFF",               # Pure white cards
-            "surface_alt": "#F1F5F9",           # Subtle alternative surface
+            bg="#F8FAFC",                    # Soft light background
+            surface="#FFFFFF",               # Pure white cards
+            surface_alt="#F1F5F9",           # Subtle alternative surface
             
             # Text colors
-            "text": "#0F172A",                  # Dark text - high contrast
-            "text_secondary": "#475569",        # Secondary text
-            "muted": "#94A3B8",                 # Muted/disabled text
+            text="#0F172A",                  # Dark text - high contrast
+            text_secondary="#475569",        # Secondary text
+            muted="#94A3B8",                 # Muted/disabled text
             
             # UI Elements
-            "border": "#E2E8F0",                # Light borders
-            "shadow": "#0000000D",              # Subtle shadows
+            border="#E2E8F0",                # Light borders
+            shadow="#0000000D",              # Subtle shadows
             
             # Accent and semantic colors
-            "accent": accent,
-            "accent_hover": with_opacity(0.85, accent),
-            "accent_light": accent + "15",
+            accent=accent,
+            accent_hover=with_opacity(0.85, accent),
+            accent_light=with_alpha(accent, "15"),
             
             # Status colors
-            "ok": "#16A34A",                    # Success green
-            "ok_light": "#16A34A15",
-            "warn": "#F59E0B",                  # Warning orange
-            "warn_light": "#F59E0B15",
-            "err": "#DC2626",                   # Error red
-            "err_light": "#DC262615",
-            "info": "#2563EB",                  # Info blue
-            "info_light": "#2563EB15",
+            ok="#16A34A",                    # Success green
+            ok_light="#16A34A15",
+            warn="#F59E0B",                  # Warning orange
+            warn_light="#F59E0B15",
+            err="#DC2626",                   # Error red
+            err_light="#DC262615",
+            info="#2563EB",                  # Info blue
+            info_light="#2563EB15",
             
             # Interactive states
-            "hover": "#F8FAFC",
-            "active": "#F1F5F9",
-            "chip": "#F1F5F9",
-        }
+            hover="#F8FAFC",
+            active="#F1F5F9",
+            chip="#F1F5F9",
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class PaletteDerived:
+    """Values derived from the palette for the builders, built once per theme change."""
+    accent_10: str
+    accent_15: str
+    accent_20: str
+    accent_40: str
+    accent_60: str
+    border_40: str
+    info_10: str
+    info_15: str
+    info_20: str
+    info_30: str
+    muted_20: str
+    muted_30: str
+    ok_20: str
+    # Step indicator (icon, icon color, background) for complete / active / pending steps
+    step_states: tuple[tuple[str, str, str], ...]
+
+
+def palette_derived(app) -> PaletteDerived:
+    """Derived colors for the current theme, memoized until the palette version changes."""
+    return _palette_derived(app, app._palette_version, is_dark(app))
+
+
+@lru_cache(maxsize=4)
+def _palette_derived(app, version: int, dark: bool) -> PaletteDerived:
+    pal = _palette(app, version, dark)
+    accent_20 = with_alpha(pal.accent, "20")
+    ok_20 = with_alpha(pal.ok, "20")
+    return PaletteDerived(
+        accent_10=with_alpha(pal.accent, "10"),
+        accent_15=with_alpha(pal.accent, "15"),
+        accent_20=accent_20,
+        accent_40=with_alpha(pal.accent, "40"),
+        accent_60=with_alpha(pal.accent, "60"),
+        border_40=with_alpha(pal.border, "40"),
+        info_10=with_alpha(pal.info, "10"),
+        info_15=with_alpha(pal.info, "15"),
+        info_20=with_alpha(pal.info, "20"),
+        info_30=with_alpha(pal.info, "30"),
+        muted_20=with_alpha(pal.muted, "20"),
+        muted_30=with_alpha(pal.muted, "30"),
+        ok_20=ok_20,
+        step_states=(
+            (ft.Icons.CHECK_CIRCLE, pal.ok, ok_20),
+            (ft.Icons.CIRCLE, pal.accent, accent_20),
+            (ft.Icons.CIRCLE_OUTLINED, pal.muted, pal.surface_alt),
+        ),
+    )
 
 
 def apply_theme(app):
@@ -111,71 +208,79 @@ def apply_theme(app):
     else:
         app.page.theme_mode = ft.ThemeMode.SYSTEM
     
-    # Create enhanced Material 3 theme
-    app.page.theme = ft.Theme(
-        color_scheme_seed=pal["accent"],
+    # Material 3 theme, built once per palette (mode + accent)
+    app.page.theme = _theme(pal)
+
+    # Set page background
+    app.page.bgcolor = pal.bg
+
+
+@lru_cache(maxsize=4)
+def _theme(pal: Palette) -> ft.Theme:
+    # Create enhanced Material 3 theme; the frozen Palette keys the cache, so a new accent or mode
+    # gives a new entry and toggling back reuses the earlier one
+    theme = ft.Theme(
+        color_scheme_seed=pal.accent,
         use_material3=True,
         visual_density=ft.VisualDensity.STANDARD,
         # Custom color scheme
         color_scheme=ft.ColorScheme(
-            primary=pal["accent"],
+            primary=pal.accent,
             on_primary=ft.Colors.WHITE,
-            surface=pal["surface"],
-            on_surface=pal["text"],
-            background=pal["bg"],
-            on_background=pal["text"],
+            surface=pal.surface,
+            on_surface=pal.text,
+            background=pal.bg,
+            on_background=pal.text,
         ),
         # Typography
         text_theme=ft.TextTheme(
             display_large=ft.TextStyle(
                 size=32,
                 weight=ft.FontWeight.W_800,
-                color=pal["text"],
+                color=pal.text,
             ),
             headline_large=ft.TextStyle(
                 size=24,
                 weight=ft.FontWeight.W_700,
-                color=pal["text"],
+                color=pal.text,
             ),
             headline_medium=ft.TextStyle(
                 size=20,
                 weight=ft.FontWeight.W_600,
-                color=pal["text"],
+                color=pal.text,
             ),
             title_large=ft.TextStyle(
                 size=18,
                 weight=ft.FontWeight.W_600,
-                color=pal["text"],
+                color=pal.text,
             ),
             body_large=ft.TextStyle(
                 size=15,
                 weight=ft.FontWeight.W_400,
-                color=pal["text"],
+                color=pal.text,
             ),
             body_medium=ft.TextStyle(
                 size=14,
                 weight=ft.FontWeight.W_400,
-                color=pal["text_secondary"],
+                color=pal.text_secondary,
             ),
             label_large=ft.TextStyle(
                 size=13,
                 weight=ft.FontWeight.W_500,
-                color=pal["text"],
+                color=pal.text,
             ),
         ),
     )
     
-    # Set page background
-    app.page.bgcolor = pal["bg"]
-    
     # Smooth transitions
-    app.page.theme.page_transitions = ft.PageTransitionsTheme(
+    theme.page_transitions = ft.PageTransitionsTheme(
         android=ft.PageTransitionTheme.OPEN_UPWARDS,
         ios=ft.PageTransitionTheme.CUPERTINO,
         macos=ft.PageTransitionTheme.FADE_UPWARDS,
         linux=ft.PageTransitionTheme.FADE_UPWARDS,
         windows=ft.PageTransitionTheme.OPEN_UPWARDS,
     )
+    return theme
 
 
 def get_semantic_color(app, semantic: str) -> str:
@@ -190,7 +295,7 @@ def get_semantic_color(app, semantic: str) -> str:
         Color hex string
     """
     pal = palette(app)
-    return pal.get(semantic, pal["accent"])
+    return getattr(pal, semantic, pal.accent)
 
 
 def create_gradient(color1: str, color2: str, angle: int = 135) -> ft.LinearGradient:
@@ -218,7 +323,7 @@ def create_gradient(color1: str, color2: str, angle: int = 135) -> ft.LinearGrad
     )
 
 
-def apply_elevation(container: ft.Container, level: int, pal: dict) -> ft.Container:
+def apply_elevation(container: ft.Container, level: int, pal: Palette) -> ft.Container:
     """
     Apply Material 3 elevation to a container.
     
@@ -230,14 +335,19 @@ def apply_elevation(container: ft.Container, level: int, pal: dict) -> ft.Contai
     Returns:
         Container with elevation applied
     """
-    elevation_shadows = {
+    shadows = _elevation_shadows(pal.shadow)
+    container.shadow = shadows.get(level, shadows[2])
+    return container
+
+
+@lru_cache(maxsize=8)
+def _elevation_shadows(color: str) -> dict[int, ft.BoxShadow | None]:
+    # One table per shadow color: the BoxShadow instances are shared by every elevated container
+    return {
         0: None,
-        1: ft.BoxShadow(blur_radius=4, spread_radius=0, color=pal["shadow"], offset=ft.Offset(0, 1)),
-        2: ft.BoxShadow(blur_radius=8, spread_radius=0, color=pal["shadow"], offset=ft.Offset(0, 2)),
-        3: ft.BoxShadow(blur_radius=12, spread_radius=0, color=pal["shadow"], offset=ft.Offset(0, 4)),
-        4: ft.BoxShadow(blur_radius=16, spread_radius=0, color=pal["shadow"], offset=ft.Offset(0, 6)),
-        5: ft.BoxShadow(blur_radius=24, spread_radius=0, color=pal["shadow"], offset=ft.Offset(0, 8)),
+        1: ft.BoxShadow(blur_radius=4, spread_radius=0, color=color, offset=ft.Offset(0, 1)),
+        2: ft.BoxShadow(blur_radius=8, spread_radius=0, color=color, offset=ft.Offset(0, 2)),
+        3: ft.BoxShadow(blur_radius=12, spread_radius=0, color=color, offset=ft.Offset(0, 4)),
+        4: ft.BoxShadow(blur_radius=16, spread_radius=0, color=color, offset=ft.Offset(0, 6)),
+        5: ft.BoxShadow(blur_radius=24, spread_radius=0, color=color, offset=ft.Offset(0, 8)),
     }
-    
-    container.shadow = elevation_shadows.get(level, elevation_shadows[2])
-    return container
\ No newline at end of file
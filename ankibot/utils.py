@@ -6,10 +6,15 @@ import os
 import csv
 import re
 import json
-import pdfplumber
-import tiktoken
+from functools import lru_cache
 from typing import Any, Dict, List
 
+# orjson (optional, C-accelerated JSON)
+try:
+    import orjson
+except Exception:  # library not installed
+    orjson = None
+
 
 def with_opacity(opacity: float, hex_color: str) -> str:
     """Add alpha to a hex color string."""
@@ -19,8 +24,37 @@ def with_opacity(opacity: float, hex_color: str) -> str:
     return f"#{a}{hex_color[1:]}"
 
 
+@lru_cache(maxsize=512)
+def with_alpha(hex_color: str, alpha_hex: str) -> str:
+    """Append a two-digit alpha to a hex color; each (color, alpha) pair is built once."""
+    return f"{hex_color}{alpha_hex}"
+
+
+# PyMuPDF (optional, much faster than pdfminer-based parsing); resolved on the first PDF read
+_fitz = None  # module once loaded, False if the library is not installed
+
+
+def _load_fitz():
+    global _fitz
+    if _fitz is None:
+        try:
+            import fitz
+        except Exception:  # library not installed
+            fitz = False
+        _fitz = fitz
+    return _fitz
+
+
 def extract_text_from_pdf(path: str) -> str:
-    """Extract plain text from PDF file."""
+    """Extract plain text from PDF file (PyMuPDF when installed, pdfplumber otherwise)."""
+    fitz = _load_fitz()
+    if fitz:
+        try:
+            with fitz.open(path) as doc:
+                return "\n\n".join(page.get_text("text") for page in doc)
+        except Exception:
+            pass  # files PyMuPDF rejects still get a chance with pdfplumber
+    import pdfplumber  # imported on first use: pdfminer is slow to load and not needed to open the window
     try:
         with pdfplumber.open(path) as pdf:
             return "\n\n".join((page.extract_text() or "") for page in pdf.pages)
@@ -31,6 +65,7 @@ def extract_text_from_pdf(path: str) -> str:
 def chunk_text(text: str, max_tokens: int = 2000, overlap: int = 120,
                encoding_name: str = "cl100k_base") -> List[str]:
     """Split text into overlapping chunks (token-aware)."""
+    import tiktoken  # imported on first use, like pdfplumber above
     enc = tiktoken.get_encoding(encoding_name)
     overlap = max(0, min(overlap, max_tokens // 2))
 
@@ -90,10 +125,22 @@ def deduplicate_facts(facts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return uniq
 
 
+def json_loads(text: str) -> Any:
+    """Parse JSON with orjson when available, stdlib json otherwise."""
+    return orjson.loads(text) if orjson else json.loads(text)
+
+
+def json_dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize to UTF-8 JSON (non-ASCII kept as is); compact unless indent (2 spaces)."""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None)
+
+
 def is_valid_json(text: str) -> bool:
     """Check if a string is valid JSON."""
     try:
-        json.loads(text)
+        json_loads(text)
         return True
     except Exception:
         return False
@@ -0,0 +1,42 @@
+import asyncio
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+from ankibot.ui import pipeline
+
+
+class _LoopPage:
+    """Minimal page: run_task schedules the coroutine on the app's event loop, like Flet's."""
+
+    def __init__(self, loop):
+        self.loop = loop
+
+    def run_task(self, handler, *args):
+        return asyncio.run_coroutine_threadsafe(handler(*args), self.loop)
+
+
+class CancelFromThreadTest(unittest.TestCase):
+    def test_cancel_button_aborts_running_stage(self):
+        async def scenario():
+            app = SimpleNamespace(cancel_event=asyncio.Event(), page=_LoopPage(asyncio.get_running_loop()))
+            pipeline.attach(app)
+            # Cancel clicked from an executor thread, as Flet runs sync handlers
+            threading.Timer(0.2, app._request_cancel, (None,)).start()
+            start = time.monotonic()
+            with self.assertRaises(asyncio.CancelledError):
+                await pipeline._until_cancelled(asyncio.sleep(5), app.cancel_event)
+            return time.monotonic() - start
+
+        self.assertLess(asyncio.run(scenario()), 2.0)
+
+    def test_completed_stage_returns_its_result(self):
+        async def scenario():
+            return await pipeline._until_cancelled(asyncio.sleep(0.01, result=42), asyncio.Event())
+
+        self.assertEqual(asyncio.run(scenario()), 42)
+
+
+if __name__ == "__main__":
+    unittest.main()